@@ -3,51 +3,134 @@ FinMind — AI Personal Finance Mentor
 Main Streamlit Application Entry Point
 """
 
+import importlib
+import threading
+
 import streamlit as st
 
 from src.config import (
     STREAMLIT_PAGE_CONFIG,
     DEFAULT_INCOME,
     DEFAULT_EXPENSES,
-    DEFAULT_NEXT_ID,
+    DEFAULT_MONTH,
+    SESSION_PARAM,
+    DB_PATH,
 )
+from src.logic.storage import LedgerDB, UserLedger, new_session_token, session_user
+from src.logic.store import ExpenseStore
 from src.ui.styles import inject_css
 from src.ui.sidebar import render_sidebar
-from src.ui.pages.chat import render_chat_page
-from src.ui.pages.expenses import render_expenses_page
-from src.ui.pages.dashboard import render_dashboard_page
+from src.ui.pages.chat import collect_chat_reply
 
 # Page config MUST be first Streamlit call
 st.set_page_config(**STREAMLIT_PAGE_CONFIG)
 
 
+# Page modules load on first visit: a session that only chats never imports
+# pandas (expenses) or plotly (dashboard). Names are module → render function.
+PAGES = {
+    "chat":      ("src.ui.pages.chat", "render_chat_page"),
+    "expenses":  ("src.ui.pages.expenses", "render_expenses_page"),
+    "dashboard": ("src.ui.pages.dashboard", "render_dashboard_page"),
+}
+
+# Imported in the background after the first page is on screen
+WARM_MODULES = ("src.logic.chat_engine", "src.ui.pages.expenses", "src.ui.pages.dashboard")
+
+
+@st.cache_resource
+def get_ledger_db() -> LedgerDB:
+    """One SQLite handle shared by every session in this process."""
+    return LedgerDB(DB_PATH)
+
+
+@st.cache_resource
+def get_seed_store() -> ExpenseStore:
+    """The default ledger, frozen and shared by every new user's session."""
+    return ExpenseStore.frozen(DEFAULT_EXPENSES)
+
+
+@st.cache_resource(show_spinner=False)
+def warm_process() -> threading.Thread:
+    """Preload heavy modules and process-wide singletons once per process.
+
+    Runs on a daemon thread so the first session's first page is not held
+    up; by the time the user navigates or sends a message, the imports,
+    reply cache, chat engine loop and token encoder are already in place.
+    """
+    def warm():
+        for name in WARM_MODULES:
+            importlib.import_module(name)
+        from src.logic.chat_engine import get_engine
+        from src.logic.history import count_tokens
+        from src.logic.response_cache import get_response_cache
+        get_response_cache()
+        get_engine()
+        try:
+            count_tokens("warm up")
+        except Exception:  # the encoder is optional; chats fall back on their own
+            pass
+
+    thread = threading.Thread(target=warm, name="finmind-warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def session_ledger() -> UserLedger:
+    """This browser session's own ledger.
+
+    The ledger is named by a random token kept in the URL, so a reload or
+    bookmark reopens it while every other session gets a fresh one. A
+    missing or malformed token is replaced, never shared.
+    """
+    token = st.query_params.get(SESSION_PARAM, "")
+    user = session_user(token)
+    if user is None:
+        token = new_session_token()
+        st.query_params[SESSION_PARAM] = token
+        user = session_user(token)
+    return get_ledger_db().ledger(user)
+
+
+def render_page(page: str):
+    """Import the page's module (first visit only) and render it."""
+    module, render = PAGES.get(page, PAGES["chat"])
+    getattr(importlib.import_module(module), render)()
+
+
 def init_state():
     """Initialize session state with default values."""
     defaults = {
         "page": "chat",
         "messages": [],
-        "expenses": DEFAULT_EXPENSES.copy(),
-        "income": DEFAULT_INCOME,
         "api_key": "",
-        "next_id": DEFAULT_NEXT_ID,
+        "month": DEFAULT_MONTH,
+        "chat_job": None,
     }
     for k, v in defaults.items():
         if k not in st.session_state:
             st.session_state[k] = v
 
+    if "expenses" not in st.session_state:
+        ledger = session_ledger()
+        if not ledger.is_seeded():
+            # Copy-on-write: the defaults are shared until this user's first edit saves them
+            store = get_seed_store().fork(ledger)
+        else:
+            store = ExpenseStore.open(ledger)
+        st.session_state.ledger = ledger
+        st.session_state.expenses = store
+        st.session_state.income = ledger.get_income(DEFAULT_INCOME)
+
 
 def main():
     init_state()
+    collect_chat_reply()
     inject_css()
     render_sidebar()
 
-    page = st.session_state.page
-    if page == "chat":
-        render_chat_page()
-    elif page == "expenses":
-        render_expenses_page()
-    elif page == "dashboard":
-        render_dashboard_page()
+    render_page(st.session_state.page)
+    warm_process()
 
 
 if __name__ == "__main__":
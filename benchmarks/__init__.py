@@ -0,0 +1 @@
+"""FinMind benchmarks and offline load tools"""
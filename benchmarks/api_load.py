@@ -0,0 +1,161 @@
+"""
+Throughput harness for the headless scoring API.
+Starts the API in-process (unless --url is given) once per --workers value,
+has concurrent keep-alive clients post synthetic ledgers, and reports
+requests/s, expenses scored/s and p50/p95/p99 latency — so inline scoring
+(--workers 0) and the process pool can be compared on the same load.
+
+    python -m benchmarks.api_load --endpoint budget --rows 5000 --workers 0 4
+    python -m benchmarks.api_load --rows 2000 --inline-bytes 0 --workers 0 4
+    python -m benchmarks.api_load --batch 50 --rows 2000 --clients 4 --workers 0 2 4
+
+Single-ledger bodies up to API_INLINE_BYTES (256 KiB, roughly 2,000
+expenses) are scored on the request thread even when a pool exists; each
+report says which path (`inline` or `pool`) served it. Pass --inline-bytes 0
+to send every request through the pool.
+"""
+
+import argparse
+import http.client
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmarks.chat_load import _fmt, percentiles
+from benchmarks.ledger import synthetic_expenses
+from src.api.scoring import SCORERS
+from src.api.server import serve
+from src.config import API_INLINE_BYTES, DEFAULT_INCOME
+
+
+@dataclass
+class Report:
+    endpoint: str
+    workers: Optional[int]
+    path: str
+    clients: int
+    requests: int
+    rows_per_request: int
+    wall_seconds: float
+    throughput_rps: float
+    rows_per_sec: float
+    latency_ms: Dict[str, float]
+    errors: Dict[int, int] = field(default_factory=dict)
+
+    def render(self) -> str:
+        return "\n".join([
+            f"endpoint={self.endpoint} workers={self.workers} path={self.path} clients={self.clients} "
+            f"requests={self.requests} rows/request={self.rows_per_request} wall={self.wall_seconds:.2f}s",
+            f"throughput {self.throughput_rps:.1f} req/s  {self.rows_per_sec:,.0f} rows/s",
+            "latency  " + _fmt(self.latency_ms),
+            f"errors   {self.errors or 'none'}",
+        ])
+
+
+def _bodies(args) -> Tuple[str, bytes, int]:
+    """(path, pre-encoded body, expenses per request) — encoding stays out of the timings."""
+    ledgers = [
+        {"id": i, "income": DEFAULT_INCOME, "expenses": synthetic_expenses(args.rows, seed=i)}
+        for i in range(max(args.batch, 1))
+    ]
+    if args.batch:
+        return f"/v1/batch/{args.endpoint}", json.dumps({"ledgers": ledgers}).encode(), args.rows * args.batch
+    return f"/v1/{args.endpoint}", json.dumps(ledgers[0]).encode(), args.rows
+
+
+def _client(host: str, port: int, path: str, body: bytes, count: int) -> List[Tuple[float, int]]:
+    conn = http.client.HTTPConnection(host, port, timeout=120)
+    headers = {"Content-Type": "application/json"}
+    samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        conn.request("POST", path, body, headers)
+        response = conn.getresponse()
+        response.read()
+        samples.append((time.perf_counter() - start, response.status))
+        if response.will_close:
+            conn.close()
+    conn.close()
+    return samples
+
+
+def _served_by(args, body: bytes, workers: Optional[int]) -> str:
+    if workers is None:
+        return "unknown"
+    if workers == 0 or (not args.batch and len(body) <= args.inline_bytes):
+        return "inline"
+    return "pool"
+
+
+def run(args, host: str, port: int, workers: Optional[int]) -> Report:
+    path, body, rows = _bodies(args)
+    _client(host, port, path, body, 1)  # warm up
+
+    per_client = [args.requests // args.clients + (i < args.requests % args.clients)
+                  for i in range(args.clients)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as pool:
+        samples = [s for batch in pool.map(lambda n: _client(host, port, path, body, n), per_client)
+                   for s in batch]
+    wall = time.perf_counter() - start
+
+    errors: Dict[int, int] = {}
+    for _, status in samples:
+        if status != 200:
+            errors[status] = errors.get(status, 0) + 1
+    ok = len(samples) - sum(errors.values())
+    return Report(
+        endpoint=path,
+        workers=workers,
+        path=_served_by(args, body, workers),
+        clients=args.clients,
+        requests=len(samples),
+        rows_per_request=rows,
+        wall_seconds=round(wall, 3),
+        throughput_rps=round(len(samples) / wall, 2) if wall else 0.0,
+        rows_per_sec=round(ok * rows / wall, 1) if wall else 0.0,
+        latency_ms=percentiles([latency for latency, _ in samples]),
+        errors=errors,
+    )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--endpoint", choices=sorted(SCORERS), default="budget")
+    parser.add_argument("--rows", type=int, default=2000, help="expenses per ledger")
+    parser.add_argument("--batch", type=int, default=0,
+                        help="ledgers per /v1/batch request (0 = single-ledger requests)")
+    parser.add_argument("--clients", type=int, default=8, help="concurrent connections")
+    parser.add_argument("--requests", type=int, default=200, help="requests in total")
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 4],
+                        help="pool sizes to compare, one in-process server each")
+    parser.add_argument("--inline-bytes", type=int, default=API_INLINE_BYTES,
+                        help="largest single-ledger body scored inline (0 = always use the pool)")
+    parser.add_argument("--url", help="load a running server instead (--workers is ignored)")
+    parser.add_argument("--json", help="also write the reports to this file")
+    args = parser.parse_args(argv)
+
+    reports = []
+    if args.url:
+        target = urlsplit(args.url)
+        reports.append(run(args, target.hostname, target.port or 80, None))
+        print(reports[-1].render())
+    else:
+        for workers in args.workers:
+            server = serve("127.0.0.1", 0, workers, args.inline_bytes)
+            try:
+                reports.append(run(args, *server.server_address[:2], workers))
+            finally:
+                server.shutdown()
+                server.server_close()
+            print(reports[-1].render(), end="\n\n")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump([asdict(r) for r in reports], f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+"""
+Benchmark suite for budget math and page rendering.
+Times the budget functions, the month filter and full page renders over
+synthetic ledgers of 10^3–10^6 rows, for plain lists, ExpenseColumns
+and the ExpenseStore the app uses, then compares each benchmark's best time
+against a saved baseline.
+
+    python -m benchmarks.budget_suite                    # compare with baselines.json
+    python -m benchmarks.budget_suite --save             # record new baselines
+    python -m benchmarks.budget_suite --sizes 1000 100000 --only compute_budget
+
+Exits with status 1 when any benchmark's best time is slower than its
+baseline by more than --tolerance (and by at least --min-delta-ms). Page
+renders are report-only, and nothing fails against baselines recorded on
+another machine: record them here with --save rather than editing the file.
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+# Page renders open a ledger database; keep it out of the working tree
+os.environ.setdefault("FINMIND_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="finmind-bench-"), "ledger.db"))
+
+from benchmarks.ledger import synthetic_expenses  # noqa: E402
+from src.config import DEFAULT_INCOME  # noqa: E402
+from src.logic import ai_mentor, budget  # noqa: E402
+from src.logic.records import ExpenseColumns  # noqa: E402
+from src.logic.rollup import MonthlyRollup  # noqa: E402
+from src.logic.store import ExpenseStore  # noqa: E402
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000)
+DEFAULT_BASELINES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+PAGES = ("dashboard", "expenses", "chat")
+MONTH = "2026-02"
+QUERY = "netflix"
+
+# AppTest page renders swing ±20% between runs on one machine, so they are
+# printed against their baseline but never fail the suite.
+REPORT_ONLY = ("render:",)
+
+
+@dataclass
+class Result:
+    name: str
+    size: int
+    median: float  # seconds
+    best: float
+    runs: int
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}@{self.size}"
+
+
+def measure(fn: Callable[[], object], setup: Optional[Callable[[], None]] = None,
+            min_time: float = 0.2, max_runs: int = 50) -> List[float]:
+    """Time `fn` repeatedly (at least 3 runs, ~`min_time` total); `setup` is untimed."""
+    times: List[float] = []
+    while len(times) < 3 or (sum(times) < min_time and len(times) < max_runs):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def _cold() -> None:
+    # Store benchmarks measure a cache miss, not a dictionary lookup
+    budget._budget_cache.clear()
+    ai_mentor._context_cache.clear()
+
+
+def _trend(rollup: MonthlyRollup) -> None:
+    # What the dashboard trend view asks for one 12-month window
+    start = "2025-03"
+    rollup.range_total(start, MONTH)
+    rollup.yoy(MONTH)
+    rollup.window(start, MONTH)
+    rollup.rolling_mean(3, start, MONTH)
+
+
+def _render_page(page: str, store: ExpenseStore) -> Callable[[], object]:
+    from streamlit.testing.v1 import AppTest
+
+    logging.disable(logging.WARNING)  # Streamlit logs deprecation warnings on every render
+
+    def render():
+        app = AppTest.from_file(os.path.join(_ROOT, "app.py"), default_timeout=600)
+        app.session_state["page"] = page
+        app.session_state["expenses"] = store
+        app.session_state["income"] = DEFAULT_INCOME
+        app.run()
+        if app.exception:
+            raise RuntimeError(f"{page} page raised: {app.exception[0].value}")
+    return render
+
+
+def _warm_up(render: Callable[[], object]) -> None:
+    # Page benchmarks time reruns. The first visit imports the page and starts
+    # app.py's warm-up thread, which would share the CPU with the timed runs;
+    # benchmarks/cold_start.py reports that cost instead.
+    render()
+    for thread in threading.enumerate():
+        if thread.name == "finmind-warmup":
+            thread.join()
+
+
+def run_suite(sizes, only=None, page_max: int = 10_000, seed: int = 0) -> List[Result]:
+    results = []
+    income = DEFAULT_INCOME
+    for size in sizes:
+        rows = synthetic_expenses(size, seed)
+        store = ExpenseStore()
+        store.extend(rows)
+        columns = ExpenseColumns.from_records(rows)
+
+        cases = {
+            "compute_budget[list]": (lambda: budget.compute_budget(rows, income), None),
+            "compute_budget[store]": (lambda: budget.cached_budget(store, income), _cold),
+            "compute_budget[columns]": (lambda: budget.compute_budget(columns, income), None),
+            "summarize_for_ai[list]": (lambda: budget.summarize_for_ai(rows, income), None),
+            "summarize_for_ai[store]": (lambda: budget.summarize_for_ai(store, income), _cold),
+            "summarize_for_ai[columns]": (lambda: budget.summarize_for_ai(columns, income), None),
+            "get_demo_response[list]": (lambda: ai_mentor.get_demo_response("budget", rows, income), None),
+            "get_demo_response[store]": (lambda: ai_mentor.get_demo_response("budget", store, income), _cold),
+            "month_filter[list]": (lambda: [e for e in rows if e["month"] == MONTH], None),
+            "month_filter[store]": (lambda: store.for_month(MONTH), None),
+            "month_filter[columns]": (lambda: columns.for_month(MONTH), None),
+            "month_budget[store]": (lambda: budget.cached_budget(store, income, month=MONTH), _cold),
+            "search[list]": (lambda: [e for e in rows if e["month"] == MONTH and (
+                QUERY in e["name"].lower() or QUERY in e["category"].lower())], None),
+            "search[store]": (lambda: store.search(QUERY, month=MONTH), None),
+            "trend[list]": (lambda: _trend(MonthlyRollup.from_records(rows)), None),
+            "trend[store]": (lambda: _trend(store.rollup()), lambda: setattr(store, "_rollup", None)),
+        }
+        if size <= page_max:
+            for page in PAGES:
+                cases[f"render:{page}"] = (_render_page(page, store), _cold)
+
+        for name, (fn, setup) in cases.items():
+            if only and not any(o in name for o in only):
+                continue
+            if name.startswith("render:"):
+                _warm_up(fn)
+            times = measure(fn, setup, max_runs=5 if name.startswith("render:") else 50)
+            result = Result(name, size, statistics.median(times), min(times), len(times))
+            results.append(result)
+            print(f"{result.key:<36} median {result.median * 1e3:10.3f} ms   best {result.best * 1e3:10.3f} ms"
+                  f"   ({result.runs} runs)", flush=True)
+    return results
+
+
+def compare(results: List[Result], baselines: Dict[str, Dict], tolerance: float,
+            min_delta: float) -> Tuple[List[str], List[str]]:
+    """(regressions, report-only slowdowns) as human-readable lines.
+
+    Best-of-N times are compared: they are far less sensitive to scheduler
+    noise than medians. REPORT_ONLY cases land in the second list.
+    """
+    regressions, noted = [], []
+    for r in results:
+        base = baselines.get(r.key)
+        if base is None:
+            continue
+        if r.best > base["best"] * (1 + tolerance) and r.best - base["best"] > min_delta:
+            line = (f"{r.key}: best {r.best * 1e3:.3f} ms vs baseline "
+                    f"{base['best'] * 1e3:.3f} ms (+{(r.best / base['best'] - 1) * 100:.0f}%)")
+            (noted if r.name.startswith(REPORT_ONLY) else regressions).append(line)
+    return regressions, noted
+
+
+def machine() -> Dict[str, str]:
+    """What the baselines were recorded on; timings only compare on the same one."""
+    return {"python": platform.python_version(), "platform": platform.platform(),
+            "processor": platform.processor() or platform.machine()}
+
+
+def load_baselines(path: str) -> Dict:
+    """The saved {"machine": ..., "results": ...} payload, or {} if there is none."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baselines(path: str, results: List[Result]) -> None:
+    saved = load_baselines(path)
+    # Results from another machine are not comparable; start afresh
+    existing = saved.get("results", {}) if saved.get("machine") == machine() else {}
+    existing.update({r.key: {"median": round(r.median, 6), "best": round(r.best, 6)} for r in results})
+    payload = {"machine": machine(), "results": dict(sorted(existing.items()))}
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=2)
+        f.write("\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--only", nargs="+", help="run benchmarks whose name contains any of these")
+    parser.add_argument("--page-max", type=int, default=10_000,
+                        help="largest ledger to render pages for (AppTest is slow)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baselines", default=DEFAULT_BASELINES)
+    parser.add_argument("--save", action="store_true", help="write results as the new baselines")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown, e.g. 0.25 = 25%%")
+    parser.add_argument("--min-delta-ms", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    results = run_suite(args.sizes, args.only, args.page_max, args.seed)
+    if args.save:
+        save_baselines(args.baselines, results)
+        print(f"Saved {len(results)} baselines to {args.baselines}")
+        return 0
+
+    saved = load_baselines(args.baselines)
+    if not saved.get("results"):
+        print(f"No baselines at {args.baselines}; run with --save to record them")
+        return 0
+    regressions, noted = compare(results, saved["results"], args.tolerance, args.min_delta_ms / 1e3)
+    if saved.get("machine") != machine():
+        # Another machine's timings say nothing about this change: report, never fail
+        print(f"Baselines were recorded on {saved.get('machine')}; reporting only. "
+              "Run with --save here first to compare against this machine.")
+        regressions, noted = [], regressions + noted
+    for line in noted:
+        print("slower (report-only) " + line)
+    for line in regressions:
+        print("REGRESSION " + line)
+    print(f"{len(regressions)} regression(s) against {args.baselines}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,253 @@
+"""
+Offline latency/load harness for the chat path.
+Runs N concurrent sessions, each sending a few turns, against the local
+mock server (started in-process unless --base-url is given) and reports
+p50/p95/p99 latency, time to first token and throughput.
+
+    python -m benchmarks.chat_load --mode stream --sessions 20 --turns 3
+    python -m benchmarks.chat_load --mode page --sessions 4 --rate-limit-rate 0.1
+
+Modes: `sync` (chat_with_gpt), `stream` (stream_chat_with_gpt), `engine`
+(background ChatEngine) and `page` (the chat page under Streamlit's AppTest).
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional
+
+from benchmarks.mock_openai import MockConfig, base_url, serve
+
+MODES = ("sync", "stream", "engine", "page")
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_ERROR_PREFIXES = {
+    "⚠️ **Rate limit": "rate_limit",
+    "⚠️ **Invalid API key": "auth",
+    "⚠️ **Connection": "connection",
+    "⚠️ **Error": "other",
+}
+
+
+@dataclass
+class Sample:
+    latency: float
+    ttft: Optional[float]
+    chars: int
+    error: Optional[str] = None
+
+
+@dataclass
+class Report:
+    mode: str
+    sessions: int
+    turns: int
+    requests: int
+    wall_seconds: float
+    throughput_rps: float
+    latency_ms: Dict[str, float]
+    ttft_ms: Dict[str, float]
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    def render(self) -> str:
+        lines = [
+            f"mode={self.mode} sessions={self.sessions} turns={self.turns} "
+            f"requests={self.requests} wall={self.wall_seconds:.2f}s "
+            f"throughput={self.throughput_rps:.1f} req/s",
+            "latency  " + _fmt(self.latency_ms),
+        ]
+        if self.ttft_ms:
+            lines.append("ttft     " + _fmt(self.ttft_ms))
+        lines.append(f"errors   {self.errors or 'none'}")
+        return "\n".join(lines)
+
+
+def percentiles(values: List[float]) -> Dict[str, float]:
+    """Nearest-rank p50/p95/p99 (and max) in milliseconds."""
+    if not values:
+        return {}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        i = max(0, min(len(ordered) - 1, int(round(p / 100 * len(ordered) + 0.5)) - 1))
+        return round(ordered[i] * 1000, 2)
+
+    return {"p50": rank(50), "p95": rank(95), "p99": rank(99), "max": round(ordered[-1] * 1000, 2)}
+
+
+def _fmt(stats: Dict[str, float]) -> str:
+    return "  ".join(f"{k}={v:.1f}ms" for k, v in stats.items())
+
+
+def _classify(reply: str) -> Optional[str]:
+    for prefix, kind in _ERROR_PREFIXES.items():
+        if reply.startswith(prefix):
+            return kind
+    return None
+
+
+def _prompt(session: int, turn: int, shared: bool) -> str:
+    from src.ui.pages.chat import QUICK_PROMPTS
+    prompt = QUICK_PROMPTS[turn % len(QUICK_PROMPTS)]
+    return prompt if shared else f"[session {session} · turn {turn}] {prompt}"
+
+
+# ── Session drivers ────────────────────────────────────────────────────────────
+
+def _run_api_session(mode: str, session: int, args, expenses, income) -> List[Sample]:
+    from src.logic.ai_mentor import chat_with_gpt, stream_chat_with_gpt
+    from src.logic.chat_engine import get_engine
+
+    history: List[Dict] = []
+    samples = []
+    vary = not args.cached
+    for turn in range(args.turns):
+        text = _prompt(session, turn, args.cached)
+        ttft = None
+        start = time.perf_counter()
+        if mode == "sync":
+            reply = chat_with_gpt(args.api_key, text, history, expenses, income, vary=vary)
+        elif mode == "stream":
+            parts = []
+            for delta in stream_chat_with_gpt(args.api_key, text, history, expenses, income, vary=vary):
+                if ttft is None:
+                    ttft = time.perf_counter() - start
+                parts.append(delta)
+            reply = "".join(parts)
+        else:
+            job = get_engine().submit(args.api_key, text, history, expenses, income, vary=vary)
+            while not job.done:
+                if ttft is None and job.text:
+                    ttft = time.perf_counter() - start
+                time.sleep(0.002)
+            reply = job.text
+        latency = time.perf_counter() - start
+        samples.append(Sample(latency, ttft, len(reply), _classify(reply)))
+        history += [{"role": "user", "content": text}, {"role": "assistant", "content": reply}]
+    return samples
+
+
+def _run_page_session(session: int, args) -> List[Sample]:
+    from streamlit.testing.v1 import AppTest
+    from src.config import SESSION_PARAM
+    from src.logic.storage import new_session_token
+
+    app = AppTest.from_file(os.path.join(_ROOT, "app.py"), default_timeout=60)
+    app.query_params[SESSION_PARAM] = new_session_token()
+    app.session_state["page"] = "chat"
+    app.run()
+    app.text_input(key="api_input").input(args.api_key).run()
+
+    samples = []
+    for turn in range(args.turns):
+        start = time.perf_counter()
+        app.text_input(key="chat_input").input(_prompt(session, turn, args.cached))
+        next(b for b in app.button if b.label == "➤").click().run()
+        ttft = None
+        while app.session_state["chat_job"] is not None:
+            job = app.session_state["chat_job"]
+            if ttft is None and job.text:
+                ttft = time.perf_counter() - start
+            time.sleep(0.01)
+            if job.done:
+                app.run()
+        latency = time.perf_counter() - start
+        reply = app.session_state["messages"][-1]["content"]
+        error = _classify(reply) or (app.exception[0].value if app.exception else None)
+        samples.append(Sample(latency, ttft, len(reply), error))
+    return samples
+
+
+def run(args) -> Report:
+    from src.config import DEFAULT_EXPENSES, DEFAULT_INCOME
+    from src.logic.store import ExpenseStore
+
+    expenses = ExpenseStore()
+    expenses.extend(DEFAULT_EXPENSES)
+
+    def session(i: int) -> List[Sample]:
+        if args.mode == "page":
+            return _run_page_session(i, args)
+        return _run_api_session(args.mode, i, args, expenses, DEFAULT_INCOME)
+
+    if args.cached:
+        session(0)  # warm the reply cache so the timed run measures hits
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.sessions) as pool:
+        samples = [s for batch in pool.map(session, range(args.sessions)) for s in batch]
+    wall = time.perf_counter() - start
+
+    errors: Dict[str, int] = {}
+    for s in samples:
+        if s.error:
+            errors[s.error] = errors.get(s.error, 0) + 1
+    return Report(
+        mode=args.mode,
+        sessions=args.sessions,
+        turns=args.turns,
+        requests=len(samples),
+        wall_seconds=round(wall, 3),
+        throughput_rps=round(len(samples) / wall, 2) if wall else 0.0,
+        latency_ms=percentiles([s.latency for s in samples]),
+        ttft_ms=percentiles([s.ttft for s in samples if s.ttft is not None]),
+        errors=errors,
+    )
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--mode", choices=MODES, default="stream")
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent sessions")
+    parser.add_argument("--turns", type=int, default=3, help="turns per session")
+    parser.add_argument("--api-key", default="sk-mock")
+    parser.add_argument("--cached", action="store_true",
+                        help="identical prompts with the reply cache on (default bypasses it)")
+    parser.add_argument("--base-url", help="use a running server instead of the in-process mock")
+    parser.add_argument("--json", help="also write the report to this file")
+    mock = parser.add_argument_group("in-process mock server")
+    mock.add_argument("--latency", type=float, default=0.2)
+    mock.add_argument("--tokens-per-sec", type=float, default=200.0)
+    mock.add_argument("--reply-tokens", type=int, default=80)
+    mock.add_argument("--rate-limit-rate", type=float, default=0.0)
+    mock.add_argument("--auth-error-rate", type=float, default=0.0)
+    mock.add_argument("--drop-rate", type=float, default=0.0)
+    mock.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.base_url
+    if url is None:
+        server = serve(MockConfig(
+            latency=args.latency, tokens_per_sec=args.tokens_per_sec,
+            reply_tokens=args.reply_tokens, rate_limit_rate=args.rate_limit_rate,
+            auth_error_rate=args.auth_error_rate, drop_rate=args.drop_rate, seed=args.seed,
+        ))
+        url = base_url(server)
+
+    # src.config reads these at import time, so set them before any src import
+    scratch = tempfile.mkdtemp(prefix="finmind-load-")
+    os.environ["FINMIND_AI_BASE_URL"] = url
+    os.environ.setdefault("FINMIND_AI_CACHE_PATH", os.path.join(scratch, "cache.db"))
+    os.environ.setdefault("FINMIND_DB_PATH", os.path.join(scratch, "ledger.db"))
+    if _ROOT not in sys.path:
+        sys.path.insert(0, _ROOT)
+
+    report = run(args)
+    print(report.render())
+    if server is not None:
+        print(f"server   {server.config.stats}")
+        server.shutdown()
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(asdict(report), f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
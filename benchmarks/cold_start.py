@@ -0,0 +1,139 @@
+"""
+Cold-start report for the Streamlit app.
+Every measurement runs in a fresh interpreter, the way the first session
+after a container restart sees it:
+
+  * import breakdown — `python -X importtime` over app.py's own imports and
+    over each page module, grouped by top-level package, so a new eager
+    dependency shows up as a line item;
+  * first render — wall time of the first and second AppTest run of each
+    page (first = imports + caches cold, second = a normal rerun).
+
+    python -m benchmarks.cold_start
+    python -m benchmarks.cold_start --pages chat --top 15 --json
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ("chat", "expenses", "dashboard")
+
+# What app.py imports before any page renders (mirrors its import block)
+APP_IMPORTS = (
+    "streamlit",
+    "src.config",
+    "src.logic.storage",
+    "src.logic.store",
+    "src.ui.styles",
+    "src.ui.sidebar",
+    "src.ui.pages.chat",
+)
+
+PAGE_MODULES = {
+    "chat": "src.ui.pages.chat",
+    "expenses": "src.ui.pages.expenses",
+    "dashboard": "src.ui.pages.dashboard",
+}
+
+_RENDER_SCRIPT = """
+import json, logging, os, sys, time
+logging.disable(logging.WARNING)
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(os.path.join(sys.argv[1], "app.py"), default_timeout=300)
+at.session_state["page"] = sys.argv[2]
+times = []
+for _ in range(2):
+    start = time.perf_counter()
+    at.run()
+    times.append(time.perf_counter() - start)
+    if at.exception:
+        raise SystemExit(f"{sys.argv[2]} page raised: {at.exception[0].value}")
+print(json.dumps(times))
+"""
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("FINMIND_DB_PATH", os.path.join(tempfile.mkdtemp(prefix="finmind-cold-"), "ledger.db"))
+    env["PYTHONPATH"] = _ROOT + os.pathsep + env.get("PYTHONPATH", "")
+    return env
+
+
+def import_profile(modules: Tuple[str, ...], baseline: Tuple[str, ...] = ()) -> Dict[str, float]:
+    """Self import time (seconds) per top-level package for `modules`.
+
+    Anything already pulled in by `baseline` is imported first and left out,
+    so a page's profile shows only what navigating to it adds.
+    """
+    code = "".join(f"import {m}\n" for m in baseline)
+    code += "import sys; sys.stderr.write('--measure--\\n')\n"
+    code += "".join(f"import {m}\n" for m in modules)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=_ROOT,
+                          env=_env(), capture_output=True, text=True, check=True)
+    stderr = proc.stderr.split("--measure--\n", 1)[-1]
+    groups: Dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        top = ".".join(name.split(".")[:2]) if name.startswith("src.") else name.split(".")[0]
+        groups[top] += int(self_us) / 1e6
+    return dict(groups)
+
+
+def first_render(page: str) -> List[float]:
+    """[first run, second run] seconds for `page` in a fresh interpreter."""
+    proc = subprocess.run([sys.executable, "-c", _RENDER_SCRIPT, _ROOT, page], cwd=_ROOT,
+                          env=_env(), capture_output=True, text=True)
+    if proc.returncode:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _render_profile(title: str, profile: Dict[str, float], top: int) -> List[str]:
+    lines = [f"{title}: {sum(profile.values()) * 1e3:8.1f} ms"]
+    for name, seconds in sorted(profile.items(), key=lambda kv: -kv[1])[:top]:
+        lines.append(f"    {name:<28} {seconds * 1e3:8.1f} ms")
+    return lines
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", nargs="+", choices=PAGES, default=list(PAGES))
+    parser.add_argument("--top", type=int, default=8, help="packages listed per import profile")
+    parser.add_argument("--no-render", action="store_true", help="skip the AppTest render timings")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args(argv)
+
+    report = {"app_imports": import_profile(APP_IMPORTS), "pages": {}}
+    for page in args.pages:
+        entry = {"imports": import_profile((PAGE_MODULES[page],), baseline=APP_IMPORTS)}
+        if not args.no_render:
+            entry["first_run"], entry["rerun"] = first_render(page)
+        report["pages"][page] = entry
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+
+    lines = _render_profile("app.py imports", report["app_imports"], args.top)
+    for page, entry in report["pages"].items():
+        lines += _render_profile(f"+ first visit to {page}", entry["imports"], args.top)
+        if "first_run" in entry:
+            lines.append(f"    first render {entry['first_run'] * 1e3:8.1f} ms   "
+                         f"rerun {entry['rerun'] * 1e3:8.1f} ms")
+    print("\n".join(lines))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
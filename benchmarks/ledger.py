@@ -0,0 +1,54 @@
+"""
+Deterministic synthetic ledgers for benchmarks.
+Rows follow the `DEFAULT_EXPENSES` schema and are spread over `MONTHS`,
+`EXPENSE_CATEGORIES` and `EXPENSE_TYPES`; the same (size, seed) always
+yields the same ledger, so timings are comparable across runs and machines.
+"""
+
+import random
+from typing import Dict, List
+
+from src.config import (
+    DEFAULT_EXPENSES,
+    EXPENSE_CATEGORIES,
+    EXPENSE_TYPES,
+    MONTHS,
+)
+from src.logic.store import ExpenseStore
+
+# Typical amount per category, taken from the defaults where present
+_BASE_AMOUNTS = {c: 60.0 for c in EXPENSE_CATEGORIES}
+_BASE_AMOUNTS.update({e["category"]: float(e["amount"]) for e in DEFAULT_EXPENSES})
+
+_NAMES: Dict[str, List[str]] = {c: [] for c in EXPENSE_CATEGORIES}
+for _e in DEFAULT_EXPENSES:
+    _NAMES[_e["category"]].append(_e["name"])
+
+
+def synthetic_expenses(size: int, seed: int = 0) -> List[Dict]:
+    """`size` expense dicts with ids 1..size."""
+    rng = random.Random(seed)
+    # Skew the mix the way real ledgers are: lots of food, little housing
+    weights = [1 + (i * 7) % len(EXPENSE_CATEGORIES) for i in range(len(EXPENSE_CATEGORIES))]
+    categories = rng.choices(EXPENSE_CATEGORIES, weights=weights, k=size)
+    rows = []
+    for i, category in enumerate(categories, start=1):
+        names = _NAMES[category] or [category]
+        base = _BASE_AMOUNTS[category] / 8  # many small entries per month
+        rows.append({
+            "id": i,
+            "category": category,
+            "name": f"{rng.choice(names)} #{i % 97}",
+            "amount": round(base * rng.lognormvariate(0, 0.6), 2),
+            "type": "Savings" if category == "Savings" else rng.choice(EXPENSE_TYPES[:2] + EXPENSE_TYPES[3:]),
+            "month": MONTHS[i % len(MONTHS)],
+            "note": "",
+        })
+    return rows
+
+
+def synthetic_store(size: int, seed: int = 0) -> ExpenseStore:
+    """An in-memory ExpenseStore holding `synthetic_expenses(size, seed)`."""
+    store = ExpenseStore()
+    store.extend(synthetic_expenses(size, seed))
+    return store
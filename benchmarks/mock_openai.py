@@ -0,0 +1,249 @@
+"""
+Local stand-in for the OpenAI chat-completions API.
+Speaks just enough of `POST /v1/chat/completions` (plain and streaming)
+for the openai client, with a configurable time-to-first-token, token
+rate and injected failures: 429s, auth errors and dropped connections.
+
+    python -m benchmarks.mock_openai --port 8765 --latency 0.3 --tokens-per-sec 50
+    FINMIND_AI_BASE_URL=http://127.0.0.1:8765/v1 streamlit run app.py
+
+Any API key is accepted except `sk-invalid`, which always gets a 401.
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+INVALID_KEY = "sk-invalid"
+
+_WORDS = (
+    "budget", "savings", "rate", "emergency", "fund", "index", "debt", "interest",
+    "month", "income", "spending", "goal", "plan", "automate", "transfer", "invest",
+)
+
+
+@dataclass
+class MockConfig:
+    """Behaviour of the mock server; every field can be changed while it runs."""
+    latency: float = 0.2          # seconds before the first token
+    jitter: float = 0.05          # ± uniform noise on `latency`
+    tokens_per_sec: float = 80.0  # streaming rate; 0 sends everything at once
+    reply_tokens: int = 120       # words per reply
+    rate_limit_rate: float = 0.0  # fraction of requests answered with 429
+    auth_error_rate: float = 0.0  # fraction answered with 401
+    drop_rate: float = 0.0        # fraction whose connection is closed without a reply
+    retry_after_ms: int = 50      # hint sent with 429s
+    seed: Optional[int] = None
+    stats: Dict[str, int] = field(default_factory=dict)
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+        self._lock = threading.Lock()
+
+    def roll(self) -> str:
+        """Outcome for the next request: ok, rate_limit, auth or drop."""
+        with self._lock:
+            x = self._rng.random()
+            outcome = "ok"
+            for name, rate in (("rate_limit", self.rate_limit_rate),
+                               ("auth", self.auth_error_rate),
+                               ("drop", self.drop_rate)):
+                if x < rate:
+                    outcome = name
+                    break
+                x -= rate
+            self.stats[outcome] = self.stats.get(outcome, 0) + 1
+            return outcome
+
+    def first_token_delay(self) -> float:
+        with self._lock:
+            return max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    # Headers and body are separate writes; with Nagle on, each JSON reply
+    # stalls ~40 ms on the client's delayed ACK and skews sync latencies
+    disable_nagle_algorithm = True
+    config: MockConfig = MockConfig()
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.rstrip("/").endswith("/models"):
+            self._send_json(200, {"object": "list", "data": [{"id": "gpt-4o", "object": "model"}]})
+        else:
+            self._send_json(404, _error_body("Not found", "not_found"))
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        try:
+            body = json.loads(self.rfile.read(length) or b"{}")
+        except ValueError:
+            self._send_json(400, _error_body("Invalid JSON body", "invalid_request_error"))
+            return
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, _error_body("Not found", "not_found"))
+            return
+
+        outcome = self.config.roll()
+        if self.headers.get("Authorization", "") == f"Bearer {INVALID_KEY}":
+            outcome = "auth"
+        if outcome == "drop":
+            self.close_connection = True
+            return
+        if outcome == "auth":
+            self._send_json(401, _error_body("Incorrect API key provided.", "invalid_api_key"))
+            return
+        if outcome == "rate_limit":
+            self._send_json(429, _error_body("Rate limit reached.", "rate_limit_exceeded"),
+                            {"retry-after-ms": str(self.config.retry_after_ms)})
+            return
+
+        time.sleep(self.config.first_token_delay())
+        words = _reply_words(body, self.config.reply_tokens)
+        if body.get("stream"):
+            self._stream(body, words)
+        else:
+            time.sleep(_generation_time(len(words), self.config.tokens_per_sec))
+            self._send_json(200, _completion(body, " ".join(words), len(words)))
+
+    def _stream(self, body: Dict, words) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        delay = _generation_time(1, self.config.tokens_per_sec)
+        try:
+            for i, word in enumerate(words):
+                self._write_event(_chunk(body, word if i == 0 else " " + word))
+                if delay:
+                    time.sleep(delay)
+            self._write_event(_chunk(body, None, "stop"))
+            self._write_chunk(b"data: [DONE]\n\n")
+            self._write_chunk(b"")
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # client cancelled
+
+    def _write_event(self, payload: Dict) -> None:
+        self._write_chunk(f"data: {json.dumps(payload)}\n\n".encode())
+
+    def _write_chunk(self, data: bytes) -> None:
+        self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+        self.wfile.flush()
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict] = None) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class MockOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+
+def serve(config: Optional[MockConfig] = None, host: str = "127.0.0.1",
+          port: int = 0) -> MockOpenAIServer:
+    """Start the mock in a background thread; `port=0` picks a free port.
+
+    The base URL for clients is `http://{host}:{server.server_port}/v1`.
+    Call `server.shutdown()` when done.
+    """
+    handler = type("Handler", (_Handler,), {"config": config or MockConfig()})
+    server = MockOpenAIServer((host, port), handler)
+    server.config = handler.config
+    threading.Thread(target=server.serve_forever, name="mock-openai", daemon=True).start()
+    return server
+
+
+def base_url(server: MockOpenAIServer) -> str:
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}/v1"
+
+
+# ── Payloads ──────────────────────────────────────────────────────────────────
+
+def _reply_words(body: Dict, count: int):
+    # Deterministic per prompt, so identical requests get identical replies
+    last = next((m.get("content", "") for m in reversed(body.get("messages", []))
+                 if m.get("role") == "user"), "")
+    rng = random.Random(last)
+    return [rng.choice(_WORDS) for _ in range(max(count, 1))]
+
+
+def _generation_time(tokens: int, tokens_per_sec: float) -> float:
+    return tokens / tokens_per_sec if tokens_per_sec > 0 else 0.0
+
+
+def _completion(body: Dict, text: str, tokens: int) -> Dict:
+    prompt_tokens = sum(len(str(m.get("content", ""))) // 4 for m in body.get("messages", []))
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o"),
+        "choices": [{"index": 0, "message": {"role": "assistant", "content": text},
+                     "finish_reason": "stop"}],
+        "usage": {"prompt_tokens": prompt_tokens, "completion_tokens": tokens,
+                  "total_tokens": prompt_tokens + tokens},
+    }
+
+
+def _chunk(body: Dict, content: Optional[str], finish_reason: Optional[str] = None) -> Dict:
+    delta = {} if content is None else {"content": content}
+    return {
+        "id": "chatcmpl-mock",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": body.get("model", "gpt-4o"),
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+
+
+def _error_body(message: str, code: str) -> Dict:
+    return {"error": {"message": message, "type": code, "param": None, "code": code}}
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2, help="seconds to first token")
+    parser.add_argument("--jitter", type=float, default=0.05)
+    parser.add_argument("--tokens-per-sec", type=float, default=80.0)
+    parser.add_argument("--reply-tokens", type=int, default=120)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="fraction of 429s")
+    parser.add_argument("--auth-error-rate", type=float, default=0.0, help="fraction of 401s")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="fraction of dropped connections")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    config = MockConfig(
+        latency=args.latency, jitter=args.jitter, tokens_per_sec=args.tokens_per_sec,
+        reply_tokens=args.reply_tokens, rate_limit_rate=args.rate_limit_rate,
+        auth_error_rate=args.auth_error_rate, drop_rate=args.drop_rate, seed=args.seed,
+    )
+    server = serve(config, args.host, args.port)
+    print(f"Mock OpenAI API on {base_url(server)} — Ctrl+C to stop")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"Requests: {config.stats}")
+
+
+if __name__ == "__main__":
+    main()
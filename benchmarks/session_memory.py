@@ -0,0 +1,123 @@
+"""
+Per-session memory report for sizing deployments.
+Builds N sessions the way app.py's init_state does (forks of the shared
+seed store on a throwaway ledger database), gives a fraction of them an
+edit and a chat history, then reports what one session costs by group,
+what is shared per process, and a projection for larger session counts.
+tracemalloc measures the same sessions as a cross-check of the estimates.
+
+    python -m benchmarks.session_memory
+    python -m benchmarks.session_memory --sessions 2000 --edit-rate 0.3 --turns 20
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import tracemalloc
+from typing import Dict, List
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from src.config import DEFAULT_EXPENSES, DEFAULT_INCOME, DEFAULT_MONTH  # noqa: E402
+from src.logic.budget import cached_budget  # noqa: E402
+from src.logic.memory import cache_report, format_bytes, session_report  # noqa: E402
+from src.logic.storage import LedgerDB  # noqa: E402
+from src.logic.store import ExpenseStore  # noqa: E402
+
+GROUPS = ("expenses", "messages", "other", "total")
+
+
+def _chat(rng: random.Random, turns: int) -> List[Dict]:
+    messages = []
+    for _ in range(turns):
+        messages.append({"role": "user", "content": "How do I cut my food spending? " * rng.randint(1, 3)})
+        messages.append({"role": "assistant", "content": "Here is a plan for your budget. " * rng.randint(10, 40)})
+    return messages
+
+
+def build_sessions(count: int, edit_rate: float, chat_rate: float, turns: int,
+                   seed: int = 0) -> List[Dict]:
+    """`count` session-state dicts shaped like app.py's init_state."""
+    rng = random.Random(seed)
+    db = LedgerDB(os.path.join(tempfile.mkdtemp(prefix="finmind-mem-"), "ledger.db"))
+    seed_store = ExpenseStore.frozen(DEFAULT_EXPENSES)
+    sessions = []
+    for i in range(count):
+        ledger = db.ledger(f"user-{i}")
+        store = seed_store.fork(ledger)
+        if rng.random() < edit_rate:
+            store.update(DEFAULT_EXPENSES[0]["id"], amount=DEFAULT_EXPENSES[0]["amount"] + rng.randint(1, 99))
+        cached_budget(store, DEFAULT_INCOME, month=DEFAULT_MONTH)
+        sessions.append({
+            "page": "chat",
+            "messages": _chat(rng, turns) if rng.random() < chat_rate else [],
+            "api_key": "",
+            "month": DEFAULT_MONTH,
+            "chat_job": None,
+            "ledger": ledger,
+            "expenses": store,
+            "income": DEFAULT_INCOME,
+        })
+    return sessions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--edit-rate", type=float, default=0.2, help="fraction of sessions that edit an expense")
+    parser.add_argument("--chat-rate", type=float, default=0.5, help="fraction of sessions with a chat history")
+    parser.add_argument("--turns", type=int, default=10, help="chat turns per chatting session")
+    parser.add_argument("--project", type=int, nargs="+", default=[1_000, 10_000, 50_000],
+                        help="session counts to project memory for")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args(argv)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    sessions = build_sessions(args.sessions, args.edit_rate, args.chat_rate, args.turns)
+    measured = (tracemalloc.get_traced_memory()[0] - before) / max(len(sessions), 1)
+    tracemalloc.stop()
+
+    reports = [session_report(s) for s in sessions]
+    per_session = {g: statistics.mean(r[g] for r in reports) for g in GROUPS}
+    worst = {g: max(r[g] for r in reports) for g in GROUPS}
+    shared = max(r["shared"] for r in reports)
+    caches = cache_report()
+    process = shared + sum(caches.values())
+    result = {
+        "sessions": args.sessions,
+        "per_session_mean": per_session,
+        "per_session_max": worst,
+        "per_session_traced": measured,
+        "shared_seed": shared,
+        "caches": caches,
+        "projection": {n: process + n * per_session["total"] for n in args.project},
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    print(f"{args.sessions} sessions  (edit rate {args.edit_rate:.0%}, chat rate {args.chat_rate:.0%}, "
+          f"{args.turns} turns)")
+    print(f"{'per session':<26}{'mean':>12}{'max':>12}")
+    for g in GROUPS:
+        print(f"  {g:<24}{format_bytes(per_session[g]):>12}{format_bytes(worst[g]):>12}")
+    print(f"  {'tracemalloc':<24}{format_bytes(measured):>12}   (includes ledger writes and cache entries)")
+    print("per process")
+    print(f"  {'shared seed':<24}{format_bytes(shared):>12}")
+    for name, size in caches.items():
+        print(f"  {name + ' cache':<24}{format_bytes(size):>12}")
+    print("projection (session state + shared, excluding Streamlit itself)")
+    for n, total in result["projection"].items():
+        print(f"  {n:>8,} sessions {format_bytes(total):>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1 @@
+"""FinMind headless scoring API"""
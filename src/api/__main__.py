@@ -0,0 +1,8 @@
+"""`python -m src.api` — run the headless scoring API."""
+
+import sys
+
+from src.api.server import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,174 @@
+"""
+Scoring functions behind the HTTP API.
+Validate a JSON ledger ({"income": ..., "expenses": [...]}) and score it
+with the budget engine. Everything here is a plain top-level function of
+JSON-ready values, so it runs the same on a request thread or inside a
+process-pool worker. Imports only src.logic — no Streamlit, no OpenAI.
+"""
+
+import json
+import math
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from src.config import API_MAX_EXPENSES
+from src.logic.budget import compute_budget, summarize_for_ai
+from src.logic.money import from_cents, parse_cents
+from src.logic.rollup import month_index
+
+_MAX_TEXT = 120  # Longest category/type accepted
+_MAX_AMOUNT = 1e12  # Dollars; keeps every cents total well inside int64
+
+_HEALTH_FIELDS = ("health_score", "savings_rate", "needs_pct", "wants_pct", "saves_pct", "net_savings")
+
+
+class RequestError(ValueError):
+    """A request the API rejects; `status` is the HTTP status to answer with."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+    def __reduce__(self):
+        # Keep the status when a pool worker's error is pickled back
+        return type(self), (str(self), self.status)
+
+
+# ── Parsing ────────────────────────────────────────────────────────────────────
+
+def loads(body: bytes) -> Any:
+    """JSON body → value. NaN/Infinity are rejected rather than scored."""
+    try:
+        return json.loads(body, parse_constant=_reject_constant)
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise RequestError(f"Invalid JSON body: {exc}") from None
+    except RecursionError:
+        raise RequestError("Invalid JSON body: nested too deeply") from None
+
+
+def parse_ledger(payload: Any) -> Tuple[List[Dict], float]:
+    """(expenses, income) of one ledger, validated and filtered to its `month` if given."""
+    if not isinstance(payload, dict):
+        raise RequestError("A ledger must be a JSON object")
+    income = _number(payload.get("income"), "income")
+    if income < 0:
+        raise RequestError("income must not be negative")
+    raw = payload.get("expenses", [])
+    if not isinstance(raw, list):
+        raise RequestError("expenses must be a list")
+    if len(raw) > API_MAX_EXPENSES:
+        raise RequestError(f"At most {API_MAX_EXPENSES} expenses per ledger", 413)
+
+    month = payload.get("month")
+    if month is not None and (not isinstance(month, str) or month_index(month) is None):
+        raise RequestError('month must be "YYYY-MM"')
+
+    expenses = []
+    for i, e in enumerate(raw):
+        if not isinstance(e, dict):
+            raise RequestError(f"expenses[{i}] must be an object")
+        if month is not None and e.get("month") != month:
+            continue
+        expenses.append({
+            "category": _text(e.get("category", "Other"), f"expenses[{i}].category"),
+            "amount": _amount(e.get("amount"), f"expenses[{i}].amount"),
+            "type": _text(e.get("type", "Variable"), f"expenses[{i}].type"),
+        })
+    return expenses, income
+
+
+# ── Scores ─────────────────────────────────────────────────────────────────────
+
+def score_budget(payload: Any) -> Dict[str, Any]:
+    """Full budget breakdown, as compute_budget returns it."""
+    expenses, income = parse_ledger(payload)
+    return compute_budget(expenses, income)
+
+
+def score_health(payload: Any) -> Dict[str, Any]:
+    """Health score (0–100) with the ratios it is derived from."""
+    budget = score_budget(payload)
+    return {k: budget[k] for k in _HEALTH_FIELDS}
+
+
+def score_summary(payload: Any) -> Dict[str, Any]:
+    """The plain-text summary the AI mentor gets as context."""
+    expenses, income = parse_ledger(payload)
+    return {"summary": summarize_for_ai(expenses, income)}
+
+
+SCORERS: Dict[str, Callable[[Any], Dict[str, Any]]] = {
+    "budget": score_budget,
+    "health-score": score_health,
+    "summary": score_summary,
+}
+
+
+def score(kind: str, payload: Any) -> Dict[str, Any]:
+    return SCORERS[kind](payload)
+
+
+def score_body(kind: str, body: bytes) -> Dict[str, Any]:
+    """Parse and score a raw request body — for the pool, so parsing leaves the server too."""
+    return score(kind, loads(body))
+
+
+def score_many(kind: str, ledgers: List[Any]) -> List[Dict[str, Any]]:
+    """Score a slice of a batch. A bad ledger yields {"error": ...} instead of failing the rest."""
+    results = []
+    for ledger in ledgers:
+        try:
+            result = score(kind, ledger)
+        except RequestError as exc:
+            result = {"error": str(exc)}
+        if isinstance(ledger, dict) and "id" in ledger:
+            result = {"id": ledger["id"], **result}
+        results.append(result)
+    return results
+
+
+def expense_count(ledger: Any) -> int:
+    """Cheap size of a ledger, for splitting batches into balanced tasks."""
+    expenses = ledger.get("expenses") if isinstance(ledger, dict) else None
+    return len(expenses) if isinstance(expenses, list) else 0
+
+
+def ping() -> int:
+    """No-op task used to start pool workers ahead of the first request."""
+    return 0
+
+
+# ── Validation helpers ─────────────────────────────────────────────────────────
+
+def _number(value: Any, name: str) -> float:
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise RequestError(f"{name} must be a number")
+    try:
+        value = float(value)
+    except OverflowError:
+        value = math.inf
+    if not abs(value) <= _MAX_AMOUNT:
+        raise RequestError(f"{name} must be a finite number of at most {_MAX_AMOUNT:,.0f}")
+    return value
+
+
+def _amount(value: Any, name: str) -> float:
+    # Numeric strings ("12.50") are parsed exactly, like statement imports
+    if isinstance(value, str):
+        cents: Optional[int] = parse_cents(value)
+        if cents is None:
+            raise RequestError(f"{name} must be a number")
+        try:
+            return _number(from_cents(cents), name)
+        except OverflowError:
+            return _number(math.inf, name)
+    return _number(value, name)
+
+
+def _text(value: Any, name: str) -> str:
+    if not isinstance(value, str) or len(value) > _MAX_TEXT:
+        raise RequestError(f"{name} must be a string of at most {_MAX_TEXT} characters")
+    return value
+
+
+def _reject_constant(name: str):
+    raise ValueError(f"{name} is not a valid amount")
@@ -0,0 +1,282 @@
+"""
+Headless JSON scoring API.
+A stdlib ThreadingHTTPServer in front of the budget engine, for other
+services to score ledgers without the Streamlit UI (which is never
+imported on this path). Small ledgers are scored on the request thread;
+large ones and batches go to a process pool, so CPU-bound scoring runs
+outside the server's GIL. Bodies are capped at API_MAX_BODY_BYTES,
+in-flight requests at API_MAX_INFLIGHT (503 beyond), and slow clients
+time out after API_READ_TIMEOUT.
+
+    python -m src.api --port 8080 --workers 4
+
+    POST /v1/budget          {"income": 6400, "expenses": [{"category": "Food", "amount": 12.5,
+                              "type": "Variable", "month": "2026-02"}], "month": "2026-02"}
+    POST /v1/health-score    same body → {"health_score": 74, "savings_rate": ..., ...}
+    POST /v1/summary         same body → {"summary": "Monthly Income: ..."}
+    POST /v1/batch/<kind>    {"ledgers": [{"id": "a", "income": ..., "expenses": [...]}, ...]}
+                             → {"results": [{"id": "a", ...} | {"id": ..., "error": "..."}]}
+    GET  /healthz
+"""
+
+import argparse
+import json
+import multiprocessing
+import signal
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from src.api import scoring
+from src.api.scoring import RequestError
+from src.config import (
+    API_HOST,
+    API_INLINE_BYTES,
+    API_MAX_BATCH,
+    API_MAX_BODY_BYTES,
+    API_MAX_INFLIGHT,
+    API_PORT,
+    API_READ_TIMEOUT,
+    API_TASK_EXPENSES,
+    API_TASK_TIMEOUT,
+    API_WORKERS,
+)
+
+_PREFIX = "/v1/"
+_BATCH_PREFIX = "/v1/batch/"
+
+
+class WorkerPool:
+    """Process pool for CPU-bound scoring, restarted if a worker dies."""
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self._lock = threading.Lock()
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def start(self) -> None:
+        """Spawn every worker now, so the first requests don't pay for it."""
+        executor = self._get()
+        for future in [executor.submit(scoring.ping) for _ in range(self.workers)]:
+            future.result()
+
+    def run(self, calls: Sequence[Tuple[Callable, tuple]], timeout: float = API_TASK_TIMEOUT) -> List[Any]:
+        """Results of `calls` ((fn, args) pairs) run in parallel, in order."""
+        executor = self._get()
+        deadline = time.monotonic() + timeout
+        futures: List[Future] = []
+        try:
+            futures = [executor.submit(fn, *args) for fn, args in calls]
+            return [f.result(timeout=max(deadline - time.monotonic(), 0)) for f in futures]
+        except FutureTimeout:
+            for f in futures:
+                f.cancel()
+            raise RequestError("Scoring timed out", 504) from None
+        except BrokenProcessPool:
+            self._reset(executor)
+            raise RequestError("Scoring workers restarted; retry the request", 503) from None
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(cancel_futures=True)
+                self._executor = None
+
+    def _get(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(self.workers, mp_context=_mp_context())
+            return self._executor
+
+    def _reset(self, broken: ProcessPoolExecutor) -> None:
+        with self._lock:
+            if self._executor is broken:
+                self._executor = None
+        broken.shutdown(wait=False, cancel_futures=True)
+
+
+def _mp_context():
+    # The server is multi-threaded, so never plain fork(): forkserver where
+    # available (children fork from a clean, pre-imported process), else spawn.
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("forkserver")
+        context.set_forkserver_preload(["src.api.scoring"])
+        return context
+    return multiprocessing.get_context("spawn")
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "FinMindAPI/1.0"
+    timeout = API_READ_TIMEOUT  # applied to the socket: bounds slow uploads
+    # Headers and body go out in separate writes; with Nagle on, the body
+    # waits for the client's delayed ACK (~40 ms) on keep-alive connections
+    disable_nagle_algorithm = True
+    server: "ScoringServer"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0].rstrip("/") == "/healthz":
+            pool = self.server.pool
+            self._send_json(200, {"status": "ok", "workers": pool.workers if pool else 0})
+        else:
+            self._send_json(404, {"error": "Not found"})
+
+    def do_POST(self):
+        self._body_read = False
+        if not self.server.slots.acquire(blocking=False):
+            self._send_json(503, {"error": "Server busy"}, {"Retry-After": "1"})
+            return
+        try:
+            status, payload = 200, self._dispatch()
+        except RequestError as exc:
+            status, payload = exc.status, {"error": str(exc)}
+        except (ConnectionError, TimeoutError):
+            raise  # the client is gone or stalled; nothing to answer
+        except Exception as exc:
+            status, payload = 500, {"error": f"Internal error: {type(exc).__name__}"}
+        finally:
+            self.server.slots.release()
+        self._send_json(status, payload)
+
+    def _dispatch(self) -> Dict[str, Any]:
+        path = self.path.split("?", 1)[0].rstrip("/")
+        if path.startswith(_BATCH_PREFIX):
+            kind, batch = path[len(_BATCH_PREFIX):], True
+        elif path.startswith(_PREFIX):
+            kind, batch = path[len(_PREFIX):], False
+        else:
+            kind, batch = None, False
+        if kind not in scoring.SCORERS:
+            raise RequestError("Not found", 404)
+        body = self._read_body()
+        if batch:
+            return {"results": self.server.score_batch(kind, body)}
+        return self.server.score_one(kind, body)
+
+    def _read_body(self) -> bytes:
+        if self.headers.get("Transfer-Encoding"):
+            raise RequestError("Send a Content-Length; chunked bodies are not accepted", 411)
+        length = self.headers.get("Content-Length", "")
+        if not length.isdigit():
+            raise RequestError("Content-Length required", 411)
+        if int(length) > API_MAX_BODY_BYTES:
+            raise RequestError(f"Body larger than {API_MAX_BODY_BYTES} bytes", 413)
+        if self.headers.get_content_type() != "application/json":
+            raise RequestError("Content-Type must be application/json", 415)
+        body = self.rfile.read(int(length))
+        self._body_read = True
+        if len(body) < int(length):
+            raise RequestError("Incomplete body")
+        return body
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict] = None) -> None:
+        data = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if self.command == "POST" and not self._body_read:
+            # The body is still on the socket, so the connection can't be reused
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(data)
+
+
+class ScoringServer(ThreadingHTTPServer):
+    """The API server; `workers=0` scores everything on request threads."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+    request_queue_size = API_MAX_INFLIGHT
+
+    def __init__(self, address: Tuple[str, int], workers: int = API_WORKERS,
+                 inline_bytes: int = API_INLINE_BYTES):
+        super().__init__(address, _Handler)
+        self.pool = WorkerPool(workers) if workers > 0 else None
+        self.inline_bytes = inline_bytes
+        self.slots = threading.BoundedSemaphore(API_MAX_INFLIGHT)
+
+    def score_one(self, kind: str, body: bytes) -> Dict[str, Any]:
+        if self.pool is None or len(body) <= self.inline_bytes:
+            return scoring.score_body(kind, body)
+        # Parsing moves to the worker too: the raw bytes are all it needs
+        return self.pool.run([(scoring.score_body, (kind, body))])[0]
+
+    def score_batch(self, kind: str, body: bytes) -> List[Dict[str, Any]]:
+        payload = scoring.loads(body)
+        ledgers = payload.get("ledgers") if isinstance(payload, dict) else None
+        if not isinstance(ledgers, list):
+            raise RequestError('A batch needs a "ledgers" list')
+        if len(ledgers) > API_MAX_BATCH:
+            raise RequestError(f"At most {API_MAX_BATCH} ledgers per batch", 413)
+        if self.pool is None:
+            return scoring.score_many(kind, ledgers)
+        tasks = _split(ledgers, API_TASK_EXPENSES)
+        results = self.pool.run([(scoring.score_many, (kind, task)) for task in tasks])
+        return [r for chunk in results for r in chunk]
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.pool is not None:
+            self.pool.shutdown()
+
+
+def _split(ledgers: List[Any], task_expenses: int) -> List[List[Any]]:
+    """Consecutive runs of ledgers holding about `task_expenses` expenses each."""
+    tasks: List[List[Any]] = [[]]
+    size = 0
+    for ledger in ledgers:
+        if tasks[-1] and size >= task_expenses:
+            tasks.append([])
+            size = 0
+        tasks[-1].append(ledger)
+        size += scoring.expense_count(ledger) + 1
+    return tasks
+
+
+def serve(host: str = API_HOST, port: int = API_PORT, workers: int = API_WORKERS,
+          inline_bytes: int = API_INLINE_BYTES) -> ScoringServer:
+    """Start the API in a background thread with warm workers; `port=0` picks a free port.
+
+    `inline_bytes=0` sends every single-ledger request to the pool.
+    Call `server.shutdown()` and `server.server_close()` when done.
+    """
+    server = ScoringServer((host, port), workers, inline_bytes)
+    if server.pool is not None:
+        server.pool.start()
+    threading.Thread(target=server.serve_forever, name="finmind-api", daemon=True).start()
+    return server
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--host", default=API_HOST)
+    parser.add_argument("--port", type=int, default=API_PORT)
+    parser.add_argument("--workers", type=int, default=API_WORKERS,
+                        help="scoring processes (0 = score on request threads)")
+    args = parser.parse_args(argv)
+    # Stop cleanly (workers reaped) on SIGTERM as well as Ctrl-C
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    server = ScoringServer((args.host, args.port), args.workers)
+    if server.pool is not None:
+        server.pool.start()
+    host, port = server.server_address[:2]
+    print(f"FinMind API on http://{host}:{port} ({args.workers} workers)", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+    return 0
@@ -0,0 +1,296 @@
+"""
+Batch scoring CLI.
+Scores every user-month in a directory or glob of ledger files (CSV, JSON,
+Parquet — see src/logic/ledger_files.py) across CPU cores and streams one
+result row per user-month to CSV or Parquet. No Streamlit.
+
+    python -m src.cli ledgers/ --output report.csv
+    python -m src.cli 'exports/**/*.parquet' --output report.parquet --workers 8
+
+Runs are resumable. Every BATCH_CHECKPOINT_FILES files the output is
+synced and the files it now covers are appended to a checkpoint journal
+(`<output>.checkpoint`). A killed run restarted with the same command cuts
+the output back to its last checkpoint and scores only the remaining
+files. The journal is removed when a run completes; --restart ignores it,
+and a run whose output was deleted or cut short starts over. CSV output is
+one file; Parquet output is a directory with one part file per checkpoint.
+
+FinMind is not an installable package, so there is no `finmind` console
+script: run the CLI as a module from the repository root.
+"""
+
+import argparse
+import csv
+import functools
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Sequence, Set, Tuple
+
+from src.config import BATCH_CHECKPOINT_FILES, BATCH_CHUNKSIZE, BATCH_WORKERS, DEFAULT_INCOME
+from src.logic.ledger_files import LEDGER_SUFFIXES, RESULT_FIELDS, score_file
+
+_INT_FIELDS = {"expenses", "skipped", "health_score"}
+_TEXT_FIELDS = {"source", "user", "month", "error"}
+_PART_PREFIX = "part-"
+
+
+def find_ledgers(inputs: Sequence[str]) -> List[str]:
+    """Ledger files named by `inputs` (files, directories searched recursively, or globs), sorted."""
+    found: Set[str] = set()
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            for root, _, names in os.walk(pattern):
+                found.update(os.path.join(root, n) for n in names if n.lower().endswith(LEDGER_SUFFIXES))
+        elif glob.has_magic(pattern):
+            found.update(p for p in glob.glob(pattern, recursive=True)
+                         if p.lower().endswith(LEDGER_SUFFIXES) and os.path.isfile(p))
+        elif os.path.isfile(pattern):
+            found.add(pattern)
+        else:
+            raise FileNotFoundError(pattern)
+    return sorted(found)
+
+
+# ── Checkpoints ────────────────────────────────────────────────────────────────
+
+class Checkpoint:
+    """Append-only journal of scored files and the output state they end at.
+
+    Line one names the output; each later line is {"files": [...], "state": n,
+    "errors": e}, where n is the CSV byte offset or the number of Parquet
+    parts and e counts unreadable files. A torn last line (killed
+    mid-write) is ignored.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.done: Set[str] = set()
+        self.state = 0
+        self.errors = 0
+
+    def resume(self, output: str, fmt: str) -> bool:
+        """Load the journal; False if there is none. Exits if it is for another output."""
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return False
+        try:
+            header = json.loads(lines[0]) if lines else None
+        except ValueError:
+            header = None
+        if header != {"output": os.path.abspath(output), "format": fmt}:
+            raise SystemExit(f"{self.path} belongs to another run; pass --restart to start over")
+        for line in lines[1:]:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                break
+            self.done.update(entry["files"])
+            self.state = entry["state"]
+            self.errors += entry["errors"]
+        return True
+
+    def start(self, output: str, fmt: str) -> None:
+        self.done, self.state, self.errors = set(), 0, 0
+        self._write("w", {"output": os.path.abspath(output), "format": fmt})
+
+    def commit(self, files: List[str], state: int, errors: int) -> None:
+        self._write("a", {"files": files, "state": state, "errors": errors})
+        self.done.update(files)
+        self.state = state
+        self.errors += errors
+
+    def remove(self) -> None:
+        os.remove(self.path)
+
+    def _write(self, mode: str, entry: Dict) -> None:
+        with open(self.path, mode, encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+
+# ── Output ─────────────────────────────────────────────────────────────────────
+
+class CsvSink:
+    """Result rows appended to one CSV file; `state` is its synced length in bytes."""
+
+    def __init__(self, path: str, state: int):
+        if state:
+            self._file = open(path, "r+", newline="", encoding="utf-8")
+            self._file.truncate(state)  # drop rows written after the last checkpoint
+            self._file.seek(state)
+            self._writer = csv.DictWriter(self._file, RESULT_FIELDS)
+        else:
+            self._file = open(path, "w", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._file, RESULT_FIELDS)
+            self._writer.writeheader()
+
+    def write(self, rows: List[Dict]) -> None:
+        self._writer.writerows(rows)
+
+    def commit(self) -> int:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetSink:
+    """Result rows written as one Parquet part file per checkpoint; `state` counts parts."""
+
+    def __init__(self, path: str, state: int):
+        import pyarrow as pa  # optional: only needed for Parquet output
+
+        self._pa = pa
+        self._schema = pa.schema([
+            (f, pa.int64() if f in _INT_FIELDS else pa.string() if f in _TEXT_FIELDS else pa.float64())
+            for f in RESULT_FIELDS
+        ])
+        self.path = path
+        self.parts = state
+        self._rows: List[Dict] = []
+        os.makedirs(path, exist_ok=True)
+        # Drop parts (or half-written files) from after the last checkpoint
+        for name in os.listdir(path):
+            if name.startswith(_PART_PREFIX) and (
+                not name.endswith(".parquet") or int(name[len(_PART_PREFIX):-8]) >= state
+            ):
+                os.remove(os.path.join(path, name))
+
+    def write(self, rows: List[Dict]) -> None:
+        self._rows.extend(rows)
+
+    def commit(self) -> int:
+        if self._rows:
+            import pyarrow.parquet as pq
+
+            table = self._pa.Table.from_pylist(self._rows, schema=self._schema)
+            final = os.path.join(self.path, f"{_PART_PREFIX}{self.parts:05d}.parquet")
+            pq.write_table(table, final + ".tmp")
+            os.replace(final + ".tmp", final)
+            self.parts += 1
+            self._rows = []
+        return self.parts
+
+    def close(self) -> None:
+        pass
+
+
+def _output_intact(path: str, fmt: str, state: int) -> bool:
+    """Whether `path` still holds everything up to checkpoint `state`."""
+    if fmt == "parquet":
+        return all(os.path.isfile(os.path.join(path, f"{_PART_PREFIX}{i:05d}.parquet")) for i in range(state))
+    try:
+        return os.path.getsize(path) >= state
+    except OSError:
+        return not state
+
+
+# ── Run ────────────────────────────────────────────────────────────────────────
+
+@contextmanager
+def _scored(files: List[str], income: float, workers: int) -> Iterator[Iterable[Tuple[str, List[Dict]]]]:
+    """(path, rows) per file as workers finish them, in completion order."""
+    score = functools.partial(score_file, income=income)
+    if workers <= 1:
+        yield map(score, files)
+        return
+    with multiprocessing.Pool(workers) as pool:
+        yield pool.imap_unordered(score, files, chunksize=BATCH_CHUNKSIZE)
+
+
+def run(files: List[str], output: str, fmt: str, checkpoint: Checkpoint,
+        income: float = DEFAULT_INCOME, workers: int = BATCH_WORKERS,
+        every: int = BATCH_CHECKPOINT_FILES, log=None) -> Dict[str, int]:
+    """Score `files` not yet in `checkpoint` into `output`; counts of what this run did."""
+    sink = (ParquetSink if fmt == "parquet" else CsvSink)(output, checkpoint.state)
+    todo = [f for f in files if f not in checkpoint.done]
+    counts = {"files": 0, "rows": 0, "errors": 0, "resumed": len(files) - len(todo)}
+    pending: List[str] = []
+    pending_errors = 0
+    start = time.perf_counter()
+    try:
+        with _scored(todo, income, workers) as results:
+            for path, rows in results:
+                sink.write(rows)
+                pending.append(path)
+                counts["files"] += 1
+                counts["rows"] += len(rows)
+                pending_errors += any(r["error"] for r in rows)
+                if len(pending) >= every:
+                    checkpoint.commit(pending, sink.commit(), pending_errors)
+                    counts["errors"] += pending_errors
+                    pending, pending_errors = [], 0
+                    if log:
+                        rate = counts["files"] / (time.perf_counter() - start)
+                        log(f"{counts['files'] + counts['resumed']}/{len(files)} files "
+                            f"({rate:.0f} files/s), {counts['rows']} rows")
+        checkpoint.commit(pending, sink.commit(), pending_errors)
+        counts["errors"] += pending_errors
+    finally:
+        sink.close()
+    return counts
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description=__doc__.split("\n")[1])
+    parser.add_argument("inputs", nargs="+", help="ledger files, directories or glob patterns")
+    parser.add_argument("-o", "--output", required=True, help="report.csv, or report.parquet (a directory)")
+    parser.add_argument("--format", choices=("csv", "parquet"), help="default: from the output suffix")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="processes (1 = no pool)")
+    parser.add_argument("--income", type=float, default=DEFAULT_INCOME,
+                        help="monthly income for ledgers that don't state one")
+    parser.add_argument("--checkpoint", help="journal path (default: <output>.checkpoint)")
+    parser.add_argument("--checkpoint-every", type=int, default=BATCH_CHECKPOINT_FILES, metavar="FILES")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("-q", "--quiet", action="store_true")
+    args = parser.parse_args(argv)
+
+    fmt = args.format or ("parquet" if args.output.lower().endswith(".parquet") else "csv")
+    try:
+        files = find_ledgers(args.inputs)
+    except FileNotFoundError as exc:
+        parser.error(f"no such file or directory: {exc}")
+    if fmt == "parquet" or any(f.lower().endswith(".parquet") for f in files):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            parser.error("Parquet files need pyarrow (pip install pyarrow)")
+
+    log = None if args.quiet else functools.partial(print, file=sys.stderr)
+    checkpoint = Checkpoint(args.checkpoint or args.output.rstrip("/\\") + ".checkpoint")
+    if args.restart or not checkpoint.resume(args.output, fmt):
+        checkpoint.start(args.output, fmt)
+    elif not _output_intact(args.output, fmt, checkpoint.state):
+        print(f"{args.output} is missing rows recorded in {checkpoint.path}; starting over",
+              file=sys.stderr)
+        checkpoint.start(args.output, fmt)
+    elif log:
+        log(f"Resuming: {len(checkpoint.done)} files already scored")
+
+    try:
+        counts = run(files, args.output, fmt, checkpoint, args.income, args.workers,
+                     max(args.checkpoint_every, 1), log)
+    except KeyboardInterrupt:
+        print(f"Interrupted after {len(checkpoint.done)} files; run the same command to resume",
+              file=sys.stderr)
+        return 130
+    checkpoint.remove()
+    if log:
+        log(f"Scored {counts['files']} files ({counts['resumed']} from a previous run) → "
+            f"{counts['rows']} rows in {args.output}; {checkpoint.errors} unreadable")
+    # Unreadable files still get an error row, but fail the job so it gets noticed
+    return 1 if checkpoint.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
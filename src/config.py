@@ -3,6 +3,9 @@ Configuration module for FinMind application.
 Centralizes all constants and settings.
 """
 
+import os
+from types import MappingProxyType
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Application Settings
 # ─────────────────────────────────────────────────────────────────────────────
@@ -23,9 +26,16 @@ STREAMLIT_PAGE_CONFIG = {
 # ─────────────────────────────────────────────────────────────────────────────
 # Financial Configuration
 # ─────────────────────────────────────────────────────────────────────────────
+# Months the demo and synthetic benchmark data span. The UI offers the
+# months found in the ledger instead (see src/logic/rollup.py).
 MONTHS = ["2026-01", "2026-02", "2026-03", "2025-12", "2025-11"]
 DEFAULT_MONTH = "2026-02"
 
+# Dashboard trend view: selectable look-back windows (months) and the
+# rolling-average length drawn over the monthly bars
+TREND_WINDOWS = {"3M": 3, "6M": 6, "12M": 12, "24M": 24}
+TREND_ROLLING_MONTHS = 3
+
 EXPENSE_CATEGORIES = [
     "Housing", "Food", "Transport", "Subscriptions",
     "Health", "Entertainment", "Savings", "Debt", "Other"
@@ -33,6 +43,8 @@ EXPENSE_CATEGORIES = [
 
 EXPENSE_TYPES = ["Fixed", "Variable", "Savings", "One-time"]
 
+EXPENSE_PAGE_SIZE = 50  # Rows per page in the expense table
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Theme Colors & Styling
 # ─────────────────────────────────────────────────────────────────────────────
@@ -95,20 +107,74 @@ BUDGET_BENCHMARKS = {
 BUDGET_NEEDS_CATEGORIES = {"Housing", "Transport", "Health", "Debt"}
 BUDGET_WANTS_CATEGORIES = {"Food", "Entertainment", "Subscriptions", "Other"}
 
+BUDGET_CACHE_SIZE = 256  # Memoized budgets kept across sessions (LRU)
+FIGURE_CACHE_SIZE = 64   # Dashboard figures kept across sessions (LRU)
+
 # ─────────────────────────────────────────────────────────────────────────────
 # AI Configuration
 # ─────────────────────────────────────────────────────────────────────────────
 AI_MODEL = "gpt-4o"
 AI_TEMPERATURE = 0.7
 AI_MAX_TOKENS = 1000
-AI_HISTORY_WINDOW = 16  # Number of previous messages to include
+AI_HISTORY_WINDOW = 16  # Most previous messages sent verbatim
+
+# Conversation budget (see src/logic/history.py)
+AI_HISTORY_TOKENS = 3000      # Tokens of history per request, summary included
+AI_SUMMARY_TOKENS = 400       # Tokens for the rolling summary of older turns
+AI_SUMMARY_CACHE_SIZE = 512   # Cached rolling summaries (LRU)
+
+# Connection reuse for the OpenAI API (see src/logic/clients.py)
+AI_BASE_URL = os.environ.get("FINMIND_AI_BASE_URL") or None  # e.g. the benchmarks mock server
+AI_CONNECT_TIMEOUT = float(os.environ.get("FINMIND_AI_CONNECT_TIMEOUT", "5"))  # seconds
+AI_READ_TIMEOUT = float(os.environ.get("FINMIND_AI_READ_TIMEOUT", "60"))       # seconds
+AI_CLIENT_POOL_SIZE = 64      # API keys with a cached client (LRU)
+AI_MAX_CONNECTIONS = 100      # Shared HTTP pool size
+AI_MAX_KEEPALIVE = 20         # Idle connections kept open
+AI_KEEPALIVE_EXPIRY = 30.0    # Seconds an idle connection stays open
+
+# Reply cache (see src/logic/response_cache.py)
+AI_CACHE_PATH = os.environ.get("FINMIND_AI_CACHE_PATH", "finmind_cache.db")
+AI_CACHE_TTL = 24 * 3600      # Seconds a cached reply stays valid
+AI_CACHE_MEMORY_SIZE = 256    # Replies kept in memory (LRU)
+AI_CACHE_MAX_ENTRIES = 5000   # Replies kept on disk
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Persistence
+# ─────────────────────────────────────────────────────────────────────────────
+DB_PATH = os.environ.get("FINMIND_DB_PATH", "finmind.db")
+SESSION_PARAM = "session"  # URL parameter carrying the session's ledger token
+IMPORT_CHUNK_SIZE = 5000  # Statement rows per bulk insert
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Scoring API (see src/api/)
+# ─────────────────────────────────────────────────────────────────────────────
+API_HOST = os.environ.get("FINMIND_API_HOST", "127.0.0.1")
+API_PORT = int(os.environ.get("FINMIND_API_PORT", "8080"))
+API_WORKERS = int(os.environ.get("FINMIND_API_WORKERS", str(os.cpu_count() or 1)))  # 0 = score inline
+API_MAX_BODY_BYTES = 8 * 1024 * 1024  # Larger requests get 413 without being read
+API_MAX_EXPENSES = 100_000    # Expenses per ledger
+API_MAX_BATCH = 1000          # Ledgers per batch request
+API_INLINE_BYTES = 256 * 1024  # Single-ledger bodies up to this size are scored on the request thread
+API_TASK_EXPENSES = 20_000    # Expenses per process-pool task when splitting a batch
+API_MAX_INFLIGHT = 64         # Concurrent requests before answering 503
+API_READ_TIMEOUT = 10.0       # Seconds a client may take to send its request
+API_TASK_TIMEOUT = 30.0       # Seconds a request may wait on the pool before 504
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Batch Scoring CLI (see src/cli.py)
+# ─────────────────────────────────────────────────────────────────────────────
+BATCH_WORKERS = os.cpu_count() or 1
+BATCH_CHECKPOINT_FILES = 500  # Ledger files per checkpoint (and per Parquet part)
+BATCH_CHUNKSIZE = 4           # Files handed to a worker process at a time
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Default Data
 # ─────────────────────────────────────────────────────────────────────────────
 DEFAULT_INCOME = 6400.0
 
-DEFAULT_EXPENSES = [
+# Seed ledger for new users. Read-only and shared by every session: the app
+# serves it from one frozen ExpenseStore that sessions fork copy-on-write.
+DEFAULT_EXPENSES = tuple(MappingProxyType(e) for e in [
     {"id": 1, "category": "Housing", "name": "Rent", "amount": 1800.0, "type": "Fixed", "month": "2026-02"},
     {"id": 2, "category": "Food", "name": "Groceries", "amount": 340.0, "type": "Variable", "month": "2026-02"},
     {"id": 3, "category": "Transport", "name": "Car Insurance", "amount": 180.0, "type": "Fixed", "month": "2026-02"},
@@ -118,6 +184,6 @@ DEFAULT_EXPENSES = [
     {"id": 7, "category": "Entertainment", "name": "Weekend outings", "amount": 150.0, "type": "Variable", "month": "2026-02"},
     {"id": 8, "category": "Savings", "name": "Emergency Fund", "amount": 500.0, "type": "Savings", "month": "2026-02"},
     {"id": 9, "category": "Debt", "name": "Student Loan", "amount": 400.0, "type": "Fixed", "month": "2026-02"},
-]
+])
 
 DEFAULT_NEXT_ID = 10
@@ -3,13 +3,23 @@ OpenAI GPT integration for FinMind.
 Handles API calls, system prompt building, and error handling.
 """
 
-from typing import List, Dict
+import hashlib
+from typing import AsyncIterator, List, Dict, Hashable, Iterator, Optional
+from src.config import AI_MODEL, AI_TEMPERATURE, AI_MAX_TOKENS, BUDGET_CACHE_SIZE
 from src.logic.budget import summarize_for_ai
+from src.logic.cache import LRUCache
+from src.logic.clients import get_async_client, get_client, openai
+from src.logic.history import fit_history
+from src.logic.records import ExpenseColumns
+from src.logic.response_cache import get_response_cache, make_key
+from src.logic.store import ExpenseStore
+
+_COMPLETION_PARAMS = {"model": AI_MODEL, "temperature": AI_TEMPERATURE, "max_tokens": AI_MAX_TOKENS}
 
 BASE_SYSTEM_PROMPT = """You are FinMind, a world-class AI personal finance mentor with the expertise of a CFP, CPA, and wealth manager combined.
 
 ## Your Mission
-Help users achieve financial freedom through personalized, data-driven, actionable advice based on their ACTUAL expense data shown below.
+Help users achieve financial freedom through personalized, data-driven, actionable advice based on their ACTUAL expense data, provided after these instructions.
 
 ## Expertise Areas
 - Budgeting & cash flow (50/30/20, zero-based budgeting)
@@ -32,15 +42,40 @@ Help users achieve financial freedom through personalized, data-driven, actionab
 ## Guardrails
 - Recommend consulting a CFP/CPA for complex tax/legal matters
 - Never guarantee investment returns
-- State assumptions clearly
+- State assumptions clearly"""
+
+FINANCIAL_DATA_HEADER = "## User's Current Financial Data:\n"
+
+# Rendered financial data, keyed on a digest of the expenses and income
+_context_cache = LRUCache(BUDGET_CACHE_SIZE)
+
+
+def build_system_prompt(expenses: list, income: float, month: Optional[str] = None) -> str:
+    """Instructions and financial data as one prompt (single-message callers)."""
+    return BASE_SYSTEM_PROMPT + "\n\n" + financial_context(expenses, income, month)
+
 
-## User's Current Financial Data:
-{financial_summary}"""
+def financial_context(expenses: list, income: float, month: Optional[str] = None) -> str:
+    """The user's financial data section (`month` only, if given), re-rendered only when the data changes."""
+    return _context_cache.get_or_compute(
+        _data_digest(expenses, income, month),
+        lambda: FINANCIAL_DATA_HEADER + summarize_for_ai(expenses, income, month),
+    )
 
 
-def build_system_prompt(expenses: list, income: float) -> str:
-    summary = summarize_for_ai(expenses, income)
-    return BASE_SYSTEM_PROMPT.format(financial_summary=summary)
+def _data_digest(expenses: list, income: float, month: Optional[str]) -> Hashable:
+    if isinstance(expenses, ExpenseStore):
+        # A store's version changes on every write, so there is nothing to hash
+        return ("store", expenses.uid, expenses.version, float(income), month)
+    h = hashlib.blake2b(digest_size=16)
+    if isinstance(expenses, ExpenseColumns):
+        # Codes are process-wide, so the raw columns identify the data
+        for column in (expenses.categories, expenses.cents, expenses.types, expenses.months):
+            h.update(column.tobytes())
+        return ("columns", h.hexdigest(), float(income), month)
+    for e in expenses:
+        h.update(repr((e["category"], e["amount"], e.get("type"), e.get("month"))).encode())
+    return ("list", h.hexdigest(), float(income), month)
 
 
 def chat_with_gpt(
@@ -49,48 +84,158 @@ def chat_with_gpt(
     history: List[Dict],
     expenses: list,
     income: float,
+    vary: bool = False,
+    month: Optional[str] = None,
 ) -> str:
-    """Send a message to GPT-4o and return the response."""
-    try:
-        import openai
-    except ImportError:
+    """Send a message to GPT-4o and return the response.
+
+    Replies are cached on the exact prompt; `vary=True` skips the lookup to
+    get a fresh answer (which then replaces the cached one).
+    """
+    if openai is None:
         return "⚠️ **OpenAI package not installed.** Run: `pip install openai`"
 
     if not api_key:
-        return get_demo_response(user_message, expenses, income)
+        return get_demo_response(user_message, expenses, income, month)
 
-    client = openai.OpenAI(api_key=api_key)
+    messages = build_messages(user_message, history, expenses, income, month)
+    cached = cached_reply(messages, vary)
+    if cached is not None:
+        return cached
 
-    system_prompt = build_system_prompt(expenses, income)
+    client = get_client(api_key)
+    try:
+        response = client.chat.completions.create(messages=messages, **_COMPLETION_PARAMS)
+        reply = response.choices[0].message.content
+        _remember(messages, reply)
+        return reply
 
-    messages = [{"role": "system", "content": system_prompt}]
-    # Rolling window — last 16 messages
-    messages.extend(history[-16:])
-    messages.append({"role": "user", "content": user_message})
+    except Exception as e:
+        return _error_message(e)
 
+
+def stream_chat_with_gpt(
+    api_key: str,
+    user_message: str,
+    history: List[Dict],
+    expenses: list,
+    income: float,
+    vary: bool = False,
+    month: Optional[str] = None,
+) -> Iterator[str]:
+    """Like `chat_with_gpt`, but yield the reply as text deltas as they arrive.
+
+    Without an API key the demo reply is yielded as a single chunk, as is a
+    cached reply; errors are yielded as the same warning text
+    `chat_with_gpt` returns.
+    """
+    if openai is None:
+        yield "⚠️ **OpenAI package not installed.** Run: `pip install openai`"
+        return
+
+    if not api_key:
+        yield get_demo_response(user_message, expenses, income, month)
+        return
+
+    messages = build_messages(user_message, history, expenses, income, month)
+    cached = cached_reply(messages, vary)
+    if cached is not None:
+        yield cached
+        return
+
+    client = get_client(api_key)
+    parts = []
     try:
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=messages,
-            temperature=0.7,
-            max_tokens=1000,
-        )
-        return response.choices[0].message.content
-
-    except openai.AuthenticationError:
+        stream = client.chat.completions.create(messages=messages, stream=True, **_COMPLETION_PARAMS)
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                yield parts[-1]
+        _remember(messages, "".join(parts))
+
+    except Exception as e:
+        yield _error_message(e)
+
+
+async def astream_completion(api_key: str, messages: List[Dict],
+                             vary: bool = False) -> AsyncIterator[str]:
+    """Async counterpart of `stream_chat_with_gpt` for prebuilt `messages`.
+
+    Used by the background chat engine; errors are yielded as warning text.
+    """
+    if openai is None:
+        yield "⚠️ **OpenAI package not installed.** Run: `pip install openai`"
+        return
+
+    cached = cached_reply(messages, vary)
+    if cached is not None:
+        yield cached
+        return
+
+    client = get_async_client(api_key)
+    parts = []
+    try:
+        stream = await client.chat.completions.create(messages=messages, stream=True, **_COMPLETION_PARAMS)
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                parts.append(chunk.choices[0].delta.content)
+                yield parts[-1]
+        _remember(messages, "".join(parts))
+
+    except Exception as e:
+        yield _error_message(e)
+
+
+def cached_reply(messages: List[Dict], vary: bool = False) -> Optional[str]:
+    """Previously generated reply to exactly these messages, if still fresh."""
+    if vary:
+        return None
+    return get_response_cache().get(make_key(messages=messages, **_COMPLETION_PARAMS))
+
+
+def _remember(messages: List[Dict], reply: str) -> None:
+    if reply:
+        get_response_cache().put(make_key(messages=messages, **_COMPLETION_PARAMS), reply)
+
+
+def build_messages(user_message: str, history: List[Dict], expenses: list, income: float,
+                   month: Optional[str] = None) -> List[Dict]:
+    """Chat-completions message list: instructions, financial data, budgeted history, new message.
+
+    With a `month`, the financial data covers that month only, matching
+    the monthly income it is compared against.
+
+    The static instructions are always the first message, byte for byte, so
+    provider-side prompt caching can reuse them across turns and users;
+    everything that varies comes after.
+    """
+    messages = [
+        {"role": "system", "content": BASE_SYSTEM_PROMPT},
+        {"role": "system", "content": financial_context(expenses, income, month)},
+    ]
+    # Recent turns verbatim within the token budget, older ones summarized
+    summary, recent = fit_history(history)
+    if summary is not None:
+        messages.append(summary)
+    messages.extend(recent)
+    messages.append({"role": "user", "content": user_message})
+    return messages
+
+
+def _error_message(error: Exception) -> str:
+    if isinstance(error, openai.AuthenticationError):
         return "⚠️ **Invalid API key.** Please check your key in the sidebar."
-    except openai.RateLimitError:
+    if isinstance(error, openai.RateLimitError):
         return "⚠️ **Rate limit reached.** Please wait a moment and try again."
-    except openai.APIConnectionError:
+    if isinstance(error, openai.APIConnectionError):
         return "⚠️ **Connection error.** Check your internet and try again."
-    except Exception as e:
-        return f"⚠️ **Error:** {str(e)}"
+    return f"⚠️ **Error:** {str(error)}"
 
 
-def get_demo_response(message: str, expenses: list, income: float) -> str:
-    """Smart demo responses when no API key is set."""
-    from src.logic.budget import compute_budget
-    budget = compute_budget(expenses, income)
+def get_demo_response(message: str, expenses: list, income: float, month: Optional[str] = None) -> str:
+    """Smart demo responses when no API key is set (on `month`'s expenses if given)."""
+    from src.logic.budget import cached_budget
+    budget = cached_budget(expenses, income, month)
     m = message.lower()
 
     if any(w in m for w in ["budget", "spend", "50/30", "allocation"]):
@@ -1,56 +1,125 @@
 """
 Core budget calculation logic.
-All financial math lives here — pure functions, no Streamlit.
+All financial math lives here — pure functions, no Streamlit. Sums and
+threshold checks run on integer cents (see money.py); results are
+reported in dollars.
 """
 
-from typing import List, Dict, Any
+from typing import TYPE_CHECKING, List, Dict, Any, Iterable, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
 from src.config import (
     CATEGORY_COLORS,
     CATEGORY_ICONS,
     BUDGET_BENCHMARKS,
     BUDGET_NEEDS_CATEGORIES,
     BUDGET_WANTS_CATEGORIES,
+    BUDGET_CACHE_SIZE,
 )
+from src.logic.cache import LRUCache
+from src.logic.money import BASIS_POINTS, from_cents, share_bp, sum_cents_groups, to_cents, to_cents_array
+from src.logic.records import ExpenseColumns
+from src.logic.store import ExpenseStore
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+_budget_cache = LRUCache(BUDGET_CACHE_SIZE)
+
+# A category is over budget above 11/10 of its benchmark share of income
+_OVER_NUM, _OVER_DEN = 11, 10
 
 
 def compute_budget(expenses: List[Dict], income: float) -> Dict[str, Any]:
-    """Compute full budget breakdown from expense list and income."""
+    """Compute full budget breakdown from expense list and income.
+
+    Also takes an ExpenseStore (running totals) or ExpenseColumns
+    (sums over category/type codes). Record lists are bucketed by
+    category and type in one pass; each bucket is summed in cents, and
+    the per-type totals are derived from those per-category buckets.
+    """
+    if isinstance(expenses, (ExpenseStore, ExpenseColumns)):
+        return budget_from_cents(expenses.category_cents(), income, expenses.type_cents())
     if not expenses or income <= 0:
         return _empty_budget(income)
 
-    # Sum by category
-    by_category: Dict[str, float] = {}
+    # Nested dicts rather than (category, type) keys: no tuple per row for
+    # the GC to chase. The loop body is kept to three subscripts and an
+    # append, about what the old float loop cost; the cents conversion and
+    # sums happen once per bucket, vectorized.
+    groups: Dict[str, Dict[str, list]] = {}
     for e in expenses:
-        cat = e.get("category", "Other")
-        by_category[cat] = by_category.get(cat, 0) + e.get("amount", 0)
+        try:
+            groups[e["category"]][e["type"]].append(e["amount"])
+        except KeyError:  # a bucket's first row, or a record with a field missing
+            cat, typ = e.get("category", "Other"), e.get("type", "Variable")
+            groups.setdefault(cat, {}).setdefault(typ, []).append(e.get("amount", 0))
+
+    by_category, by_type = _split_totals(sum_cents_groups(
+        {(cat, typ): amounts for cat, by_cat_type in groups.items() for typ, amounts in by_cat_type.items()}
+    ))
+    return budget_from_cents(by_category, income, by_type)
+
+
+def _split_totals(totals: Dict[Tuple[str, str], int]) -> Tuple[Dict[str, int], Dict[str, int]]:
+    """(by_category, by_type) cents from {(category, type): cents} totals."""
+    by_category: Dict[str, int] = {}
+    by_type: Dict[str, int] = {}
+    for (cat, typ), cents in totals.items():
+        by_category[cat] = by_category.get(cat, 0) + cents
+        by_type[typ] = by_type.get(typ, 0) + cents
+    return by_category, by_type
+
+
+def budget_from_totals(by_category: Dict[str, float], income: float,
+                       by_type: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """Derive the full budget breakdown from per-category totals in dollars."""
+    return budget_from_cents(
+        {k: to_cents(v) for k, v in by_category.items()}, income,
+        {k: to_cents(v) for k, v in (by_type or {}).items()},
+    )
+
+
+def budget_from_cents(by_category: Dict[str, int], income: float,
+                      by_type: Optional[Dict[str, int]] = None) -> Dict[str, Any]:
+    """Derive the full budget breakdown from per-category totals in cents.
+
+    Cost depends on the number of categories, not transactions — this is
+    what lets ExpenseStore's running sums skip the per-expense loop. All
+    sums and the over-benchmark test are exact integer arithmetic.
+    """
+    income_cents = to_cents(income)
+    if not by_category or income_cents <= 0:
+        return _empty_budget(income)
 
     total_expenses = sum(by_category.values())
 
     # Separate savings from spending
     savings_total = by_category.get("Savings", 0)
     spending_total = total_expenses - savings_total
-    net_savings = income - spending_total - savings_total
-    savings_rate = ((savings_total + max(net_savings, 0)) / income * 100) if income > 0 else 0
+    net_savings = income_cents - spending_total - savings_total
 
     # 50/30/20 breakdown
     needs = sum(v for k, v in by_category.items() if k in BUDGET_NEEDS_CATEGORIES)
     wants = sum(v for k, v in by_category.items() if k in BUDGET_WANTS_CATEGORIES)
     saves = savings_total + max(net_savings, 0)
 
-    needs_pct  = needs / income * 100 if income else 0
-    wants_pct  = wants / income * 100 if income else 0
-    saves_pct  = saves / income * 100 if income else 0
+    savings_rate = saves / income_cents * 100
+    needs_pct  = needs / income_cents * 100
+    wants_pct  = wants / income_cents * 100
+    saves_pct  = saves / income_cents * 100
 
     # Category breakdown with benchmarks
     category_detail = []
     for cat, amt in sorted(by_category.items(), key=lambda x: -x[1]):
-        benchmark = BUDGET_BENCHMARKS.get(cat, 0.05) * income
-        over = amt > benchmark * 1.1
+        bp = share_bp(BUDGET_BENCHMARKS.get(cat, 0.05))
+        over = amt * BASIS_POINTS * _OVER_DEN > bp * income_cents * _OVER_NUM
         category_detail.append({
             "category": cat,
-            "amount": amt,
-            "percent": amt / income * 100 if income else 0,
-            "benchmark": benchmark,
+            "amount": from_cents(amt),
+            "percent": amt / income_cents * 100,
+            "benchmark": income_cents * bp / BASIS_POINTS / 100,
             "over_budget": over,
             "color": CATEGORY_COLORS.get(cat, "#8899aa"),
             "icon": CATEGORY_ICONS.get(cat, "📦"),
@@ -58,27 +127,171 @@ def compute_budget(expenses: List[Dict], income: float) -> Dict[str, Any]:
 
     # Health score (0–100)
     health_score = _calculate_health_score(
-        savings_rate, needs_pct, wants_pct, net_savings, income
+        savings_rate, needs_pct, wants_pct, from_cents(net_savings), from_cents(income_cents)
     )
 
     return {
-        "total_expenses": total_expenses,
-        "spending_total": spending_total,
-        "savings_total": savings_total,
-        "net_savings": net_savings,
+        "total_expenses": from_cents(total_expenses),
+        "spending_total": from_cents(spending_total),
+        "savings_total": from_cents(savings_total),
+        "net_savings": from_cents(net_savings),
         "savings_rate": savings_rate,
-        "needs": needs,
-        "wants": wants,
-        "saves": saves,
+        "needs": from_cents(needs),
+        "wants": from_cents(wants),
+        "saves": from_cents(saves),
         "needs_pct": needs_pct,
         "wants_pct": wants_pct,
         "saves_pct": saves_pct,
-        "by_category": by_category,
+        "by_category": {k: from_cents(v) for k, v in by_category.items()},
+        "by_type": {k: from_cents(v) for k, v in (by_type or {}).items()},
         "category_detail": category_detail,
         "health_score": int(health_score),
     }
 
 
+def cached_budget(expenses: Iterable[Dict], income: float,
+                  month: Optional[str] = None) -> Dict[str, Any]:
+    """Budget for `expenses` (optionally one month), memoized for ExpenseStores.
+
+    The cache key is the store's identity and mutation version plus income
+    and month, so unchanged data is never re-aggregated across reruns; a
+    miss derives the budget from the store's running category totals
+    (exact cents).
+    The returned dict is shared — treat it as read-only.
+    """
+    if isinstance(expenses, ExpenseColumns):
+        return compute_budget(expenses if month is None else expenses.for_month(month), income)
+    if not isinstance(expenses, ExpenseStore):
+        if month is not None:
+            expenses = [e for e in expenses if e.get("month") == month]
+        return compute_budget(list(expenses), income)
+
+    key = (expenses.uid, expenses.version, float(income), month)
+    return _budget_cache.get_or_compute(
+        key,
+        lambda: budget_from_cents(
+            expenses.category_cents(month), income, expenses.type_cents(month)
+        ),
+    )
+
+
+def compute_budget_batch(
+    expenses: Union["pd.DataFrame", Mapping[str, Sequence]],
+    income: Union[float, Mapping, "pd.Series"],
+    by: Sequence[str] = ("month",),
+) -> "pd.DataFrame":
+    """Budget breakdown for every group of a columnar expense table at once.
+
+    `expenses` needs `category` and `amount` columns plus the `by` keys
+    (e.g. ``("user", "month")``). `income` is a scalar, or a Series/mapping
+    keyed by the full group key — or by a named subset of it, such as a
+    Series indexed by ``user``.
+
+    Returns one row per group, indexed by the `by` keys, with the same
+    scalar fields as `compute_budget` plus `<category>_amount` and
+    `<category>_over` columns. Everything is computed with a single
+    groupby and NumPy array math, on int64 cents like `compute_budget`.
+    """
+    import pandas as pd
+
+    frame = expenses if isinstance(expenses, pd.DataFrame) else pd.DataFrame(expenses)
+    by = list(by)
+    totals = (
+        frame[by + ["category"]]
+        .assign(cents=to_cents_array(frame["amount"].to_numpy()))
+        .groupby(by + ["category"], sort=True)["cents"].sum()
+        .unstack("category", fill_value=0)
+    )
+    inc = _align_income(income, totals.index, by)
+    inc_cents = to_cents_array(inc)
+    cents = totals.to_numpy(dtype=np.int64)
+    categories = list(totals.columns)
+
+    def column_sum(names) -> np.ndarray:
+        idx = [i for i, c in enumerate(categories) if c in names]
+        return cents[:, idx].sum(axis=1) if idx else np.zeros(len(totals), dtype=np.int64)
+
+    total_cents = cents.sum(axis=1)
+    savings_cents = column_sum({"Savings"})
+    spending_cents = total_cents - savings_cents
+    net_cents = inc_cents - spending_cents - savings_cents
+    saves_cents = savings_cents + np.maximum(net_cents, 0)
+    needs_cents = column_sum(BUDGET_NEEDS_CATEGORIES)
+    wants_cents = column_sum(BUDGET_WANTS_CATEGORIES)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        savings_rate = saves_cents / inc_cents * 100
+        needs_pct = needs_cents / inc_cents * 100
+        wants_pct = wants_cents / inc_cents * 100
+        saves_pct = saves_cents / inc_cents * 100
+        health = _health_score_vec(savings_rate, needs_pct, wants_pct, net_cents / 100, inc)
+
+    result = pd.DataFrame({
+        "income": inc,
+        "total_expenses": total_cents / 100,
+        "spending_total": spending_cents / 100,
+        "savings_total": savings_cents / 100,
+        "net_savings": net_cents / 100,
+        "savings_rate": savings_rate,
+        "needs": needs_cents / 100,
+        "wants": wants_cents / 100,
+        "saves": saves_cents / 100,
+        "needs_pct": needs_pct,
+        "wants_pct": wants_pct,
+        "saves_pct": saves_pct,
+        "health_score": health,
+    }, index=totals.index)
+
+    for i, cat in enumerate(categories):
+        bp = share_bp(BUDGET_BENCHMARKS.get(cat, 0.05))
+        result[f"{cat}_amount"] = cents[:, i] / 100
+        result[f"{cat}_over"] = cents[:, i] * BASIS_POINTS * _OVER_DEN > bp * inc_cents * _OVER_NUM
+
+    # Same fallback as _empty_budget() for groups without positive income
+    no_income = inc_cents <= 0
+    if no_income.any():
+        zeroed = [c for c in result.columns
+                  if c not in ("income", "net_savings", "health_score") and not c.endswith("_over")]
+        result.loc[no_income, zeroed] = 0.0
+        result.loc[no_income, "net_savings"] = inc[no_income]
+        result.loc[no_income, "health_score"] = 50
+        result.loc[no_income, [f"{c}_over" for c in categories]] = False
+
+    result["health_score"] = result["health_score"].astype(int)
+    return result
+
+
+def _align_income(income, index, by: List[str]) -> np.ndarray:
+    """Broadcast scalar or keyed income onto the groupby result index."""
+    import pandas as pd
+
+    if np.isscalar(income):
+        return np.full(len(index), float(income))
+    series = income if isinstance(income, pd.Series) else pd.Series(income)
+    names = [n for n in series.index.names if n is not None]
+    if not names:
+        aligned = series.reindex(index)
+    else:
+        missing = set(names) - set(by)
+        if missing:
+            raise ValueError(f"Income keyed by {sorted(missing)}, which is not a group key")
+        keys = index.to_frame(index=False)[names]
+        aligned = series.reindex(pd.MultiIndex.from_frame(keys) if len(names) > 1 else keys[names[0]])
+    if aligned.isna().any():
+        raise ValueError("Income missing for some groups")
+    return aligned.to_numpy(dtype=np.float64)
+
+
+def _health_score_vec(savings_rate, needs_pct, wants_pct, net_savings, income) -> np.ndarray:
+    """Array form of `_calculate_health_score`."""
+    score = 50.0 + np.minimum(savings_rate, 30)
+    score += np.where(needs_pct <= 50, 10, -(needs_pct - 50) * 0.5)
+    score += np.where(wants_pct <= 30, 10, -(wants_pct - 30) * 0.5)
+    net_ratio = net_savings / income * 20
+    score += np.where(net_savings > 0, np.minimum(net_ratio, 10), net_ratio)
+    return np.clip(score, 0, 100)
+
+
 def _calculate_health_score(savings_rate, needs_pct, wants_pct, net_savings, income) -> float:
     score = 50.0  # baseline
 
@@ -112,15 +325,20 @@ def _empty_budget(income: float) -> Dict:
         "net_savings": income, "savings_rate": 0,
         "needs": 0, "wants": 0, "saves": 0,
         "needs_pct": 0, "wants_pct": 0, "saves_pct": 0,
-        "by_category": {}, "category_detail": [],
+        "by_category": {}, "by_type": {}, "category_detail": [],
         "health_score": 50,
     }
 
 
-def summarize_for_ai(expenses: List[Dict], income: float) -> str:
-    """Generate a text summary of finances to inject into the AI system prompt."""
-    budget = compute_budget(expenses, income)
-    lines = [
+def summarize_for_ai(expenses: List[Dict], income: float, month: Optional[str] = None) -> str:
+    """Generate a text summary of finances to inject into the AI system prompt.
+
+    Pass `month` to summarize that month's expenses only; income is monthly,
+    so totals across several months would not compare with it.
+    """
+    budget = cached_budget(expenses, income, month)
+    lines = [f"Month: {month}"] if month is not None else []
+    lines += [
         f"Monthly Income: ${income:,.0f}",
         f"Total Expenses: ${budget['total_expenses']:,.0f}",
         f"Net Savings: ${budget['net_savings']:,.0f}",
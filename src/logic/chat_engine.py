@@ -0,0 +1,121 @@
+"""
+Background chat engine.
+Completions run on one asyncio event loop in a daemon thread, so the
+Streamlit script thread never waits on the network: the page submits a
+ChatJob, keeps rendering, and picks up the reply (or partial reply) on a
+later rerun. No Streamlit here.
+"""
+
+import asyncio
+import threading
+from typing import Callable, Dict, List, Optional
+
+from src.logic.ai_mentor import astream_completion, build_messages, cached_reply, get_demo_response
+
+
+class ChatJob:
+    """One in-flight (or finished) assistant reply."""
+
+    def __init__(self, user_message: str):
+        self.user_message = user_message
+        self.text = ""          # grows as deltas arrive
+        self.done = False       # set once the engine task has fully finished
+        self.cancelled = False  # set, before `done`, only if a cancel actually stopped the task
+        self._cancel: Optional[Callable[[], None]] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def pending(self) -> bool:
+        return not self.done
+
+    def cancel(self) -> None:
+        """Stop the request; whatever text arrived so far is kept.
+
+        `done` turns True only once the task has actually stopped, so a
+        job reported done no longer changes: cancelling it does nothing, and
+        a reply that finishes before the cancel reaches it is not marked
+        cancelled.
+        """
+        if not self.done and self._cancel is not None:
+            self._cancel()
+
+
+class ChatEngine:
+    """Runs chat completions on a private event loop thread."""
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name="finmind-chat-engine", daemon=True)
+        self._thread.start()
+
+    def submit(
+        self,
+        api_key: str,
+        user_message: str,
+        history: List[Dict],
+        expenses: list,
+        income: float,
+        vary: bool = False,
+        month: Optional[str] = None,
+    ) -> ChatJob:
+        """Start a reply in the background and return its job immediately.
+
+        The prompt is built here, on the caller's thread, so the engine
+        never reads session data that the UI may be mutating. Demo and
+        cached replies complete synchronously; `vary=True` skips the cache.
+        The financial data covers `month` only when one is given.
+        """
+        job = ChatJob(user_message)
+        if not api_key:
+            job.text = get_demo_response(user_message, expenses, income, month)
+            job.done = True
+            return job
+
+        messages = build_messages(user_message, history, expenses, income, month)
+        cached = cached_reply(messages, vary)
+        if cached is not None:
+            job.text = cached
+            job.done = True
+            return job
+
+        # Both callbacks run on the loop in order, so a cancel always finds the task
+        job._cancel = lambda: self._loop.call_soon_threadsafe(self._stop, job)
+        self._loop.call_soon_threadsafe(self._start, job, api_key, messages)
+        return job
+
+    def _start(self, job: ChatJob, api_key: str, messages: List[Dict]) -> None:
+        job._task = self._loop.create_task(self._run(job, api_key, messages))
+        # Fires after the coroutine (and the reply-cache write) is finished,
+        # including when it is cancelled before its first step
+        job._task.add_done_callback(lambda task: self._finish(job, task))
+
+    @staticmethod
+    def _finish(job: ChatJob, task: asyncio.Task) -> None:
+        if task.cancelled():
+            job.cancelled = True
+        else:
+            task.exception()  # retrieved, so asyncio doesn't log it as unhandled
+        job.done = True
+
+    @staticmethod
+    def _stop(job: ChatJob) -> None:
+        job._task.cancel()
+
+    async def _run(self, job: ChatJob, api_key: str, messages: List[Dict]) -> None:
+        # The cache was already consulted in submit()
+        async for delta in astream_completion(api_key, messages, vary=True):
+            job.text += delta
+
+
+_engine: Optional[ChatEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> ChatEngine:
+    """The process-wide chat engine, started on first use."""
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            _engine = ChatEngine()
+        return _engine
@@ -0,0 +1,123 @@
+"""
+Process-wide OpenAI client registry.
+One client per API key (bounded, LRU-evicted), all sharing a single
+keep-alive HTTP connection pool, so steady-state chats skip connection
+and TLS setup and concurrent sessions share sockets. Async clients are
+pooled the same way for the background chat engine's event loop.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from src.config import (
+    AI_BASE_URL,
+    AI_CLIENT_POOL_SIZE,
+    AI_CONNECT_TIMEOUT,
+    AI_READ_TIMEOUT,
+    AI_MAX_CONNECTIONS,
+    AI_MAX_KEEPALIVE,
+    AI_KEEPALIVE_EXPIRY,
+)
+
+try:
+    import httpx
+    import openai
+except ImportError:  # the app still runs in demo mode without them
+    httpx = None
+    openai = None
+
+
+class ClientRegistry:
+    """Bounded map of API key → OpenAI client over one shared httpx pool.
+
+    Async clients share an `httpx.AsyncClient`, which is bound to the event
+    loop it is first used on — only call `get_async()` from one loop.
+    """
+
+    def __init__(self, maxsize: int = AI_CLIENT_POOL_SIZE,
+                 connect_timeout: float = AI_CONNECT_TIMEOUT,
+                 read_timeout: float = AI_READ_TIMEOUT):
+        self.maxsize = maxsize
+        self.timeout = None if httpx is None else httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._clients: "OrderedDict[str, object]" = OrderedDict()
+        self._async_clients: "OrderedDict[str, object]" = OrderedDict()
+        self._http: Optional[object] = None
+        self._async_http: Optional[object] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def get(self, api_key: str) -> "openai.OpenAI":
+        """Client for `api_key`, created on first use and reused afterwards."""
+        return self._lookup(self._clients, api_key, lambda: openai.OpenAI(
+            api_key=api_key, base_url=AI_BASE_URL,
+            http_client=self._http_client(), timeout=self.timeout,
+        ))
+
+    def get_async(self, api_key: str) -> "openai.AsyncOpenAI":
+        """Async client for `api_key`, pooled like `get()`."""
+        return self._lookup(self._async_clients, api_key, lambda: openai.AsyncOpenAI(
+            api_key=api_key, base_url=AI_BASE_URL,
+            http_client=self._async_http_client(), timeout=self.timeout,
+        ))
+
+    def close(self) -> None:
+        with self._lock:
+            self._clients.clear()
+            self._async_clients.clear()
+            if self._http is not None:
+                self._http.close()
+                self._http = None
+            # The async pool is left to its event loop to tear down
+            self._async_http = None
+
+    def _lookup(self, clients: "OrderedDict[str, object]", api_key: str, create):
+        if openai is None:
+            raise RuntimeError("The openai package is not installed")
+        # Keys are indexed by digest so raw secrets don't sit in dict keys
+        slot = hashlib.sha256(api_key.encode()).hexdigest()
+        with self._lock:
+            client = clients.get(slot)
+            if client is not None:
+                clients.move_to_end(slot)
+                return client
+            client = create()
+            clients[slot] = client
+            # Evicted clients own no sockets — the pool is shared — so
+            # they are simply dropped, never closed.
+            while len(clients) > self.maxsize:
+                clients.popitem(last=False)
+            return client
+
+    def _limits(self):
+        return httpx.Limits(
+            max_connections=AI_MAX_CONNECTIONS,
+            max_keepalive_connections=AI_MAX_KEEPALIVE,
+            keepalive_expiry=AI_KEEPALIVE_EXPIRY,
+        )
+
+    def _http_client(self):
+        if self._http is None:
+            self._http = httpx.Client(timeout=self.timeout, limits=self._limits())
+        return self._http
+
+    def _async_http_client(self):
+        if self._async_http is None:
+            self._async_http = httpx.AsyncClient(timeout=self.timeout, limits=self._limits())
+        return self._async_http
+
+
+_registry = ClientRegistry()
+
+
+def get_client(api_key: str) -> "openai.OpenAI":
+    """Shared OpenAI client for `api_key` from the process-wide registry."""
+    return _registry.get(api_key)
+
+
+def get_async_client(api_key: str) -> "openai.AsyncOpenAI":
+    """Shared async OpenAI client for `api_key` (chat engine loop only)."""
+    return _registry.get_async(api_key)
@@ -0,0 +1,152 @@
+"""
+Token-budgeted conversation history.
+The newest turns are sent verbatim as long as they fit the token budget
+(and the AI_HISTORY_WINDOW message cap); everything older is collapsed
+into a short rolling summary. Summaries are cached by a chained digest of
+the messages they cover, so each turn only summarizes the messages that
+newly fell out of the window. No Streamlit here.
+"""
+
+import functools
+import hashlib
+import re
+from typing import Dict, List, Optional, Tuple
+
+from src.config import (
+    AI_MODEL,
+    AI_HISTORY_WINDOW,
+    AI_HISTORY_TOKENS,
+    AI_SUMMARY_TOKENS,
+    AI_SUMMARY_CACHE_SIZE,
+)
+from src.logic.cache import LRUCache
+
+try:
+    import tiktoken
+except ImportError:  # fall back to a character-based estimate
+    tiktoken = None
+
+# Chat-format framing each message costs on top of its content
+_MESSAGE_OVERHEAD = 4
+_SUMMARY_HEADER = "Summary of the earlier conversation (oldest first):"
+_LINE_CHARS = 160
+
+_MARKDOWN = re.compile(r"[*_`#>|]+")
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+_summary_cache = LRUCache(AI_SUMMARY_CACHE_SIZE)
+
+
+# ── Token counting ─────────────────────────────────────────────────────────────
+
+@functools.lru_cache(maxsize=1)
+def _encoding():
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(AI_MODEL)
+    except (KeyError, ValueError):
+        return tiktoken.get_encoding("cl100k_base")
+
+
+@functools.lru_cache(maxsize=4096)
+def count_tokens(text: str) -> int:
+    """Tokens in `text` — exact with tiktoken, else ~4 characters per token."""
+    encoding = _encoding()
+    if encoding is None:
+        return (len(text) + 3) // 4
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def message_tokens(message: Dict) -> int:
+    return count_tokens(message["content"]) + _MESSAGE_OVERHEAD
+
+
+# ── Windowing ─────────────────────────────────────────────────────────────────
+
+def fit_history(
+    history: List[Dict],
+    budget: int = AI_HISTORY_TOKENS,
+    max_messages: int = AI_HISTORY_WINDOW,
+    summary_budget: int = AI_SUMMARY_TOKENS,
+) -> Tuple[Optional[Dict], List[Dict]]:
+    """Split `history` into (summary message or None, recent messages).
+
+    Recent messages are the longest suffix within `max_messages` that fits
+    in `budget` together with the summary of everything older, so the
+    result never exceeds `budget` tokens.
+    """
+    used = 0
+    cut = len(history)
+    while cut > 0 and len(history) - cut < max_messages:
+        cost = message_tokens(history[cut - 1])
+        if used + cost > budget:
+            break
+        used += cost
+        cut -= 1
+
+    if cut == 0:
+        return None, list(history)
+    # Turns were dropped, so the summary needs room too: hand it the oldest
+    # kept turns until it fits (re-summarizing only extends the cached prefix)
+    summary_budget = min(summary_budget, budget - _MESSAGE_OVERHEAD)
+    summary = _summary_message(history[:cut], summary_budget)
+    while cut < len(history) and used + message_tokens(summary) > budget:
+        used -= message_tokens(history[cut])
+        cut += 1
+        summary = _summary_message(history[:cut], summary_budget)
+    return summary, history[cut:]
+
+
+def _summary_message(messages: List[Dict], budget: int) -> Dict:
+    return {"role": "system", "content": summarize_turns(messages, budget)}
+
+
+def summarize_turns(messages: List[Dict], budget: int = AI_SUMMARY_TOKENS) -> str:
+    """Rolling extractive summary of `messages`, at most `budget` tokens.
+
+    Extends the longest already-summarized prefix instead of starting over;
+    when the summary outgrows its budget the oldest lines are dropped.
+    """
+    digests = _prefix_digests(messages)
+    start, lines = 0, ()
+    for i in range(len(messages), 0, -1):
+        cached = _summary_cache.get((digests[i], budget))
+        if cached is not None:
+            start, lines = i, cached
+            break
+
+    lines = list(lines)
+    for i in range(start, len(messages)):
+        lines.append(_summary_line(messages[i]))
+        while len(lines) > 1 and _lines_tokens(lines) > budget:
+            lines.pop(0)
+        _summary_cache.put((digests[i + 1], budget), tuple(lines))
+
+    return "\n".join([_SUMMARY_HEADER] + lines)
+
+
+def _prefix_digests(messages: List[Dict]) -> List[bytes]:
+    # digests[i] identifies messages[:i]; each step hashes one message
+    digests = [b""]
+    for m in messages:
+        h = hashlib.blake2b(digests[-1], digest_size=16)
+        h.update(m["role"].encode())
+        h.update(b"\0")
+        h.update(m["content"].encode())
+        digests.append(h.digest())
+    return digests
+
+
+def _summary_line(message: Dict) -> str:
+    text = _MARKDOWN.sub("", message["content"])
+    text = " ".join(text.split())
+    first = _SENTENCE_END.split(text, maxsplit=1)[0]
+    if len(first) > _LINE_CHARS:
+        first = first[:_LINE_CHARS - 1].rstrip() + "…"
+    speaker = "User" if message["role"] == "user" else "FinMind"
+    return f"- {speaker}: {first}"
+
+
+def _lines_tokens(lines: List[str]) -> int:
+    return count_tokens("\n".join(lines)) + count_tokens(_SUMMARY_HEADER)
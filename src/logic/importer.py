@@ -0,0 +1,349 @@
+"""
+Streaming bank-statement import (CSV and OFX/QFX).
+Statements are read in fixed-size chunks, mapped onto the expense schema,
+de-duplicated chunk by chunk against the ledger's fingerprint index and
+appended to the ledger in bulk — memory stays flat regardless of file size.
+No Streamlit.
+"""
+
+import csv
+import functools
+import hashlib
+import html
+import io
+import json
+import re
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+from src.config import EXPENSE_CATEGORIES, IMPORT_CHUNK_SIZE
+from src.logic.money import from_cents, parse_cents
+
+# Header aliases (lower-cased) for each field we read from a CSV export
+_CSV_COLUMNS = {
+    "date": ("date", "transaction date", "posted date", "posting date", "booking date", "value date"),
+    "name": ("description", "payee", "name", "merchant", "details", "narrative", "memo"),
+    "amount": ("amount", "value", "transaction amount"),
+    "debit": ("debit", "withdrawal", "withdrawals", "money out", "paid out"),
+    "credit": ("credit", "deposit", "deposits", "money in", "paid in"),
+    "category": ("category",),
+}
+
+_DATE_FORMATS = ("%Y-%m-%d", "%m/%d/%Y", "%d/%m/%Y", "%d.%m.%Y", "%Y/%m/%d", "%Y%m%d", "%m/%d/%y")
+
+# Keyword → category rules for descriptions without a usable category column
+_CATEGORY_KEYWORDS = {
+    "Housing": ("rent", "mortgage", "landlord", "hoa", "electric", "water", "utility"),
+    "Food": ("grocery", "market", "restaurant", "cafe", "coffee", "pizza", "doordash", "uber eats", "grubhub"),
+    "Transport": ("uber", "lyft", "fuel", "gas station", "shell", "chevron", "parking", "transit", "insurance"),
+    "Subscriptions": ("netflix", "spotify", "hulu", "prime", "subscription", "icloud", "youtube"),
+    "Health": ("pharmacy", "gym", "doctor", "dental", "clinic", "cvs", "walgreens"),
+    "Entertainment": ("cinema", "movie", "theater", "concert", "steam", "ticket"),
+    "Savings": ("savings", "transfer to", "brokerage", "vanguard", "fidelity"),
+    "Debt": ("loan", "credit card payment", "student", "repayment"),
+}
+
+_CSV_DELIMITERS = ",;\t|"
+_SNIFF_BYTES = 16384
+# "1.234,50" / "-3,50": the comma is the decimal mark (exports using ; or tabs)
+_DECIMAL_COMMA = re.compile(r",\d{1,2}\)?$")
+
+_OFX_BLOCK = re.compile(r"<STMTTRN>(.*?)</STMTTRN>", re.S | re.I)
+_OFX_FIELD = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+
+@dataclass
+class ImportStats:
+    """Running counters for one import; handed to the progress callback per chunk."""
+    rows_read: int = 0
+    imported: int = 0
+    duplicates: int = 0
+    skipped: int = 0  # credits, unparseable dates/amounts
+    bytes_read: int = 0
+    total_bytes: int = 0
+
+    @property
+    def fraction(self) -> float:
+        return min(self.bytes_read / self.total_bytes, 1.0) if self.total_bytes else 0.0
+
+
+def import_statement(
+    stream,
+    ledger,
+    fmt: Optional[str] = None,
+    existing: Optional[Set[int]] = None,
+    expenses_negative: bool = True,
+    chunk_size: int = IMPORT_CHUNK_SIZE,
+    progress: Optional[Callable[[ImportStats], None]] = None,
+) -> ImportStats:
+    """Stream a CSV/OFX statement from a binary `stream` into `ledger`.
+
+    `ledger` is an ExpenseStore (anything with `extend()` and
+    `known_fingerprints()`); each chunk of new rows goes in as one batch.
+    Each chunk is de-duplicated against `existing` (a fingerprint set,
+    updated with what gets imported) or, by default, the fingerprints the
+    ledger already holds. Set `expenses_negative` to False for exports that
+    list debits as positive. Raises ValueError if the file holds no
+    transactions, e.g. a CSV without a recognizable header.
+    """
+    known = ledger.known_fingerprints if existing is None else existing.intersection
+    fmt = fmt or _sniff_format(stream)
+
+    stats = ImportStats(total_bytes=_stream_size(stream))
+    rows = _iter_ofx(stream) if fmt == "ofx" else _iter_csv(stream)
+    occurrences = _OccurrenceCounter()
+    try:
+        for batch in _batches(rows, chunk_size):
+            stats.rows_read += len(batch)
+            keys, records = [], []
+            for raw in batch:
+                record = _to_expense(raw, expenses_negative)
+                if record is None:
+                    stats.skipped += 1
+                    continue
+                keys.append(raw.get("fitid") or (raw.get("date"), record["name"], record["amount"]))
+                records.append(record)
+
+            # Identical rows within one statement are distinct transactions;
+            # numbering them keeps re-imports of the same file idempotent.
+            fingerprints = [_fingerprint(key, n) for key, n in zip(keys, occurrences.count(keys))]
+            seen = known(fingerprints)
+            chunk = []
+            for record, fingerprint in zip(records, fingerprints):
+                if fingerprint in seen:
+                    stats.duplicates += 1
+                    continue
+                record["fingerprint"] = fingerprint
+                chunk.append(record)
+            _flush(ledger, chunk, stats, stream, progress)
+            if existing is not None:
+                existing.update(r["fingerprint"] for r in chunk)
+    finally:
+        occurrences.close()
+
+    if not stats.rows_read:
+        raise ValueError("No transactions found in this statement")
+    return stats
+
+
+def _batches(rows: Iterator[Dict], size: int) -> Iterator[List[Dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class _OccurrenceCounter:
+    """How often each row key has appeared so far in one statement.
+
+    Counts live in a private temporary SQLite database, which spills to
+    disk, so a long statement does not hold every key in memory.
+    """
+
+    def __init__(self):
+        self._conn = sqlite3.connect("")
+        self._conn.execute("CREATE TABLE counts (key INTEGER PRIMARY KEY, n INTEGER NOT NULL)")
+
+    def count(self, keys: List) -> List[int]:
+        """1-based occurrence number of each key, earlier chunks included."""
+        hashed = [_key_hash(key) for key in keys]
+        counts = dict(self._conn.execute(
+            "SELECT key, n FROM counts WHERE key IN (SELECT value FROM json_each(?))",
+            (json.dumps(list(set(hashed))),),
+        ))
+        numbers = []
+        for h in hashed:
+            counts[h] = counts.get(h, 0) + 1
+            numbers.append(counts[h])
+        self._conn.executemany("INSERT OR REPLACE INTO counts (key, n) VALUES (?, ?)", counts.items())
+        return numbers
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+# ── Parsing ────────────────────────────────────────────────────────────────────
+
+def _iter_csv(stream) -> Iterator[Dict]:
+    delimiter = _sniff_delimiter(stream)
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", errors="replace", newline="")
+    reader = csv.reader(text, delimiter=delimiter)
+    columns = None
+    # Some banks put account details above the header row
+    for row in reader:
+        columns = _map_columns(row)
+        if columns:
+            break
+    if not columns:
+        text.detach()
+        raise ValueError("No header row with date, description and amount columns found")
+    amounts = [columns[f] for f in ("amount", "debit", "credit") if f in columns]
+    try:
+        for row in reader:
+            if not row:
+                continue
+            if delimiter != ",":
+                for i in amounts:
+                    if i < len(row):
+                        row[i] = _comma_decimal(row[i])
+            yield {field: row[i].strip() for field, i in columns.items() if i < len(row)}
+    finally:
+        text.detach()
+
+
+def _sniff_delimiter(stream) -> str:
+    # The delimiter that splits one of the first lines into a header we know
+    # (csv.Sniffer is thrown off by account details above the header)
+    head = stream.read(_SNIFF_BYTES)
+    stream.seek(0)
+    lines = head.decode("utf-8-sig", errors="replace").splitlines()
+    if len(head) == _SNIFF_BYTES:
+        lines = lines[:-1]  # may be cut short
+    for line in lines:
+        for delimiter in _CSV_DELIMITERS:
+            if _map_columns(next(csv.reader([line], delimiter=delimiter), [])):
+                return delimiter
+    return ","
+
+
+def _comma_decimal(value: str) -> str:
+    if _DECIMAL_COMMA.search(value.strip()):
+        return value.replace(".", "").replace("\xa0", "").replace(" ", "").replace(",", ".")
+    return value
+
+
+def _map_columns(header: List[str]) -> Optional[Dict[str, int]]:
+    lowered = [h.strip().lower() for h in header]
+    columns = {}
+    for field, aliases in _CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias in lowered:
+                columns[field] = lowered.index(alias)
+                break
+    has_amount = "amount" in columns or "debit" in columns
+    return columns if "date" in columns and "name" in columns and has_amount else None
+
+
+def _iter_ofx(stream, block_size: int = 1 << 16) -> Iterator[Dict]:
+    buffer = ""
+    while True:
+        data = stream.read(block_size)
+        if data:
+            buffer += data.decode("utf-8", errors="replace")
+        end = 0
+        for match in _OFX_BLOCK.finditer(buffer):
+            fields = {k.upper(): v.strip() for k, v in _OFX_FIELD.findall(match.group(1))}
+            end = match.end()
+            yield {
+                "date": fields.get("DTPOSTED", "")[:8],
+                "name": html.unescape(fields.get("NAME") or fields.get("MEMO", "")),
+                "amount": fields.get("TRNAMT", ""),
+                "fitid": fields.get("FITID"),
+            }
+        buffer = buffer[end:]
+        if not data:
+            return
+        if end == 0 and len(buffer) > 4 * block_size:
+            # No transaction in sight — keep only a tail that may hold an opening tag
+            buffer = buffer[-block_size:]
+
+
+def _sniff_format(stream) -> str:
+    head = stream.read(512)
+    stream.seek(0)
+    return "ofx" if b"OFX" in head.upper() else "csv"
+
+
+def _stream_size(stream) -> int:
+    try:
+        pos = stream.tell()
+        size = stream.seek(0, io.SEEK_END)
+        stream.seek(pos)
+        return size
+    except (AttributeError, OSError):
+        return 0
+
+
+# ── Mapping ────────────────────────────────────────────────────────────────────
+
+def _to_expense(raw: Dict, expenses_negative: bool) -> Optional[Dict]:
+    month = _parse_month(raw.get("date", ""))
+    if month is None:
+        return None
+
+    # Parsed straight from the statement text into cents: no float rounding
+    if raw.get("debit") or raw.get("credit"):
+        cents = parse_cents(raw.get("debit", ""))
+        if not cents:
+            return None  # a credit-only row
+    else:
+        cents = parse_cents(raw.get("amount", ""))
+        if cents is None:
+            return None
+        cents = -cents if expenses_negative else cents
+        if cents <= 0:
+            return None
+    amount = from_cents(abs(cents))
+
+    name = raw.get("name", "").strip() or "Imported transaction"
+    category = _categorize(name, raw.get("category", ""))
+    return {
+        "name": name[:120],
+        "category": category,
+        "amount": amount,
+        "type": "Savings" if category == "Savings" else "Variable",
+        "month": month,
+        "note": "Imported",
+    }
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_month(value: str) -> Optional[str]:
+    # Statements repeat the same few hundred dates, so strptime runs once per date
+    value = value.strip()
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).strftime("%Y-%m")
+        except ValueError:
+            continue
+    return None
+
+
+@functools.lru_cache(maxsize=65536)
+def _categorize(name: str, category: str) -> str:
+    for known in EXPENSE_CATEGORIES:
+        if category.strip().lower() == known.lower():
+            return known
+    lowered = name.lower()
+    for known, keywords in _CATEGORY_KEYWORDS.items():
+        if any(k in lowered for k in keywords):
+            return known
+    return "Other"
+
+
+def _key_hash(key) -> int:
+    digest = hashlib.blake2b(repr(key).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _fingerprint(key, occurrence: int) -> int:
+    digest = hashlib.blake2b(repr((key, occurrence)).encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _flush(ledger, chunk: List[Dict], stats: ImportStats, stream, progress) -> None:
+    if chunk:
+        ledger.extend(chunk)
+        stats.imported += len(chunk)
+    try:
+        stats.bytes_read = stream.tell()
+    except (AttributeError, OSError):
+        pass
+    if progress is not None:
+        progress(stats)
@@ -0,0 +1,204 @@
+"""
+Ledger files for batch scoring.
+Reads a ledger file (CSV, JSON or Parquet) and scores every user-month in
+it with the budget engine. Amounts are bucketed per (user, month,
+category, type) in one pass and each bucket is summed as int64 cents, so
+no ExpenseStore or per-row dict is built. Plain functions of a path, for
+use in worker processes. No Streamlit.
+
+CSV and Parquet columns (case-insensitive): amount, and optionally month,
+category, type, user (default: the file name) and income. JSON holds a
+ledger {"user": ..., "income": ..., "expenses": [...]} as the scoring API
+takes it, a batch {"ledgers": [...]}, or a bare list of expense objects.
+"""
+
+import csv
+import json
+import math
+import os
+from itertools import repeat
+from operator import itemgetter
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from src.config import DEFAULT_INCOME
+from src.logic.budget import budget_from_cents
+from src.logic.money import from_cents, parse_cents, to_cents, to_cents_array
+from src.logic.records import gc_paused
+
+LEDGER_SUFFIXES = (".csv", ".json", ".parquet")
+
+# One output row per user-month; a file that can't be read yields one row with `error` set
+RESULT_FIELDS = (
+    "source", "user", "month", "income", "expenses", "skipped",
+    "total_expenses", "spending_total", "savings_total", "net_savings",
+    "savings_rate", "needs_pct", "wants_pct", "saves_pct", "health_score", "error",
+)
+_BUDGET_FIELDS = RESULT_FIELDS[6:-1]
+
+# Row columns in the order readers yield them, with the value used when absent
+_COLUMNS = ("user", "month", "category", "type", "amount", "income")
+_DEFAULTS = (None, "", "Other", "Variable", None, "")
+
+_MAX_AMOUNT = 1e12  # Dollars; larger amounts are skipped as invalid
+
+Row = Tuple[Any, Any, Any, Any, Any, Any]  # user, month, category, type, amount, income
+
+
+def score_file(path: str, income: float = DEFAULT_INCOME) -> Tuple[str, List[Dict]]:
+    """(path, result rows) for one ledger file; `income` applies where the file has none."""
+    owner = os.path.splitext(os.path.basename(path))[0]
+    try:
+        return path, score_rows(read_rows(path, owner), income, source=path)
+    except (OSError, ValueError, TypeError, csv.Error) as exc:
+        row = dict.fromkeys(RESULT_FIELDS)
+        row.update(source=path, user=owner, error=f"{type(exc).__name__}: {exc}")
+        return path, [row]
+
+
+def score_rows(rows: Iterable[Row], income: float, source: str = "") -> List[Dict]:
+    """Budget results per (user, month) of `rows`, sorted by user then month."""
+    groups: Dict[tuple, list] = {}
+    incomes: Dict[tuple, Any] = {}
+    # Tuple keys are fine here: the collector stays off while they pile up
+    with gc_paused():
+        for user, month, category, typ, amount, row_income in rows:
+            key = (user, month, category or "Other", typ or "Variable")
+            amounts = groups.get(key)
+            if amounts is None:
+                amounts = groups[key] = []
+            amounts.append(amount)
+            if row_income not in (None, "") and (user, month) not in incomes:
+                incomes[user, month] = row_income
+
+    # (user, month) → [cents by category, cents by type, rows, skipped]
+    months: Dict[tuple, list] = {}
+    for (user, month, category, typ), amounts in groups.items():
+        cents, skipped = _sum_cents(amounts)
+        entry = months.get((user, month))
+        if entry is None:
+            entry = months[user, month] = [{}, {}, 0, 0]
+        entry[0][category] = entry[0].get(category, 0) + cents
+        entry[1][typ] = entry[1].get(typ, 0) + cents
+        entry[2] += len(amounts) - skipped
+        entry[3] += skipped
+
+    results = []
+    for (user, month), (by_category, by_type, count, skipped) in sorted(
+        months.items(), key=lambda item: (str(item[0][0]), str(item[0][1]))
+    ):
+        month_income = _income(incomes.get((user, month)), income)
+        budget = budget_from_cents(by_category, month_income, by_type)
+        row = {"source": source, "user": user, "month": month, "income": month_income,
+               "expenses": count, "skipped": skipped, "error": ""}
+        row.update((k, budget[k]) for k in _BUDGET_FIELDS)
+        results.append(row)
+    return results
+
+
+def read_rows(path: str, owner: str) -> Iterator[Row]:
+    """Rows of a ledger file; `owner` is the user for rows that don't name one."""
+    suffix = os.path.splitext(path)[1].lower()
+    if suffix == ".csv":
+        return _read_csv(path, owner)
+    if suffix == ".json":
+        return _read_json(path, owner)
+    if suffix == ".parquet":
+        return _read_parquet(path, owner)
+    raise ValueError(f"Not a ledger file (expected {', '.join(LEDGER_SUFFIXES)})")
+
+
+# ── Readers ────────────────────────────────────────────────────────────────────
+
+def _read_csv(path: str, owner: str) -> Iterator[Row]:
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.reader(f)
+        header = [h.strip().lower() for h in next(reader, [])]
+        if "amount" not in header:
+            raise ValueError("No amount column")
+        width = len(header)
+        # Absent columns read from a constant tail appended to every row
+        tail = [owner if d is None else d for d in _DEFAULTS]
+        pick = itemgetter(*(
+            header.index(c) if c in header else width + i for i, c in enumerate(_COLUMNS)
+        ))
+        for row in reader:
+            if not row:
+                continue
+            if len(row) != width:
+                row = (row + [""] * width)[:width]
+            yield pick(row + tail)
+
+
+def _read_json(path: str, owner: str) -> Iterator[Row]:
+    with open(path, "rb") as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        ledgers = data["ledgers"] if "ledgers" in data else [data]
+    elif isinstance(data, list):
+        ledgers = [{"expenses": data}]
+    else:
+        raise ValueError("Expected a ledger object or a list of expenses")
+    if not isinstance(ledgers, list):
+        raise ValueError('"ledgers" must be a list')
+
+    for ledger in ledgers:
+        expenses = ledger.get("expenses") if isinstance(ledger, dict) else None
+        if not isinstance(expenses, list):
+            raise ValueError('Each ledger needs an "expenses" list')
+        user, income = ledger.get("user", owner), ledger.get("income", "")
+        for e in expenses:
+            if not isinstance(e, dict):
+                raise ValueError("Expenses must be objects")
+            yield (e.get("user", user), e.get("month", ""), e.get("category"),
+                   e.get("type"), e.get("amount"), e.get("income", income))
+
+
+def _read_parquet(path: str, owner: str) -> Iterator[Row]:
+    import pyarrow.parquet as pq  # optional: only needed for Parquet ledgers
+
+    table = pq.read_table(path)
+    names = {n.lower(): n for n in table.column_names}
+    if "amount" not in names:
+        raise ValueError("No amount column")
+    columns = [
+        table.column(names[c]).to_pylist() if c in names else repeat(owner if d is None else d)
+        for c, d in zip(_COLUMNS, _DEFAULTS)
+    ]
+    return zip(*columns)
+
+
+# ── Values ─────────────────────────────────────────────────────────────────────
+
+def _sum_cents(amounts: List[Any]) -> Tuple[int, int]:
+    """(cents total, invalid amounts skipped) for one bucket."""
+    try:
+        values = np.asarray(amounts, dtype=np.float64)
+    except (TypeError, ValueError):
+        values = None
+    # Plain numbers and numeric strings convert in one vectorized pass
+    if values is not None and (np.abs(values) <= _MAX_AMOUNT).all():
+        return int(to_cents_array(values).sum()), 0
+    cents = [c for c in map(_cents, amounts) if c is not None]
+    return sum(cents), len(amounts) - len(cents)
+
+
+def _cents(amount: Any) -> Optional[int]:
+    # Statement-style text ("$1,234.50", "(12.00)") is parsed exactly
+    if isinstance(amount, str):
+        cents = parse_cents(amount)
+    elif isinstance(amount, (int, float)) and not isinstance(amount, bool) and math.isfinite(amount):
+        cents = to_cents(amount)
+    else:
+        return None
+    return cents if cents is not None and abs(cents) <= _MAX_AMOUNT * 100 else None
+
+
+def _income(value: Any, default: float) -> float:
+    if value is None:
+        return default
+    cents = _cents(value)
+    if cents is None:
+        raise ValueError(f"Invalid income {value!r}")
+    return from_cents(cents)
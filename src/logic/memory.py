@@ -0,0 +1,120 @@
+"""
+Memory accounting for sessions and process-wide caches.
+Approximate deep sizes (sys.getsizeof over the object graph, NumPy
+buffers by nbytes) — good for sizing pods and spotting which part of a
+session grows, not byte-exact. Objects shared between sessions, such as
+the frozen seed store, are reported separately so they are counted once
+per process rather than once per session. No Streamlit here.
+"""
+
+import asyncio
+import concurrent.futures
+import sys
+import threading
+import types
+from typing import Any, Dict, Iterable, Mapping, Optional, Set
+
+try:
+    import numpy as np
+except ImportError:  # sizes are still estimated, just without buffer sizes
+    np = None
+
+# Session keys grouped under one heading in reports; anything else is "other"
+SESSION_GROUPS = {
+    "expenses": "expenses",
+    "ledger": "expenses",
+    "messages": "messages",
+    "chat_job": "messages",
+}
+
+_ATOMIC = (str, bytes, int, float, bool, complex, type(None))
+
+# Code and runtime machinery: counted shallowly, never followed into
+_OPAQUE = (type, types.ModuleType, types.FunctionType, types.MethodType,
+           types.BuiltinFunctionType, threading.Thread, asyncio.AbstractEventLoop,
+           concurrent.futures.Future, asyncio.Future)
+
+
+def deep_sizeof(obj: Any, skip: Optional[Set[int]] = None) -> int:
+    """Bytes reachable from `obj`, counting every object once.
+
+    Objects whose id() is in `skip` (and everything only reachable through
+    them) are left out — pass the ids of shared structures to get the
+    private footprint. Code objects, threads and futures count shallowly.
+    """
+    seen: Set[int] = set(skip or ())
+    total = 0
+    stack = [obj]
+    while stack:
+        o = stack.pop()
+        if id(o) in seen:
+            continue
+        seen.add(id(o))
+        if isinstance(o, _OPAQUE):
+            total += sys.getsizeof(o)
+            continue
+        if np is not None and isinstance(o, np.ndarray):
+            total += sys.getsizeof(o) if o.base is None else o.nbytes + 112
+            continue
+        total += sys.getsizeof(o)
+        if isinstance(o, _ATOMIC):
+            continue
+        if isinstance(o, Mapping):
+            stack.extend(o.keys())
+            stack.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            stack.extend(o)
+        else:
+            d = getattr(o, "__dict__", None)
+            if d is not None:
+                stack.append(d)
+            for slot in getattr(type(o), "__slots__", ()):
+                if hasattr(o, slot):
+                    stack.append(getattr(o, slot))
+    return total
+
+
+def session_report(state: Mapping[str, Any], ignore: Iterable[str] = ()) -> Dict[str, int]:
+    """Approximate bytes per group of one session's state.
+
+    The expense store counts only what the session owns; data it still
+    shares copy-on-write is returned under "shared" (per process, not per
+    session) and left out of "total".
+    """
+    report = {"expenses": 0, "messages": 0, "other": 0, "shared": 0}
+    for key, value in state.items():
+        if key in ignore:
+            continue
+        group = SESSION_GROUPS.get(key, "other")
+        usage = getattr(value, "memory_usage", None)
+        if callable(usage):
+            sizes = usage()
+            report[group] += sizes["private"]
+            report["shared"] += sizes["shared"]
+        elif key == "ledger":
+            report[group] += sys.getsizeof(value)  # a handle onto the shared database
+        else:
+            report[group] += deep_sizeof(value) + sys.getsizeof(key)
+    report["total"] = report["expenses"] + report["messages"] + report["other"]
+    return report
+
+
+def cache_report() -> Dict[str, int]:
+    """Approximate bytes held by the process-wide in-memory caches."""
+    from src.logic import ai_mentor, budget, history
+    from src.logic.response_cache import get_response_cache
+
+    return {
+        "budget": deep_sizeof(budget._budget_cache),
+        "financial_context": deep_sizeof(ai_mentor._context_cache),
+        "history_summaries": deep_sizeof(history._summary_cache),
+        "responses": deep_sizeof(get_response_cache()._memory),
+    }
+
+
+def format_bytes(n: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(n) < 1024 or unit == "GB":
+            return f"{n:,.0f} {unit}" if unit == "B" else f"{n:,.1f} {unit}"
+        n /= 1024
+    return f"{n:,.1f} GB"
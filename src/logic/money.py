@@ -0,0 +1,104 @@
+"""
+Money as integer cents.
+Amounts are held and summed as int64 cents so totals are exact however
+many rows are added up, and threshold checks (over budget, 1.1× the
+benchmark) are integer comparisons that cannot flip on float rounding.
+Floats appear only at the edges — user input, charts and display — and
+convert here. Rounding is half away from zero everywhere (like SQLite's
+ROUND), for scalars and arrays alike. No Streamlit.
+"""
+
+import math
+from decimal import ROUND_HALF_UP, Decimal, InvalidOperation
+from typing import Dict, Hashable, Iterable, Mapping, NewType, Optional, Sequence, TypeVar, Union
+
+import numpy as np
+
+Cents = NewType("Cents", int)
+
+CENTS_DTYPE = np.int64
+CENTS_PER_UNIT = 100
+
+# Shares (benchmarks, targets) are compared in basis points: 0.30 → 3000
+BASIS_POINTS = 10_000
+
+Amount = Union[int, float, str, Decimal]
+K = TypeVar("K", bound=Hashable)
+
+
+def to_cents(amount: Amount) -> Cents:
+    """Cents for a dollar amount.
+
+    Strings and Decimals are converted exactly ("1234.565" → 123457);
+    floats are rounded from their nearest cent, which is exact for any
+    amount that was entered with at most two decimals.
+    """
+    if isinstance(amount, (int, np.integer)) and not isinstance(amount, bool):
+        return Cents(int(amount) * CENTS_PER_UNIT)
+    if isinstance(amount, (str, Decimal)):
+        return Cents(int(_decimal(amount).scaleb(2).quantize(Decimal(1), ROUND_HALF_UP)))
+    scaled = float(amount) * CENTS_PER_UNIT
+    return Cents(int(math.copysign(math.floor(abs(scaled) + 0.5), scaled)))
+
+
+def parse_cents(text: str) -> Optional[Cents]:
+    """Cents for a statement amount ("$1,234.50", "(12.00)"), or None if unparseable."""
+    value = text.strip().replace(",", "").replace("$", "")
+    if value.startswith("(") and value.endswith(")"):
+        value = "-" + value[1:-1]
+    try:
+        return to_cents(value)
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def to_cents_array(amounts: Iterable) -> np.ndarray:
+    """int64 cents for a sequence or array of dollar amounts (vectorized to_cents)."""
+    if isinstance(amounts, list):  # fromiter skips asarray's per-item type probing
+        amounts = np.fromiter(amounts, dtype=np.float64, count=len(amounts))
+    scaled = np.asarray(amounts, dtype=np.float64) * CENTS_PER_UNIT
+    return np.trunc(scaled + np.copysign(0.5, scaled)).astype(CENTS_DTYPE)
+
+
+def from_cents(cents: int) -> float:
+    """Dollars as a float, for charts and float-based callers (nearest float, exact to the cent)."""
+    return int(cents) / CENTS_PER_UNIT
+
+
+def format_cents(cents: int, decimals: int = 2) -> str:
+    """"$1,234.56" from cents with integer arithmetic; decimals=0 rounds to whole dollars."""
+    cents = int(cents)
+    sign = "-" if cents < 0 else ""
+    if decimals == 0:
+        dollars = (abs(cents) + CENTS_PER_UNIT // 2) // CENTS_PER_UNIT
+        return f"${sign}{dollars:,}"
+    dollars, rest = divmod(abs(cents), CENTS_PER_UNIT)
+    return f"${sign}{dollars:,}.{rest:02d}"
+
+
+def share_bp(share: float) -> int:
+    """A fraction such as 0.30 in basis points (3000)."""
+    return int(round(share * BASIS_POINTS))
+
+
+def sum_cents_groups(groups: Mapping[K, Sequence]) -> Dict[K, int]:
+    """Exact cents total per key of {key: [dollar amounts]}.
+
+    Lets a single pass over dict records bucket raw amounts by key; each
+    bucket is then converted and summed in one vectorized step.
+    """
+    return {key: int(to_cents_array(amounts).sum()) for key, amounts in groups.items()}
+
+
+def sum_cents_by_code(codes: np.ndarray, cents: np.ndarray, minlength: int = 0) -> np.ndarray:
+    """int64 cents per code: one vectorized pass with exact integer sums."""
+    out = np.zeros(max(minlength, int(codes.max()) + 1 if len(codes) else 0), dtype=CENTS_DTYPE)
+    np.add.at(out, codes, cents)
+    return out
+
+
+def _decimal(amount: Union[str, Decimal]) -> Decimal:
+    value = amount if isinstance(amount, Decimal) else Decimal(amount.strip())
+    if not value.is_finite():
+        raise ValueError(f"Not an amount: {amount!r}")
+    return value
@@ -0,0 +1,212 @@
+"""
+Compact expense records.
+Categories, types and months repeat on every row, so they are interned
+as small integer codes (`Codebook`) seeded from EXPENSE_CATEGORIES and
+EXPENSE_TYPES. Rows are handed out as `ExpenseRecord` named tuples — a
+third of a dict's size — which still read like dicts (`rec["amount"]`,
+`rec.get("note")`), and batches can be held column-wise in
+`ExpenseColumns`, whose totals are exact int64-cent sums per code
+(see money.py). No Streamlit.
+"""
+
+import gc
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.config import EXPENSE_CATEGORIES, EXPENSE_TYPES
+from src.logic.money import CENTS_DTYPE, from_cents, sum_cents_by_code, to_cents
+
+RECORD_FIELDS = ("id", "category", "name", "amount", "type", "month", "note")
+_FIELD_SET = frozenset(RECORD_FIELDS)
+
+# Code columns are int16: room for 32k distinct values per codebook
+CODE_DTYPE = np.int16
+
+
+class Codebook:
+    """Two-way map between strings and small integer codes.
+
+    Codes are dense and never reused, so they index NumPy arrays directly.
+    Unknown values are appended on first sight (thread-safe); lookups of
+    known values take no lock.
+    """
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        for value in values:
+            self.code(value)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            with self._lock:
+                code = self._codes.get(value)
+                if code is None:
+                    if len(self.values) >= np.iinfo(CODE_DTYPE).max:
+                        raise OverflowError("Codebook is full")
+                    code = len(self.values)
+                    # Stored interned: every row of a category shares one string
+                    self.values.append(value)
+                    self._codes[value] = code
+        return code
+
+    def lookup(self, value: str) -> Optional[int]:
+        """Code of `value` without adding it (None if never seen)."""
+        return self._codes.get(value)
+
+    def encode(self, values: Iterable[str]) -> np.ndarray:
+        return np.fromiter((self.code(v) for v in values), dtype=CODE_DTYPE)
+
+
+# Process-wide codebooks, shared by every store and batch
+CATEGORY_CODES = Codebook(EXPENSE_CATEGORIES)
+TYPE_CODES = Codebook(EXPENSE_TYPES)
+MONTH_CODES = Codebook()
+
+
+@contextmanager
+def gc_paused():
+    """Suspend the cyclic garbage collector for a bulk allocation.
+
+    Only for building objects that cannot form reference cycles (records
+    of plain values): otherwise every few hundred allocations re-scans
+    the young objects, and the occasional full collection walks the heap.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if enabled:
+            gc.enable()
+
+
+class ExpenseRecord(NamedTuple):
+    """One expense. Supports the dict reads existing code relies on.
+
+    A tuple rather than a dataclass: no per-instance __dict__, and the
+    collector stops tracking tuples of plain values after its first pass.
+    Build large batches inside `gc_paused()` so that first pass isn't
+    triggered over and over while they are created.
+    """
+
+    id: int
+    category: str
+    name: str
+    amount: float
+    type: str
+    month: str
+    note: str = ""
+
+    def __getitem__(self, key):
+        if isinstance(key, str):
+            if key not in _FIELD_SET:
+                raise KeyError(key)
+            return getattr(self, key)
+        return tuple.__getitem__(self, key)
+
+    def __contains__(self, key) -> bool:
+        return key in _FIELD_SET
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in _FIELD_SET else default
+
+    def keys(self) -> Tuple[str, ...]:
+        return RECORD_FIELDS
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(RECORD_FIELDS, self))
+
+
+class ExpenseColumns:
+    """A batch of expenses as parallel columns (struct of arrays).
+
+    Immutable once built. Amounts are int64 cents; aggregates are integer
+    sums per code, one vectorized pass however many rows there are.
+    """
+
+    def __init__(self, ids: np.ndarray, cents: np.ndarray, categories: np.ndarray,
+                 types: np.ndarray, months: np.ndarray,
+                 names: Sequence[str], notes: Sequence[str]):
+        self.ids = ids
+        self.cents = cents
+        self.categories = categories  # CATEGORY_CODES codes
+        self.types = types            # TYPE_CODES codes
+        self.months = months          # MONTH_CODES codes
+        self.names = names
+        self.notes = notes
+        for column in (ids, cents, categories, types, months):
+            column.setflags(write=False)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "ExpenseColumns":
+        """Columns of dict-like records (defaults as in ExpenseStore.extend)."""
+        records = list(records)
+        return cls(
+            ids=np.fromiter((i + 1 if r.get("id") is None else int(r["id"])
+                             for i, r in enumerate(records)),
+                            dtype=np.int64, count=len(records)),
+            cents=np.fromiter((to_cents(r.get("amount", 0)) for r in records),
+                              dtype=CENTS_DTYPE, count=len(records)),
+            categories=CATEGORY_CODES.encode(r.get("category", "Other") for r in records),
+            types=TYPE_CODES.encode(r.get("type", "Variable") for r in records),
+            months=MONTH_CODES.encode(r.get("month", "") for r in records),
+            names=[r.get("name", "") for r in records],
+            notes=[r.get("note", "") for r in records],
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @property
+    def amounts(self) -> np.ndarray:
+        """Amounts in dollars (float64), for plotting and float-based callers."""
+        return self.cents / 100
+
+    def __iter__(self) -> Iterator[ExpenseRecord]:
+        for i in range(len(self.ids)):
+            yield self.record(i)
+
+    def record(self, i: int) -> ExpenseRecord:
+        return ExpenseRecord(
+            int(self.ids[i]), CATEGORY_CODES.values[self.categories[i]], self.names[i],
+            from_cents(self.cents[i]), TYPE_CODES.values[self.types[i]],
+            MONTH_CODES.values[self.months[i]], self.notes[i],
+        )
+
+    def for_month(self, month: str) -> "ExpenseColumns":
+        code = MONTH_CODES.lookup(month)
+        rows = np.flatnonzero(self.months == code) if code is not None else np.empty(0, dtype=np.int64)
+        return ExpenseColumns(
+            self.ids[rows], self.cents[rows], self.categories[rows], self.types[rows],
+            self.months[rows], [self.names[r] for r in rows], [self.notes[r] for r in rows],
+        )
+
+    def category_cents(self) -> Dict[str, int]:
+        return _totals_by_code(self.categories, self.cents, CATEGORY_CODES)
+
+    def type_cents(self) -> Dict[str, int]:
+        return _totals_by_code(self.types, self.cents, TYPE_CODES)
+
+    def category_totals(self) -> Dict[str, float]:
+        return {k: from_cents(v) for k, v in self.category_cents().items()}
+
+    def type_totals(self) -> Dict[str, float]:
+        return {k: from_cents(v) for k, v in self.type_cents().items()}
+
+
+def _totals_by_code(codes: np.ndarray, cents: np.ndarray, book: Codebook) -> Dict[str, int]:
+    """{value: total cents} over the codes present in `codes`."""
+    if not len(codes):
+        return {}
+    sums = sum_cents_by_code(codes, cents, len(book))
+    present = np.bincount(codes, minlength=len(book)) > 0
+    return {book.values[c]: int(sums[c]) for c in np.flatnonzero(present)}
@@ -0,0 +1,128 @@
+"""
+Persistent cache of AI replies keyed on prompt content.
+Two tiers: an in-process LRU for hot entries and a SQLite file that
+survives restarts. Entries expire after a TTL and the disk tier is kept
+under a row budget, evicting least recently used rows first.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+from src.config import (
+    AI_CACHE_PATH,
+    AI_CACHE_TTL,
+    AI_CACHE_MEMORY_SIZE,
+    AI_CACHE_MAX_ENTRIES,
+)
+from src.logic.cache import LRUCache
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key      TEXT PRIMARY KEY,
+    reply    TEXT NOT NULL,
+    created  REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_responses_accessed ON responses (accessed);
+"""
+_SELECT = "SELECT reply, created FROM responses WHERE key = ?"
+_TOUCH = "UPDATE responses SET accessed = ? WHERE key = ?"
+_UPSERT = (
+    "INSERT INTO responses (key, reply, created, accessed) VALUES (?, ?, ?, ?) "
+    "ON CONFLICT(key) DO UPDATE SET reply = excluded.reply, "
+    "created = excluded.created, accessed = excluded.accessed"
+)
+_DELETE = "DELETE FROM responses WHERE key = ?"
+_COUNT = "SELECT COUNT(*) FROM responses"
+_EVICT = (
+    "DELETE FROM responses WHERE key IN "
+    "(SELECT key FROM responses ORDER BY accessed LIMIT ?)"
+)
+_EXPIRE = "DELETE FROM responses WHERE created < ?"
+
+# Check the disk budget every this many writes rather than on each one
+_EVICT_EVERY = 50
+
+
+def make_key(model: str, messages: List[Dict], **params) -> str:
+    """Digest of everything that determines a reply: model, messages, sampling params."""
+    payload = json.dumps({"model": model, "messages": messages, "params": params},
+                         sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class ResponseCache:
+    """Memory + SQLite reply cache with TTL and size-bounded eviction."""
+
+    def __init__(self, path: str = AI_CACHE_PATH, ttl: float = AI_CACHE_TTL,
+                 memory_size: int = AI_CACHE_MEMORY_SIZE,
+                 max_entries: int = AI_CACHE_MAX_ENTRIES):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._memory = LRUCache(memory_size)
+        self._lock = threading.Lock()
+        self._writes = 0
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(_EXPIRE, (time.time() - ttl,))
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        hit = self._memory.get(key)
+        if hit is not None:
+            reply, created = hit
+            if now - created < self.ttl:
+                return reply
+
+        with self._lock:
+            row = self._conn.execute(_SELECT, (key,)).fetchone()
+            if row is None:
+                return None
+            reply, created = row
+            with self._conn:
+                if now - created >= self.ttl:
+                    self._conn.execute(_DELETE, (key,))
+                    return None
+                self._conn.execute(_TOUCH, (now, key))
+        self._memory.put(key, (reply, created))
+        return reply
+
+    def put(self, key: str, reply: str) -> None:
+        now = time.time()
+        self._memory.put(key, (reply, now))
+        with self._lock, self._conn:
+            self._conn.execute(_UPSERT, (key, reply, now, now))
+            self._writes += 1
+            if self._writes % _EVICT_EVERY == 0:
+                self._evict(now)
+
+    def clear(self) -> None:
+        self._memory.clear()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM responses")
+
+    def _evict(self, now: float) -> None:
+        self._conn.execute(_EXPIRE, (now - self.ttl,))
+        excess = self._conn.execute(_COUNT).fetchone()[0] - self.max_entries
+        if excess > 0:
+            self._conn.execute(_EVICT, (excess,))
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """The process-wide reply cache, opened on first use."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+        return _cache
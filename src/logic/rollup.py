@@ -0,0 +1,163 @@
+"""
+Monthly rollup index for trend views.
+Per-category spend on a contiguous calendar-month axis (months with no
+expenses are zero rows) plus cumulative prefix sums, so any month range —
+last 3/6/12 months, year over year, rolling averages — is the difference
+of two prefix rows instead of a pass over raw expenses. Built from the
+store's running totals, never from rows. Sums are int64 cents, so range
+totals are exact whichever prefix rows they subtract. No Streamlit here.
+"""
+
+import re
+from datetime import date
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from src.logic.money import CENTS_DTYPE, from_cents, sum_cents_groups
+
+_MONTH = re.compile(r"^(\d{4})-(\d{2})$")
+
+
+# ── Month arithmetic ───────────────────────────────────────────────────────────
+
+def month_index(month: str) -> Optional[int]:
+    """Months since year 0 for a "YYYY-MM" string, or None if malformed."""
+    match = _MONTH.match(month or "")
+    if match is None:
+        return None
+    year, mon = int(match.group(1)), int(match.group(2))
+    return year * 12 + mon - 1 if 1 <= mon <= 12 else None
+
+
+def month_label(index: int) -> str:
+    return f"{index // 12:04d}-{index % 12 + 1:02d}"
+
+
+def shift_month(month: str, delta: int) -> str:
+    """`month` moved by `delta` calendar months ("2026-01", -1 → "2025-12")."""
+    return month_label(month_index(month) + delta)
+
+
+def current_month() -> str:
+    return date.today().strftime("%Y-%m")
+
+
+def month_options(months: Iterable[str], *include: str) -> List[str]:
+    """Distinct well-formed months from the data plus `include`, newest first."""
+    return sorted({m for m in (*months, *include) if month_index(m) is not None}, reverse=True)
+
+
+# ── Rollup ─────────────────────────────────────────────────────────────────────
+
+class MonthlyRollup:
+    """Per-category monthly totals with prefix sums for O(1) range queries.
+
+    `months` spans the first to the last month holding data, gaps included.
+    Ranges may reach outside it; those months simply contribute zero.
+    Instances are immutable snapshots — rebuild after the ledger changes.
+    """
+
+    def __init__(self, sums: Mapping[str, Mapping[str, float]]):
+        """`sums` maps month → category → total cents (malformed months are ignored)."""
+        valid = {m: i for m, i in ((m, month_index(m)) for m in sums) if i is not None}
+        self._first = min(valid.values()) if valid else 0
+        span = max(valid.values()) - self._first + 1 if valid else 0
+        self.months: List[str] = [month_label(self._first + i) for i in range(span)]
+        self.categories: List[str] = sorted({c for m in valid for c in sums[m]})
+        self._column = {c: j for j, c in enumerate(self.categories)}
+
+        cents = np.zeros((span, len(self.categories)), dtype=CENTS_DTYPE)
+        for month, i in valid.items():
+            for category, total in sums[month].items():
+                cents[i - self._first, self._column[category]] += total
+        # prefix[i] = sum of months [0, i); one extra column for all categories
+        self._prefix = np.zeros((span + 1, len(self.categories) + 1), dtype=CENTS_DTYPE)
+        np.cumsum(cents, axis=0, out=self._prefix[1:, :-1])
+        self._prefix[1:, -1] = self._prefix[1:, :-1].sum(axis=1)
+        self._prefix.setflags(write=False)
+        # Dollars, for charts
+        self.totals = cents / 100
+        self.totals.setflags(write=False)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict]) -> "MonthlyRollup":
+        """Rollup of plain expense dicts (one pass; stores use their running totals)."""
+        groups: Dict[str, Dict[str, list]] = {}
+        for e in records:
+            by_category = groups.get(e["month"])
+            if by_category is None:
+                by_category = groups[e["month"]] = {}
+            amounts = by_category.get(e["category"])
+            if amounts is None:
+                amounts = by_category[e["category"]] = []
+            amounts.append(e["amount"])
+        return cls({month: sum_cents_groups(by_category) for month, by_category in groups.items()})
+
+    def __len__(self) -> int:
+        return len(self.months)
+
+    @property
+    def latest(self) -> Optional[str]:
+        return self.months[-1] if self.months else None
+
+    def range_total(self, start: str, end: str, category: Optional[str] = None) -> float:
+        """Spend over months `start`..`end` inclusive, for one or all categories."""
+        column = self._col(category)
+        if column is None:
+            return 0.0
+        lo, hi = self._span(start, end)
+        return from_cents(self._prefix[hi, column] - self._prefix[lo, column])
+
+    def range_totals(self, start: str, end: str) -> Dict[str, float]:
+        """Spend per category over months `start`..`end` inclusive."""
+        lo, hi = self._span(start, end)
+        diff = self._prefix[hi, :-1] - self._prefix[lo, :-1]
+        return {c: from_cents(v) for c, v in zip(self.categories, diff) if v}
+
+    def trailing(self, n: int, end: Optional[str] = None,
+                 category: Optional[str] = None) -> float:
+        """Spend over the `n` months ending at `end` (default: latest month)."""
+        end = end or self.latest
+        if end is None:
+            return 0.0
+        return self.range_total(shift_month(end, 1 - n), end, category)
+
+    def yoy(self, month: str, category: Optional[str] = None) -> Optional[float]:
+        """Fractional change against the same month a year earlier (None if that was 0)."""
+        before = self.range_total(shift_month(month, -12), shift_month(month, -12), category)
+        if not before:
+            return None
+        return self.range_total(month, month, category) / before - 1
+
+    def window(self, start: str, end: str) -> Tuple[List[str], np.ndarray]:
+        """(months, per-category totals) for `start`..`end` inclusive, gaps as zeros."""
+        a, b = month_index(start), month_index(end)
+        months = [month_label(i) for i in range(a, b + 1)]
+        out = np.zeros((len(months), len(self.categories)))
+        lo, hi = self._span(start, end)
+        if hi > lo:
+            offset = self._first + lo - a
+            out[offset:offset + hi - lo] = self.totals[lo:hi]
+        return months, out
+
+    def rolling_mean(self, n: int, start: str, end: str,
+                     category: Optional[str] = None) -> List[float]:
+        """Trailing `n`-month average of spend for each month `start`..`end`."""
+        return [self.trailing(n, m, category) / n
+                for m in (month_label(i) for i in range(month_index(start), month_index(end) + 1))]
+
+    def _col(self, category: Optional[str]) -> Optional[int]:
+        return len(self.categories) if category is None else self._column.get(category)
+
+    def _span(self, start: str, end: str) -> Tuple[int, int]:
+        """Prefix rows [lo, hi) covering `start`..`end`, clipped to the data."""
+        lo = min(max(month_index(start) - self._first, 0), len(self.months))
+        hi = min(max(month_index(end) - self._first + 1, 0), len(self.months))
+        return lo, max(lo, hi)
+
+
+def monthly_rollup(expenses: Iterable[Dict]) -> MonthlyRollup:
+    """Rollup for an ExpenseStore (cached per version) or a plain record list."""
+    rollup = getattr(expenses, "rollup", None)
+    return rollup() if rollup is not None else MonthlyRollup.from_records(expenses)
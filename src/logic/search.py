@@ -0,0 +1,114 @@
+"""
+Incremental text search over expense names and categories.
+An inverted index from character trigrams (for substring queries) and
+word tokens (for short prefix queries) to the distinct lower-cased texts
+that contain them, and from each text to its expense ids. Ledgers repeat
+the same few names ("Rent", "Groceries") thousands of times, so the
+postings stay small however many rows there are. No Streamlit here.
+"""
+
+import bisect
+import re
+from typing import Dict, Iterable, List, Optional, Set
+
+_TOKEN = re.compile(r"\w+")
+
+# Queries shorter than this match word prefixes instead of substrings
+MIN_SUBSTRING_QUERY = 3
+
+
+def _text(name: str, category: str) -> str:
+    return f"{name}\n{category}".lower()
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SearchIndex:
+    """Trigram + token-prefix index mapping expense text to expense ids."""
+
+    def __init__(self):
+        self._ids: Dict[str, Set[int]] = {}      # text → expense ids
+        self._grams: Dict[str, Set[str]] = {}    # trigram → texts
+        self._tokens: Dict[str, Set[str]] = {}   # word → texts
+        self._sorted_tokens: List[str] = []
+        self._tokens_dirty = False
+
+    def __len__(self) -> int:
+        return sum(len(ids) for ids in self._ids.values())
+
+    def add(self, expense_id: int, name: str, category: str) -> None:
+        text = _text(name, category)
+        ids = self._ids.get(text)
+        if ids is None:
+            ids = self._ids[text] = set()
+            for gram in _trigrams(text):
+                self._grams.setdefault(gram, set()).add(text)
+            for token in _TOKEN.findall(text):
+                texts = self._tokens.setdefault(token, set())
+                if not texts:
+                    self._tokens_dirty = True
+                texts.add(text)
+        ids.add(expense_id)
+
+    def remove(self, expense_id: int, name: str, category: str) -> None:
+        text = _text(name, category)
+        ids = self._ids.get(text)
+        if ids is None:
+            return
+        ids.discard(expense_id)
+        if ids:
+            return
+        # Last expense with this text: drop it from every posting
+        del self._ids[text]
+        for gram in _trigrams(text):
+            _discard(self._grams, gram, text)
+        for token in _TOKEN.findall(text):
+            if _discard(self._tokens, token, text):
+                self._tokens_dirty = True
+
+    def search(self, query: str, category: Optional[str] = None) -> List[int]:
+        """Ids whose name or category contains `query` (case-insensitive).
+
+        Queries under MIN_SUBSTRING_QUERY characters match the start of any
+        word instead, which is what a user typing "g" or "gr" means. With
+        `category`, only expenses in that category are returned.
+        """
+        query = query.strip().lower()
+        if len(query) < MIN_SUBSTRING_QUERY:
+            texts: Iterable[str] = self._prefix_texts(query)
+        else:
+            postings = sorted((self._grams.get(g, set()) for g in _trigrams(query)), key=len)
+            if not postings or not postings[0]:
+                return []
+            candidates = postings[0].intersection(*postings[1:])
+            texts = [t for t in candidates if query in t]
+        if category is not None:
+            suffix = "\n" + category.lower()
+            texts = [t for t in texts if t.endswith(suffix)]
+        return [i for t in texts for i in self._ids[t]]
+
+    def _prefix_texts(self, prefix: str) -> Set[str]:
+        if self._tokens_dirty:
+            self._sorted_tokens = sorted(self._tokens)
+            self._tokens_dirty = False
+        tokens = self._sorted_tokens
+        texts: Set[str] = set()
+        for i in range(bisect.bisect_left(tokens, prefix), len(tokens)):
+            if not tokens[i].startswith(prefix):
+                break
+            texts.update(self._tokens[tokens[i]])
+        return texts
+
+
+def _discard(index: Dict[str, Set[str]], key: str, text: str) -> bool:
+    """Remove `text` from one posting; True if the posting became empty."""
+    texts = index.get(key)
+    if texts is None:
+        return False
+    texts.discard(text)
+    if not texts:
+        del index[key]
+        return True
+    return False
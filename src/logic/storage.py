@@ -0,0 +1,329 @@
+"""
+SQLite persistence for FinMind ledgers.
+A single local database file in WAL mode; every user's expenses live in one
+indexed table and income in a small profile table, both as integer cents so
+SUM() totals are exact. No Streamlit here — the app shares one LedgerDB per
+process and binds it to a user with `ledger()`.
+"""
+
+import contextlib
+import hashlib
+import json
+import re
+import secrets
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.logic.money import from_cents, to_cents
+from src.logic.store import EXPENSE_FIELDS, StaleWriteError
+
+SCHEMA_VERSION = 1
+
+# Session tokens are random and long enough that ledger ids cannot be guessed
+_TOKEN_BYTES = 24
+_TOKEN = re.compile(r"[A-Za-z0-9_-]{32}")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS expenses (
+    user     TEXT    NOT NULL,
+    id       INTEGER NOT NULL,
+    month    TEXT    NOT NULL,
+    category TEXT    NOT NULL,
+    name     TEXT    NOT NULL,
+    amount_cents INTEGER NOT NULL,
+    type     TEXT    NOT NULL,
+    note     TEXT    NOT NULL DEFAULT '',
+    fingerprint INTEGER,
+    PRIMARY KEY (user, id)
+);
+CREATE INDEX IF NOT EXISTS idx_expenses_user_month_category
+    ON expenses (user, month, category);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_expenses_user_fingerprint
+    ON expenses (user, fingerprint) WHERE fingerprint IS NOT NULL;
+CREATE TABLE IF NOT EXISTS profile (
+    user   TEXT PRIMARY KEY,
+    income_cents INTEGER,
+    seeded INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+# Table column per store field (amounts are kept in cents)
+_COLUMNS = {f: "amount_cents" if f == "amount" else f for f in EXPENSE_FIELDS}
+
+# Statements are kept as constants so sqlite3's statement cache re-uses
+# the prepared form on every call.
+_SELECT_MONTH = (
+    "SELECT id, category, name, amount_cents, type, month, note FROM expenses "
+    "WHERE user = ? AND month = ? ORDER BY id"
+)
+_SELECT_TOTALS = (
+    "SELECT month, category, type, SUM(amount_cents), COUNT(*) FROM expenses "
+    "WHERE user = ? GROUP BY month, category, type"
+)
+_SELECT_MAX_ID = "SELECT COALESCE(MAX(id), 0) FROM expenses WHERE user = ?"
+_SELECT_KNOWN_FINGERPRINTS = (
+    "SELECT fingerprint FROM expenses WHERE user = ? "
+    "AND fingerprint IN (SELECT value FROM json_each(?))"
+)
+_INSERT = (
+    "INSERT INTO expenses (user, id, month, category, name, amount_cents, type, note, fingerprint) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+# A row as the writing session last saw it: writes that match no row fail
+_MATCH_ROW = (
+    "user = ? AND id = ? AND month = ? AND category = ? AND name = ? "
+    "AND amount_cents = ? AND type = ? AND note = ?"
+)
+_DELETE = "DELETE FROM expenses WHERE " + _MATCH_ROW
+_SELECT_INCOME = "SELECT income_cents FROM profile WHERE user = ?"
+_SELECT_SEEDED = "SELECT seeded FROM profile WHERE user = ?"
+_MARK_SEEDED = (
+    "INSERT INTO profile (user, seeded) VALUES (?, 1) "
+    "ON CONFLICT(user) DO UPDATE SET seeded = 1"
+)
+_UPSERT_INCOME = (
+    "INSERT INTO profile (user, income_cents) VALUES (?, ?) "
+    "ON CONFLICT(user) DO UPDATE SET income_cents = excluded.income_cents"
+)
+
+
+def new_session_token() -> str:
+    """A fresh, unguessable token naming one browser session's ledger."""
+    return secrets.token_urlsafe(_TOKEN_BYTES)
+
+
+def session_user(token: str) -> Optional[str]:
+    """The ledger id for a session token, or None if `token` is not one.
+
+    Only a digest of the token is stored, so the database never holds a
+    value that would open someone's ledger.
+    """
+    if not _TOKEN.fullmatch(token or ""):
+        return None
+    return "session-" + hashlib.sha256(token.encode()).hexdigest()
+
+
+class LedgerDB:
+    """Thread-safe handle on the FinMind SQLite database."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, cached_statements=64)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._migrate()
+
+    def _migrate(self) -> None:
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(
+                f"{self.path} has ledger schema v{version}; this FinMind supports up to v{SCHEMA_VERSION}"
+            )
+        # One script, one transaction: a failure never leaves half a schema
+        try:
+            self._conn.executescript(
+                "BEGIN;\n" + _SCHEMA + f"\nPRAGMA user_version={SCHEMA_VERSION};\nCOMMIT;"
+            )
+        except sqlite3.Error:
+            if self._conn.in_transaction:
+                self._conn.rollback()
+            raise
+
+    def ledger(self, user: str) -> "UserLedger":
+        """Bind this database to one user's ledger."""
+        return UserLedger(self, user)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def load_month(self, user: str, month: str) -> List[Dict]:
+        with self._lock:
+            rows = self._conn.execute(_SELECT_MONTH, (user, month)).fetchall()
+        return [
+            {"id": r[0], "category": r[1], "name": r[2], "amount": from_cents(r[3]),
+             "amount_cents": r[3], "type": r[4], "month": r[5], "note": r[6]}
+            for r in rows
+        ]
+
+    def totals(self, user: str) -> List[Tuple[str, str, str, int, int]]:
+        """(month, category, type, sum in cents, count) for every group of a user's rows."""
+        with self._lock:
+            return self._conn.execute(_SELECT_TOTALS, (user,)).fetchall()
+
+    def max_id(self, user: str) -> int:
+        with self._lock:
+            return self._conn.execute(_SELECT_MAX_ID, (user,)).fetchone()[0]
+
+    def is_seeded(self, user: str) -> bool:
+        """True once the user's starting ledger was saved (see `seed()`)."""
+        with self._lock:
+            row = self._conn.execute(_SELECT_SEEDED, (user,)).fetchone()
+        return row is not None and bool(row[0])
+
+    def known_fingerprints(self, user: str, fingerprints: Iterable[int]) -> Set[int]:
+        """Which of `fingerprints` a user's rows already carry (one index probe each)."""
+        values = json.dumps(list(fingerprints))
+        with self._lock:
+            return {r[0] for r in self._conn.execute(_SELECT_KNOWN_FINGERPRINTS, (user, values))}
+
+    def get_income(self, user: str) -> Optional[float]:
+        with self._lock:
+            row = self._conn.execute(_SELECT_INCOME, (user,)).fetchone()
+        return None if row is None or row[0] is None else from_cents(row[0])
+
+    # ── Writes (one transaction per call) ────────────────────────────────────
+
+    def insert_many(self, user: str, records: Iterable[Dict]) -> List[int]:
+        """Insert rows and return their ids.
+
+        Rows without an id get the next free ones, read inside the write
+        transaction so two sessions of one user never pick the same id. A
+        clash on an explicit id or import fingerprint raises KeyError.
+        """
+        with self._lock, self._write():
+            return self._insert(user, records)
+
+    def seed(self, user: str, records: Iterable[Dict]) -> bool:
+        """Save a new user's starting ledger and mark the user seeded.
+
+        Returns False, writing nothing, if the user was seeded already (by
+        another session, say). Deleting every row later keeps the flag.
+        """
+        with self._lock, self._write():
+            row = self._conn.execute(_SELECT_SEEDED, (user,)).fetchone()
+            if row is not None and row[0]:
+                return False
+            self._insert(user, records)
+            self._conn.execute(_MARK_SEEDED, (user,))
+            return True
+
+    def update(self, user: str, expense_id: int, fields: Dict, current: Dict) -> None:
+        self.update_many(user, {expense_id: fields}, {expense_id: current})
+
+    def update_many(self, user: str, changes: Dict[int, Dict], current: Dict[int, Dict]) -> None:
+        """Apply {id: fields} edits in one transaction, one statement per column set.
+
+        `current` holds each row as the caller last saw it. If any row was
+        deleted or changed since, nothing is written and StaleWriteError
+        is raised.
+        """
+        batches: Dict[tuple, List[list]] = {}
+        for expense_id, fields in changes.items():
+            if "amount" in fields or "amount_cents" in fields:
+                fields = {**fields, "amount": _cents(fields)}
+            columns = tuple(f for f in EXPENSE_FIELDS if f in fields)
+            if columns:
+                batches.setdefault(columns, []).append(
+                    [fields[c] for c in columns] + _match_params(user, expense_id, current[expense_id])
+                )
+        if not batches:
+            return
+        with self._lock, self._conn:
+            for columns, params in batches.items():
+                sql = "UPDATE expenses SET {} WHERE {}".format(
+                    ", ".join(f"{_COLUMNS[c]} = ?" for c in columns), _MATCH_ROW
+                )
+                _check_rowcount(self._conn.executemany(sql, params), len(params))
+
+    def delete_many(self, user: str, current: Dict[int, Dict]) -> None:
+        """Delete {id: row as last seen} in one transaction; stale rows fail as in update_many()."""
+        params = [_match_params(user, i, row) for i, row in current.items()]
+        with self._lock, self._conn:
+            _check_rowcount(self._conn.executemany(_DELETE, params), len(params))
+
+    def set_income(self, user: str, income: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(_UPSERT_INCOME, (user, to_cents(income)))
+
+    @contextlib.contextmanager
+    def _write(self):
+        # IMMEDIATE takes the write lock before the transaction's first read,
+        # so ids and flags read inside it cannot go stale (even across processes)
+        try:
+            with self._conn:
+                self._conn.execute("BEGIN IMMEDIATE")
+                yield
+        except sqlite3.IntegrityError as exc:
+            raise KeyError(f"Expense already exists: {exc}") from None
+
+    def _insert(self, user: str, records: Iterable[Dict]) -> List[int]:
+        next_id = self._conn.execute(_SELECT_MAX_ID, (user,)).fetchone()[0] + 1
+        ids, params = [], []
+        for r in records:
+            expense_id = next_id if r.get("id") is None else int(r["id"])
+            next_id = max(next_id, expense_id + 1)
+            ids.append(expense_id)
+            params.append((user, expense_id, r["month"], r["category"], r["name"],
+                           _cents(r), r["type"], r.get("note", ""), r.get("fingerprint")))
+        self._conn.executemany(_INSERT, params)
+        return ids
+
+
+class UserLedger:
+    """A LedgerDB bound to one user — the backend an ExpenseStore writes through to."""
+
+    def __init__(self, db: LedgerDB, user: str):
+        self.db = db
+        self.user = user
+
+    def load_month(self, month: str) -> List[Dict]:
+        return self.db.load_month(self.user, month)
+
+    def totals(self) -> List[Tuple[str, str, str, int, int]]:
+        return self.db.totals(self.user)
+
+    def max_id(self) -> int:
+        return self.db.max_id(self.user)
+
+    def is_seeded(self) -> bool:
+        return self.db.is_seeded(self.user)
+
+    def known_fingerprints(self, fingerprints: Iterable[int]) -> Set[int]:
+        return self.db.known_fingerprints(self.user, fingerprints)
+
+    def insert_many(self, records: Iterable[Dict]) -> List[int]:
+        return self.db.insert_many(self.user, records)
+
+    def seed(self, records: Iterable[Dict]) -> bool:
+        return self.db.seed(self.user, records)
+
+    def update(self, expense_id: int, fields: Dict, current: Dict) -> None:
+        self.db.update(self.user, expense_id, fields, current)
+
+    def update_many(self, changes: Dict[int, Dict], current: Dict[int, Dict]) -> None:
+        self.db.update_many(self.user, changes, current)
+
+    def delete_many(self, current: Dict[int, Dict]) -> None:
+        self.db.delete_many(self.user, current)
+
+    def get_income(self, default: float) -> float:
+        income = self.db.get_income(self.user)
+        return default if income is None else income
+
+    def set_income(self, income: float) -> None:
+        self.db.set_income(self.user, income)
+
+
+def _cents(record: Dict) -> int:
+    """A record's amount in cents, from `amount_cents` when the store supplied it."""
+    cents = record.get("amount_cents")
+    return to_cents(record["amount"]) if cents is None else cents
+
+
+def _match_params(user: str, expense_id: int, row: Dict) -> list:
+    return [user, expense_id, row["month"], row["category"], row["name"],
+            _cents(row), row["type"], row["note"]]
+
+
+def _check_rowcount(cursor: sqlite3.Cursor, expected: int) -> None:
+    # Raised inside the transaction, so the whole batch is rolled back
+    if cursor.rowcount != expected:
+        missing = expected - cursor.rowcount
+        raise StaleWriteError(
+            f"{missing} expense(s) were changed or deleted in another session"
+        )
@@ -0,0 +1,645 @@
+"""
+Columnar expense store.
+Replaces the list-of-dicts ledger with column arrays plus hash indexes,
+so lookup, update and delete are O(1) and month filters only touch the
+rows of that month. Amounts are int64 cents (see money.py) and running
+per-month category/type totals are exact integer sums kept up to date on
+every mutation — pure Python/NumPy, no Streamlit.
+
+A store can be opened on a persistence backend (see storage.py): rows are
+then loaded one month at a time on first access, and every mutation is
+written through before it is applied in memory.
+
+Shared reference data (the seed ledger) lives in a frozen store; sessions
+fork() it and only pay for their own copy once they change something.
+"""
+
+import itertools
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from src.logic.memory import deep_sizeof
+from src.logic.money import CENTS_DTYPE, from_cents, to_cents
+from src.logic.records import (
+    CATEGORY_CODES,
+    CODE_DTYPE,
+    MONTH_CODES,
+    TYPE_CODES,
+    ExpenseColumns,
+    ExpenseRecord,
+    gc_paused,
+)
+from src.logic.rollup import MonthlyRollup
+from src.logic.search import SearchIndex
+
+# Fields every expense record carries (besides its id)
+EXPENSE_FIELDS = ("category", "name", "amount", "type", "month", "note")
+
+_INITIAL_CAPACITY = 64
+
+# NumPy columns, grown/copied/compacted together
+_ARRAY_COLUMNS = ("_ids", "_cents", "_alive", "_categories", "_types", "_months")
+
+_store_uids = itertools.count(1)
+
+
+class StaleWriteError(RuntimeError):
+    """A write hit expenses that another session changed or deleted meanwhile."""
+
+
+class ExpenseStore:
+    """Indexed, column-oriented expense ledger.
+
+    Rows live in parallel columns — category, type and month as int16
+    codes (see records.py) — deleted rows are tombstoned and the columns
+    are compacted once more than half of them are dead. Records handed
+    out are fresh ExpenseRecords, so callers can never mutate the store
+    behind its back.
+
+    `uid` identifies the store for the life of the process and `version`
+    is bumped on every mutation; together they key derived-data caches.
+
+    With a backend, only loaded months are held as rows (iteration and
+    `len()` cover those), while the running totals always span the whole
+    ledger.
+
+    A frozen store rejects writes and can be forked: the fork shares its
+    columns, indexes, totals (and uid/version, hence cache entries) until
+    the fork's first write copies them.
+    """
+
+    def __init__(self, records: Iterable[Dict] = (), next_id: int = 1, backend=None):
+        self._ids = np.zeros(_INITIAL_CAPACITY, dtype=np.int64)
+        self._cents = np.zeros(_INITIAL_CAPACITY, dtype=CENTS_DTYPE)
+        self._alive = np.zeros(_INITIAL_CAPACITY, dtype=bool)
+        self._categories = np.zeros(_INITIAL_CAPACITY, dtype=CODE_DTYPE)
+        self._types = np.zeros(_INITIAL_CAPACITY, dtype=CODE_DTYPE)
+        self._months = np.zeros(_INITIAL_CAPACITY, dtype=CODE_DTYPE)
+        self._names: List[str] = []
+        self._notes: List[str] = []
+        self._size = 0  # rows used, including tombstones
+        self._dead = 0
+
+        # Indexes: id → row, month → {row}, category → {row}
+        # (dicts used as insertion-ordered sets)
+        self._by_id: Dict[int, int] = {}
+        self._by_month: Dict[str, Dict[int, None]] = {}
+        self._by_category: Dict[str, Dict[int, None]] = {}
+
+        # Running aggregates: month → category|type → [total cents, row count]
+        self._category_sums: Dict[str, Dict[str, List]] = {}
+        self._type_sums: Dict[str, Dict[str, List]] = {}
+
+        # Per-month text search, built on a month's first search()
+        self._search: Dict[str, SearchIndex] = {}
+
+        # (version, rollup) of the last monthly rollup handed out
+        self._rollup: Optional[tuple] = None
+
+        # Statement-import fingerprints (see importer.py) without a backend,
+        # which keeps them itself: id → fingerprint, plus the set of them
+        self._fingerprint_of: Dict[int, int] = {}
+        self._fingerprints: set = set()
+
+        # Copy-on-write: set while a fork still shares its parent's data
+        self._frozen = False
+        self._parent: Optional["ExpenseStore"] = None
+
+        self.uid = next(_store_uids)
+        self.version = 0
+        self.next_id = next_id
+        self.backend = backend
+        self._loaded_months: set = set()
+        if backend is not None:
+            self._seed_from_backend()
+        self.extend(records)
+
+    @classmethod
+    def open(cls, backend) -> "ExpenseStore":
+        """Store backed by persistent storage, with months loaded lazily."""
+        return cls(backend=backend)
+
+    # ── Container protocol ──────────────────────────────────────────────────
+
+    @classmethod
+    def frozen(cls, records: Iterable[Dict]) -> "ExpenseStore":
+        """Read-only store of `records`, for sharing between sessions via fork()."""
+        store = cls(records)
+        store._frozen = True
+        return store
+
+    def fork(self, backend=None) -> "ExpenseStore":
+        """Copy-on-write view of this frozen store.
+
+        Reads go straight to the shared data. The first write copies it into
+        the fork and, with a `backend`, saves the inherited rows there before
+        the write itself, so untouched sessions never hit storage. If another
+        session of the same user saved them first, the fork reloads that
+        session's ledger from the backend instead.
+        """
+        if not self._frozen:
+            raise RuntimeError("Only frozen stores can be forked")
+        fork = object.__new__(type(self))
+        fork.__dict__.update(self.__dict__)
+        fork._frozen = False
+        fork._parent = self
+        fork.backend = backend
+        fork._loaded_months = set(self._by_month)
+        return fork
+
+    @property
+    def shared(self) -> bool:
+        """True while this fork still reads its parent's data."""
+        return self._parent is not None
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Approximate bytes held: {"private": this store only, "shared": parent data}."""
+        if self._parent is None:
+            return {"private": deep_sizeof(self.__dict__, {id(self.backend)}), "shared": 0}
+        shared = self._parent.__dict__
+        skip = {id(self.backend), id(self._parent)} | {id(v) for v in shared.values()}
+        return {"private": deep_sizeof(self.__dict__, skip),
+                "shared": deep_sizeof(shared, {id(self._parent.backend)})}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator[Dict]:
+        yield from self._records(np.flatnonzero(self._alive[: self._size]).tolist())
+
+    def __contains__(self, expense_id: int) -> bool:
+        return expense_id in self._by_id
+
+    def __repr__(self) -> str:
+        return f"ExpenseStore({len(self)} expenses)"
+
+    # ── Reads ────────────────────────────────────────────────────────────────
+
+    def get(self, expense_id: int) -> Optional[Dict]:
+        """Return the expense with this id, or None."""
+        row = self._by_id.get(expense_id)
+        return None if row is None else self._record(row)
+
+    def for_month(self, month: str) -> List[Dict]:
+        """All expenses booked in `month`, in insertion order."""
+        self.load_month(month)
+        return self._records(list(self._by_month.get(month, ())))
+
+    def for_category(self, category: str, month: Optional[str] = None) -> List[Dict]:
+        """All expenses in `category`, optionally restricted to one month."""
+        if month is not None:
+            self.load_month(month)
+        rows = self._by_category.get(category, {})
+        if month is not None:
+            month_rows = self._by_month.get(month, {})
+            if len(month_rows) < len(rows):
+                return self._records([r for r in month_rows if r in rows])
+            rows = [r for r in rows if r in month_rows]
+        return self._records(list(rows))
+
+    def count(self, month: Optional[str] = None) -> int:
+        """Number of expenses held for `month` (loading it), or in memory overall."""
+        if month is None:
+            return len(self)
+        self.load_month(month)
+        return len(self._by_month.get(month, ()))
+
+    def search(self, query: str = "", month: Optional[str] = None,
+               category: Optional[str] = None) -> List[int]:
+        """Ids of expenses matching `query`, optionally in one month and/or category.
+
+        Matches name or category case-insensitively (see SearchIndex.search)
+        and come back in id order; an empty query lists rows in the same
+        order as `for_month`. Each month's index is built on its first
+        search and kept up to date by every write after that.
+        """
+        query = query.strip()
+        if month is not None:
+            self.load_month(month)
+        if query:
+            ids: List[int] = []
+            for m in ([month] if month is not None else list(self._by_month)):
+                ids += self._search_index(m).search(query, category)
+            return np.sort(np.array(ids, dtype=np.int64)).tolist()
+
+        if month is not None:
+            rows = list(self._by_month.get(month, ()))
+        elif category is not None:
+            rows = list(self._by_category.get(category, ()))
+        else:
+            rows = sorted(self._by_id.values())
+        if category is not None and month is not None:
+            in_category = self._by_category.get(category, {})
+            rows = [r for r in rows if r in in_category]
+        return self._ids[rows].tolist() if rows else []
+
+    def months(self) -> List[str]:
+        """Months that currently hold at least one expense, sorted."""
+        return sorted(self._category_sums)
+
+    def rollup(self) -> MonthlyRollup:
+        """Monthly category rollup with prefix sums, rebuilt only after mutations.
+
+        Built from the running totals, so it costs O(months × categories)
+        however many rows the ledger holds, and covers unloaded months too.
+        """
+        if self._parent is not None:
+            return self._parent.rollup()
+        if self._rollup is None or self._rollup[0] != self.version:
+            sums = {month: {c: cents for c, (cents, _count) in month_sums.items()}
+                    for month, month_sums in self._category_sums.items()}
+            self._rollup = (self.version, MonthlyRollup(sums))
+        return self._rollup[1]
+
+    def columns(self, month: Optional[str] = None) -> ExpenseColumns:
+        """Resident rows (optionally one month) as an ExpenseColumns snapshot."""
+        if month is not None:
+            rows = np.fromiter(self._by_month.get(month, ()), dtype=np.int64)
+        else:
+            rows = np.flatnonzero(self._alive[: self._size])
+        return ExpenseColumns(
+            self._ids[rows], self._cents[rows], self._categories[rows], self._types[rows],
+            self._months[rows], [self._names[r] for r in rows], [self._notes[r] for r in rows],
+        )
+
+    def known_fingerprints(self, fingerprints: Iterable[int]) -> set:
+        """Which of `fingerprints` rows of this ledger were imported with."""
+        if self.backend is not None:
+            return self.backend.known_fingerprints(fingerprints)
+        return self._fingerprints.intersection(fingerprints)
+
+    def to_records(self) -> List[Dict]:
+        return list(self)
+
+    def category_cents(self, month: Optional[str] = None) -> Dict[str, int]:
+        """Exact spend in cents per category for one month (or all months)."""
+        return _collapse(self._category_sums, month)
+
+    def type_cents(self, month: Optional[str] = None) -> Dict[str, int]:
+        """Exact spend in cents per expense type for one month (or all months)."""
+        return _collapse(self._type_sums, month)
+
+    def category_totals(self, month: Optional[str] = None) -> Dict[str, float]:
+        """Spend per category for one month (or all months) from running sums."""
+        return {k: from_cents(v) for k, v in self.category_cents(month).items()}
+
+    def type_totals(self, month: Optional[str] = None) -> Dict[str, float]:
+        """Spend per expense type for one month (or all months) from running sums."""
+        return {k: from_cents(v) for k, v in self.type_cents(month).items()}
+
+    # ── Writes ───────────────────────────────────────────────────────────────
+
+    def add(self, record: Dict) -> int:
+        """Append one expense and return its id (assigned if missing)."""
+        return self.extend([record])[0]
+
+    def extend(self, records: Iterable[Dict]) -> List[int]:
+        """Append many expenses in one batch; returns their ids.
+
+        With a backend, rows for months that are not loaded are written
+        through without being kept in memory, so bulk imports stay flat.
+        """
+        batch = []
+        seen = set()
+        next_id = self.next_id
+        for record in records:
+            expense_id = record.get("id")
+            if expense_id is None and self.backend is None:
+                expense_id = next_id
+            if expense_id is not None:  # else the backend allocates it
+                expense_id = int(expense_id)
+                if expense_id in self._by_id or expense_id in seen:
+                    raise KeyError(f"Duplicate expense id: {expense_id}")
+                seen.add(expense_id)
+                next_id = max(next_id, expense_id + 1)
+            batch.append({
+                "id": expense_id,
+                "category": record.get("category", "Other"),
+                "name": record.get("name", ""),
+                "amount_cents": to_cents(record.get("amount", 0)),
+                "type": record.get("type", "Variable"),
+                "month": record.get("month", ""),
+                "note": record.get("note", ""),
+                "fingerprint": record.get("fingerprint"),
+            })
+        if not batch:
+            return []
+
+        self._before_write()
+        if self.backend is not None:
+            # Ids come from storage, which other sessions of this user share
+            for record, expense_id in zip(batch, self.backend.insert_many(batch)):
+                record["id"] = expense_id
+                next_id = max(next_id, expense_id + 1)
+        for record in batch:
+            if self.backend is None and record["fingerprint"] is not None:
+                self._fingerprint_of[record["id"]] = record["fingerprint"]
+                self._fingerprints.add(record["fingerprint"])
+            if self.backend is None or record["month"] in self._loaded_months:
+                self._append(record)
+            else:
+                # Months not loaded stay on disk; only their totals move.
+                self._adjust(record["month"], record["category"], record["type"],
+                             record["amount_cents"], 1)
+        self.next_id = next_id
+        self.version += 1
+        return [r["id"] for r in batch]
+
+    def update(self, expense_id: int, **fields: Any) -> Dict:
+        """Change fields of one expense in place and return the new record."""
+        self.update_many({expense_id: fields})
+        return self._record(self._by_id[expense_id])
+
+    def update_many(self, changes: Dict[int, Dict[str, Any]]) -> int:
+        """Apply {id: fields} edits in one batch; returns how many rows changed.
+
+        Every edit is validated before anything is written, so a bad id or
+        field leaves the store (and backend) untouched. If the backend holds
+        a newer version of any row, nothing is written, the store reloads
+        from the backend and StaleWriteError is raised.
+        """
+        changes = {int(i): dict(f) for i, f in changes.items() if f}
+        for expense_id, fields in changes.items():
+            if expense_id not in self._by_id:
+                raise KeyError(f"Unknown expense id: {expense_id}")
+            unknown = set(fields) - set(EXPENSE_FIELDS)
+            if unknown:
+                raise ValueError(f"Unknown expense field(s): {', '.join(sorted(unknown))}")
+            if "amount" in fields:
+                fields["amount_cents"] = to_cents(fields.pop("amount"))
+        if not changes:
+            return 0
+        self._before_write()
+        changes = {i: f for i, f in changes.items() if i in self._by_id}  # after a _reload()
+        for fields in changes.values():
+            if "month" in fields:
+                self.load_month(fields["month"])
+        if self.backend is not None:
+            self._write_through(self.backend.update_many, changes, self._current(changes))
+
+        for expense_id, fields in changes.items():
+            row = self._by_id[expense_id]
+            self._unindex(row)
+            if "amount_cents" in fields:
+                self._cents[row] = fields["amount_cents"]
+            for key, column, book in (
+                ("category", self._categories, CATEGORY_CODES),
+                ("type", self._types, TYPE_CODES),
+                ("month", self._months, MONTH_CODES),
+            ):
+                if key in fields:
+                    column[row] = book.code(fields[key])
+            for key, column in (("name", self._names), ("note", self._notes)):
+                if key in fields:
+                    column[row] = fields[key]
+            self._index(row)
+            self._search_add(row)
+        self.version += 1
+        return len(changes)
+
+    def delete(self, expense_id: int) -> bool:
+        """Remove one expense. Returns False if the id was unknown."""
+        return self.delete_many([expense_id]) == 1
+
+    def delete_many(self, expense_ids: Iterable[int]) -> int:
+        """Remove several expenses in one batch; returns how many existed.
+
+        Stale rows fail the whole batch as in update_many().
+        """
+        ids = [i for i in dict.fromkeys(expense_ids) if i in self._by_id]
+        if not ids:
+            return 0
+        self._before_write()
+        ids = [i for i in ids if i in self._by_id]  # after a _reload()
+        if self.backend is not None:
+            self._write_through(self.backend.delete_many, self._current(ids))
+        for expense_id in ids:
+            self._fingerprints.discard(self._fingerprint_of.pop(expense_id, None))
+            row = self._by_id.pop(expense_id)
+            self._unindex(row)
+            self._alive[row] = False
+            self._dead += 1
+        self.version += 1
+        if self._dead > 32 and self._dead * 2 > self._size:
+            self._compact()
+        return len(ids)
+
+    def load_month(self, month: str) -> None:
+        """Pull one month's rows from the backend, once. No-op without a backend."""
+        if self.backend is None or month in self._loaded_months:
+            return
+        self._loaded_months.add(month)
+        if self._parent is not None:
+            return  # nothing of this fork is in storage until its first write
+        for record in self.backend.load_month(month):
+            # Rows written through by this store are already resident,
+            # and the running totals were seeded from the backend.
+            if record["id"] not in self._by_id:
+                self._append(record, aggregate=False)
+
+    # ── Internals ────────────────────────────────────────────────────────────
+
+    def _before_write(self) -> None:
+        """Reject writes to frozen stores; give a shared fork its own data."""
+        if self._frozen:
+            raise RuntimeError("This store is frozen; fork() it to make changes")
+        if self._parent is None:
+            return
+        self._parent = None
+        for attr in _ARRAY_COLUMNS:
+            setattr(self, attr, getattr(self, attr).copy())
+        self._names = list(self._names)
+        self._notes = list(self._notes)
+        self._by_id = dict(self._by_id)
+        self._by_month = {k: dict(rows) for k, rows in self._by_month.items()}
+        self._by_category = {k: dict(rows) for k, rows in self._by_category.items()}
+        self._category_sums = {m: {k: list(v) for k, v in s.items()} for m, s in self._category_sums.items()}
+        self._type_sums = {m: {k: list(v) for k, v in s.items()} for m, s in self._type_sums.items()}
+        self._search = {}
+        self._rollup = None
+        self._fingerprint_of = dict(self._fingerprint_of)
+        self._fingerprints = set(self._fingerprints)
+        # From here on this store diverges, so derived caches must not be shared
+        self.uid = next(_store_uids)
+        if self.backend is not None and not self.backend.seed(self.to_records()):
+            # Another session of this user saved its ledger first: continue from that
+            self._reload()
+
+    def _reload(self) -> None:
+        """Swap in the backend's ledger for ours, with the same months loaded."""
+        fresh = type(self).open(self.backend)
+        for month in self._loaded_months:
+            fresh.load_month(month)
+        fresh.version = self.version + 1  # keys derived from the version stay unique
+        self.__dict__.update(fresh.__dict__)
+
+    def _write_through(self, write, *args) -> None:
+        """Call a backend write; if our rows went stale, reload them and re-raise."""
+        try:
+            write(*args)
+        except StaleWriteError:
+            self._reload()
+            raise
+
+    def _current(self, ids: Iterable[int]) -> Dict[int, Dict]:
+        """{id: row as this store holds it}, for the backend's staleness check."""
+        current = {}
+        for expense_id in ids:
+            row = self._by_id[expense_id]
+            current[expense_id] = {
+                "category": self._category(row), "name": self._names[row],
+                "amount_cents": int(self._cents[row]), "type": self._type(row),
+                "month": self._month(row), "note": self._notes[row],
+            }
+        return current
+
+    def _record(self, row: int) -> ExpenseRecord:
+        return ExpenseRecord(
+            int(self._ids[row]),
+            CATEGORY_CODES.values[self._categories[row]],
+            self._names[row],
+            from_cents(self._cents[row]),
+            TYPE_CODES.values[self._types[row]],
+            MONTH_CODES.values[self._months[row]],
+            self._notes[row],
+        )
+
+    def _records(self, rows: List[int]) -> List[ExpenseRecord]:
+        """Records for many rows at once: columns are gathered and decoded in bulk."""
+        if not rows:
+            return []
+        categories, types, months = CATEGORY_CODES.values, TYPE_CODES.values, MONTH_CODES.values
+        names, notes = self._names, self._notes
+        idx = np.asarray(rows, dtype=np.intp)
+        new = tuple.__new__  # skips NamedTuple's Python-level __new__
+        with gc_paused():
+            return [
+                new(ExpenseRecord, (i, categories[c], names[r], a, types[t], months[m], notes[r]))
+                for r, i, c, a, t, m in zip(
+                    rows,
+                    self._ids[idx].tolist(),
+                    self._categories[idx].tolist(),
+                    (self._cents[idx] / 100).tolist(),
+                    self._types[idx].tolist(),
+                    self._months[idx].tolist(),
+                )
+            ]
+
+    def _category(self, row: int) -> str:
+        return CATEGORY_CODES.values[self._categories[row]]
+
+    def _type(self, row: int) -> str:
+        return TYPE_CODES.values[self._types[row]]
+
+    def _month(self, row: int) -> str:
+        return MONTH_CODES.values[self._months[row]]
+
+    def _seed_from_backend(self) -> None:
+        for month, category, typ, total, count in self.backend.totals():
+            self._adjust(month, category, typ, total, count)
+        self.next_id = max(self.next_id, self.backend.max_id() + 1)
+
+    def _append(self, record: Dict, aggregate: bool = True) -> None:
+        if self._size == len(self._ids):
+            self._grow()
+        row = self._size
+        self._size += 1
+        self._ids[row] = record["id"]
+        cents = record.get("amount_cents")
+        self._cents[row] = to_cents(record["amount"]) if cents is None else cents
+        self._alive[row] = True
+        self._categories[row] = CATEGORY_CODES.code(record["category"])
+        self._types[row] = TYPE_CODES.code(record["type"])
+        self._months[row] = MONTH_CODES.code(record["month"])
+        self._names.append(record["name"])
+        self._notes.append(record["note"])
+        self._by_id[record["id"]] = row
+        self._index(row, aggregate)
+        self._search_add(row)
+
+    def _index(self, row: int, aggregate: bool = True) -> None:
+        month, category = self._month(row), self._category(row)
+        self._by_month.setdefault(month, {})[row] = None
+        self._by_category.setdefault(category, {})[row] = None
+        if aggregate:
+            self._adjust(month, category, self._type(row), int(self._cents[row]), 1)
+
+    def _unindex(self, row: int) -> None:
+        month, category = self._month(row), self._category(row)
+        for index, key in ((self._by_month, month), (self._by_category, category)):
+            rows = index[key]
+            del rows[row]
+            if not rows:
+                del index[key]
+        self._adjust(month, category, self._type(row), -int(self._cents[row]), -1)
+        search = self._search.get(month)
+        if search is not None:
+            search.remove(int(self._ids[row]), self._names[row], category)
+
+    def _search_add(self, row: int) -> None:
+        search = self._search.get(self._month(row))
+        if search is not None:
+            search.add(int(self._ids[row]), self._names[row], self._category(row))
+
+    def _search_index(self, month: str) -> SearchIndex:
+        search = self._search.get(month)
+        if search is None:
+            search = SearchIndex()
+            for row in self._by_month.get(month, ()):
+                search.add(int(self._ids[row]), self._names[row], self._category(row))
+            # Published only once complete: forks may be reading it concurrently
+            self._search[month] = search
+        return search
+
+    def _adjust(self, month: str, category: str, typ: str, cents: int, count: int) -> None:
+        """Move the running totals of one (month, category) and (month, type) bucket."""
+        for sums, key in ((self._category_sums, category), (self._type_sums, typ)):
+            month_sums = sums.setdefault(month, {})
+            entry = month_sums.setdefault(key, [0, 0])
+            entry[0] += cents
+            entry[1] += count
+            if not entry[1]:
+                del month_sums[key]
+                if not month_sums:
+                    del sums[month]
+
+    def _grow(self) -> None:
+        capacity = len(self._ids) * 2
+        for attr in _ARRAY_COLUMNS:
+            old = getattr(self, attr)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[: len(old)] = old
+            setattr(self, attr, new)
+
+    def _compact(self) -> None:
+        """Drop tombstoned rows and rebuild the row indexes (totals are unaffected)."""
+        keep = np.flatnonzero(self._alive[: self._size])
+        keep_list = keep.tolist()
+        n = len(keep_list)
+
+        for attr in _ARRAY_COLUMNS:
+            column = getattr(self, attr)
+            column[:n] = column[keep]
+        self._alive[n:] = False
+        for attr in ("_names", "_notes"):
+            column = getattr(self, attr)
+            setattr(self, attr, [column[r] for r in keep_list])
+        self._size = n
+        self._dead = 0
+
+        self._by_id = {int(i): row for row, i in enumerate(self._ids[:n].tolist())}
+        self._by_month = {}
+        self._by_category = {}
+        for row in range(n):
+            self._index(row, aggregate=False)
+
+
+def _collapse(sums: Dict[str, Dict[str, List]], month: Optional[str]) -> Dict[str, int]:
+    if month is not None:
+        return {key: total for key, (total, _count) in sums.get(month, {}).items()}
+    totals: Dict[str, int] = {}
+    for month_sums in sums.values():
+        for key, (total, _count) in month_sums.items():
+            totals[key] = totals.get(key, 0) + total
+    return totals
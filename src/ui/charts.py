@@ -0,0 +1,218 @@
+"""
+Dashboard charts, cached on a digest of what they draw.
+Figure JSON and fallback HTML are built once per distinct (category detail,
+income) or trend window and shared across reruns and sessions, so a rerun that only
+changed the sidebar or navigation reuses them instead of rebuilding. Every
+caller decodes its own copy, so nothing mutable is shared between sessions.
+"""
+
+import functools
+import hashlib
+import json
+
+import streamlit as st
+from src.config import CATEGORY_COLORS, CATEGORY_ICONS, FIGURE_CACHE_SIZE, TREND_ROLLING_MONTHS
+
+_BAR_COLORS = ["#7c5cfc", "#0099ff", "#00d4aa"]
+
+
+def budget_digest(budget: dict, income: float) -> str:
+    """Digest of everything the dashboard charts draw."""
+    payload = {
+        "income": round(float(income), 2),
+        "totals": [budget[k] for k in ("total_expenses", "needs", "wants", "saves",
+                                       "needs_pct", "wants_pct", "saves_pct")],
+        "detail": [[i["category"], i["amount"], i["percent"], i["icon"], i["color"]]
+                   for i in budget["category_detail"]],
+    }
+    return hashlib.blake2b(json.dumps(payload).encode(), digest_size=16).hexdigest()
+
+
+# Figures are cached as their JSON (st.cache_data hands each caller a copy
+# of a str almost for free) and handed to st.plotly_chart as a _CachedFigure.
+# st.plotly_chart only calls to_dict() on a Figure, so a rerun decodes the
+# cached JSON once instead of building, validating and copying a Figure:
+# a plain dict would be re-validated, which costs more than a build.
+
+@functools.lru_cache(maxsize=1)
+def _cached_figure_type():
+    import plotly.graph_objects as go
+
+    class _CachedFigure(go.Figure):
+        def __init__(self, spec_json: str):  # skips Figure.__init__: no traces are built
+            self._spec_json = spec_json
+
+        def to_dict(self) -> dict:
+            return json.loads(self._spec_json)
+
+        to_plotly_json = to_dict
+
+    return _CachedFigure
+
+
+def _figure(spec_json: str):
+    return _cached_figure_type()(spec_json)
+
+
+def category_donut(digest: str, budget: dict):
+    """Spending-by-category donut (raises ImportError without plotly)."""
+    return _figure(_category_donut_spec(digest, budget))
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_SIZE, show_spinner=False)
+def _category_donut_spec(digest: str, _budget: dict) -> str:
+    import plotly.graph_objects as go
+
+    detail = _budget["category_detail"]
+    fig = go.Figure(go.Pie(
+        labels=[f"{item['icon']} {item['category']}" for item in detail],
+        values=[item["amount"] for item in detail],
+        hole=0.55, marker_colors=[item["color"] for item in detail],
+        textfont_size=12,
+        hovertemplate="<b>%{label}</b><br>$%{value:,.0f}<br>%{percent}<extra></extra>"
+    ))
+    fig.update_layout(
+        paper_bgcolor="#111925", plot_bgcolor="#111925",
+        font_color="#e8f0fe", showlegend=True,
+        legend=dict(bgcolor="#111925", font_color="#8899aa"),
+        margin=dict(t=10, b=10, l=10, r=10),
+        height=300,
+        annotations=[dict(text=f"${_budget['total_expenses']:,.0f}", x=0.5, y=0.5,
+                          font_size=18, font_color="#e8f0fe", showarrow=False)]
+    )
+    return fig.to_json()
+
+
+def target_vs_actual(digest: str, budget: dict, income: float):
+    """50/30/20 target vs actual grouped bars (raises ImportError without plotly)."""
+    return _figure(_target_vs_actual_spec(digest, budget, income))
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_SIZE, show_spinner=False)
+def _target_vs_actual_spec(digest: str, _budget: dict, _income: float) -> str:
+    import plotly.graph_objects as go
+
+    categories_bar = ["Needs (50%)", "Wants (30%)", "Savings (20%)"]
+    targets = [_income * 0.50, _income * 0.30, _income * 0.20]
+    actuals = [_budget["needs"], _budget["wants"], _budget["saves"]]
+
+    fig = go.Figure()
+    fig.add_trace(go.Bar(name="Target", x=categories_bar, y=targets,
+                         marker_color=["rgba(124,92,252,0.3)", "rgba(0,153,255,0.3)", "rgba(0,212,170,0.3)"],
+                         marker_line_color=_BAR_COLORS, marker_line_width=1.5))
+    fig.add_trace(go.Bar(name="Actual", x=categories_bar, y=actuals,
+                         marker_color=_BAR_COLORS))
+    fig.update_layout(
+        paper_bgcolor="#111925", plot_bgcolor="#111925",
+        font_color="#e8f0fe", barmode="group",
+        legend=dict(bgcolor="#111925", font_color="#8899aa"),
+        yaxis=dict(gridcolor="#1e2d42", tickformat="$,.0f"),
+        xaxis=dict(gridcolor="#1e2d42"),
+        margin=dict(t=10, b=10, l=10, r=10), height=300
+    )
+    return fig.to_json()
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_SIZE, show_spinner=False)
+def fallback_category_bars(digest: str, _budget: dict) -> str:
+    """HTML bars for the top categories, used when plotly is unavailable."""
+    rows = []
+    for item in _budget["category_detail"][:6]:
+        pct = min(item["percent"] / 30 * 100, 100)
+        rows.append(f"""
+<div style='margin-bottom:8px'>
+  <div style='display:flex;justify-content:space-between;font-size:12px;margin-bottom:3px'>
+    <span>{item["icon"]} {item["category"]}</span>
+    <span style='font-family:DM Mono,monospace;color:{item["color"]}'>${item["amount"]:,.0f}</span>
+  </div>
+  <div style='background:#1e2d42;border-radius:3px;height:6px'>
+    <div style='width:{pct:.0f}%;height:100%;background:{item["color"]};border-radius:3px'></div>
+  </div>
+</div>""")
+    return "".join(rows)
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_SIZE, show_spinner=False)
+def fallback_5030_bars(digest: str, _budget: dict, _income: float) -> str:
+    """HTML 50/30/20 bars, used when plotly is unavailable."""
+    items = [
+        ("Needs (50%)", _budget["needs"], _income * 0.50, _BAR_COLORS[0]),
+        ("Wants (30%)", _budget["wants"], _income * 0.30, _BAR_COLORS[1]),
+        ("Savings(20%)", _budget["saves"], _income * 0.20, _BAR_COLORS[2]),
+    ]
+    rows = []
+    for label, amt, target, color in items:
+        bar = min(amt / target * 100 if target else 0, 100)
+        rows.append(f"""
+<div style='margin-bottom:12px'>
+  <div style='display:flex;justify-content:space-between;font-size:12px;margin-bottom:3px'>
+    <span>{label}</span><span style='font-family:DM Mono,monospace;color:{color}'>${amt:,.0f} / ${target:,.0f}</span>
+  </div>
+  <div style='background:#1e2d42;border-radius:4px;height:8px'>
+    <div style='width:{bar:.0f}%;height:100%;background:{color};border-radius:4px'></div>
+  </div>
+</div>""")
+    return "".join(rows)
+
+
+# ── Trend view ─────────────────────────────────────────────────────────────────
+
+def trend_digest(months, categories, values, rolling) -> str:
+    """Digest of a trend window (month labels, category totals, rolling line)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(json.dumps([months, categories, [round(r, 2) for r in rolling]]).encode())
+    h.update(values.round(2).tobytes())
+    return h.hexdigest()
+
+
+def spending_trend(digest: str, months, categories, values, rolling):
+    """Stacked monthly spend per category with a rolling-average line
+    (raises ImportError without plotly)."""
+    return _figure(_spending_trend_spec(digest, months, categories, values, rolling))
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_SIZE, show_spinner=False)
+def _spending_trend_spec(digest: str, _months, _categories, _values, _rolling) -> str:
+    import plotly.graph_objects as go
+
+    fig = go.Figure()
+    for j, category in enumerate(_categories):
+        if not _values[:, j].any():
+            continue
+        fig.add_trace(go.Bar(
+            name=f"{CATEGORY_ICONS.get(category, '')} {category}", x=_months, y=_values[:, j],
+            marker_color=CATEGORY_COLORS.get(category, "#8899aa"),
+            hovertemplate="%{x}<br>$%{y:,.0f}<extra>" + category + "</extra>",
+        ))
+    fig.add_trace(go.Scatter(
+        name=f"{TREND_ROLLING_MONTHS}-month average", x=_months, y=_rolling,
+        mode="lines+markers", line=dict(color="#e8f0fe", width=2, dash="dot"),
+        hovertemplate="%{x}<br>avg $%{y:,.0f}<extra></extra>",
+    ))
+    fig.update_layout(
+        paper_bgcolor="#111925", plot_bgcolor="#111925",
+        font_color="#e8f0fe", barmode="stack",
+        legend=dict(bgcolor="#111925", font_color="#8899aa", orientation="h", y=-0.15),
+        yaxis=dict(gridcolor="#1e2d42", tickformat="$,.0f"),
+        xaxis=dict(gridcolor="#1e2d42", type="category"),
+        margin=dict(t=10, b=10, l=10, r=10), height=340
+    )
+    return fig.to_json()
+
+
+@st.cache_data(max_entries=FIGURE_CACHE_SIZE, show_spinner=False)
+def fallback_trend_bars(digest: str, _months, _values) -> str:
+    """HTML bars of total spend per month, used when plotly is unavailable."""
+    totals = _values.sum(axis=1) if len(_months) else []
+    peak = max(totals, default=0) or 1
+    rows = []
+    for month, total in zip(_months, totals):
+        rows.append(f"""
+<div style='display:flex;align-items:center;gap:10px;margin-bottom:6px;font-size:12px'>
+  <span style='width:64px;font-family:DM Mono,monospace;color:#8899aa'>{month}</span>
+  <div style='flex:1;background:#1e2d42;border-radius:3px;height:8px'>
+    <div style='width:{total / peak * 100:.0f}%;height:100%;background:#0099ff;border-radius:3px'></div>
+  </div>
+  <span style='width:80px;text-align:right;font-family:DM Mono,monospace'>${total:,.0f}</span>
+</div>""")
+    return "".join(rows)
@@ -1,7 +1,6 @@
 """AI Mentor Chat Page"""
 
 import streamlit as st
-from src.logic.ai_mentor import chat_with_gpt
 
 QUICK_PROMPTS = [
     "Analyze my current budget and spending",
@@ -23,14 +22,18 @@ Powered by GPT-4o · Knows your actual expenses and budget in real-time
 </p>
 """, unsafe_allow_html=True)
 
+    # A reply still streaming in the background blocks new sends
+    busy = st.session_state.get("chat_job") is not None
+
     # ── Quick prompt chips ─────────────────────────────────────────────────────
+    pending = None
     st.markdown("<div style='display:flex;flex-wrap:wrap;gap:8px;margin-bottom:16px'>", unsafe_allow_html=True)
     cols = st.columns(len(QUICK_PROMPTS))
     for i, (col, prompt) in enumerate(zip(cols, QUICK_PROMPTS)):
         with col:
             if st.button(prompt[:28] + "…" if len(prompt) > 28 else prompt,
-                          key=f"qp_{i}", use_container_width=True):
-                _send_message(prompt)
+                          key=f"qp_{i}", use_container_width=True, disabled=busy):
+                pending = prompt
     st.markdown("</div>", unsafe_allow_html=True)
 
     # ── Message history ────────────────────────────────────────────────────────
@@ -52,20 +55,12 @@ Powered by GPT-4o · Knows your actual expenses and budget in real-time
 
         for msg in st.session_state.messages:
             if msg["role"] == "user":
-                st.markdown(f"""
-<div style='background:rgba(0,212,170,0.08);border:1px solid rgba(0,212,170,0.2);
-     border-radius:14px;padding:14px 18px;margin-bottom:10px;
-     border-right:3px solid #0099ff;text-align:right'>
-  <div style='font-size:11px;color:#8899aa;font-family:DM Mono,monospace;margin-bottom:5px'>YOU</div>
-  <div style='font-size:14px;line-height:1.6'>{msg["content"]}</div>
-</div>""", unsafe_allow_html=True)
+                st.markdown(_user_bubble(msg["content"]), unsafe_allow_html=True)
             else:
-                st.markdown(f"""
-<div style='background:#111925;border:1px solid #1e2d42;border-radius:14px;
-     padding:16px 18px;margin-bottom:10px;border-left:3px solid #00d4aa'>
-  <div style='font-size:11px;color:#00d4aa;font-family:DM Mono,monospace;margin-bottom:5px'>💰 FINMIND AI</div>
-  <div style='font-size:14px;line-height:1.7'>{msg["content"]}</div>
-</div>""", unsafe_allow_html=True)
+                st.markdown(_assistant_bubble(msg["content"]), unsafe_allow_html=True)
+
+        if busy:
+            _render_pending_reply()
 
     st.markdown("<br>", unsafe_allow_html=True)
 
@@ -80,33 +75,106 @@ Powered by GPT-4o · Knows your actual expenses and budget in real-time
                 key="chat_input"
             )
         with col_btn:
-            submitted = st.form_submit_button("➤", use_container_width=True)
+            submitted = st.form_submit_button("➤", use_container_width=True, disabled=busy)
 
         if submitted and user_input.strip():
-            _send_message(user_input.strip())
-
-    if st.session_state.messages:
-        if st.button("🗑️ Clear conversation"):
-            st.session_state.messages = []
-            st.rerun()
-
-
-def _send_message(text: str):
-    """Add user message, get AI response, update state."""
+            pending = user_input.strip()
+
+    if pending:
+        _send_message(pending)
+
+    if st.session_state.messages and not busy:
+        col_clear, col_regen, _ = st.columns([2, 2, 6])
+        with col_clear:
+            if st.button("🗑️ Clear conversation"):
+                st.session_state.messages = []
+                st.rerun()
+        with col_regen:
+            # Identical prompts are answered from the reply cache; this asks afresh
+            if st.session_state.messages[-1]["role"] == "assistant" and st.button("🔄 Regenerate"):
+                st.session_state.messages.pop()
+                _send_message(st.session_state.messages.pop()["content"], vary=True)
+
+
+def _send_message(text: str, vary: bool = False):
+    """Add user message and start the AI response in the background."""
     st.session_state.messages.append({"role": "user", "content": text})
 
     # Build history excluding current message
     history = [{"role": m["role"], "content": m["content"]}
                for m in st.session_state.messages[:-1]]
 
-    with st.spinner("FinMind is thinking…"):
-        reply = chat_with_gpt(
-            api_key=st.session_state.api_key,
-            user_message=text,
-            history=history,
-            expenses=st.session_state.expenses,
-            income=st.session_state.income,
-        )
-
-    st.session_state.messages.append({"role": "assistant", "content": reply})
+    # Deferred: the engine pulls in openai, which the page itself never needs
+    from src.logic.chat_engine import get_engine
+
+    st.session_state.chat_job = get_engine().submit(
+        api_key=st.session_state.api_key,
+        user_message=text,
+        history=history,
+        expenses=st.session_state.expenses,
+        income=st.session_state.income,
+        vary=vary,
+        month=st.session_state.month,
+    )
     st.rerun()
+
+
+@st.fragment(run_every=0.5)
+def _render_pending_reply():
+    """Live view of the background reply; reruns the app once it lands."""
+    job = st.session_state.get("chat_job")
+    if job is None:
+        return
+    if job.done:
+        st.rerun()
+
+    if job.text:
+        st.markdown(_assistant_bubble(job.text + "▌"), unsafe_allow_html=True)
+    else:
+        st.markdown(_assistant_bubble("<span style='color:#8899aa'>FinMind is thinking…</span>"),
+                    unsafe_allow_html=True)
+    if st.button("⏹ Stop", key="cancel_reply"):
+        job.cancel()
+        st.rerun()
+
+
+@st.fragment(run_every=1.0)
+def render_reply_status():
+    """Small 'replying' note for other pages; reruns the app when the reply lands."""
+    job = st.session_state.get("chat_job")
+    if job is None:
+        return
+    if job.done:
+        st.rerun()
+    st.markdown("<div style='color:#00d4aa;font-size:11px;font-family:DM Mono,monospace'>⏳ FinMind is replying…</div>", unsafe_allow_html=True)
+
+
+def collect_chat_reply():
+    """Move a finished background reply into the message history."""
+    job = st.session_state.get("chat_job")
+    if job is None or not job.done:
+        return
+    text = job.text
+    if job.cancelled:
+        text = (text + "\n\n" if text else "") + "⏹️ *Reply stopped.*"
+    st.session_state.messages.append({"role": "assistant", "content": text})
+    st.session_state.chat_job = None
+
+
+def _user_bubble(content: str) -> str:
+    return f"""
+<div style='background:rgba(0,212,170,0.08);border:1px solid rgba(0,212,170,0.2);
+     border-radius:14px;padding:14px 18px;margin-bottom:10px;
+     border-right:3px solid #0099ff;text-align:right'>
+  <div style='font-size:11px;color:#8899aa;font-family:DM Mono,monospace;margin-bottom:5px'>YOU</div>
+  <div style='font-size:14px;line-height:1.6'>{content}</div>
+</div>"""
+
+
+def _assistant_bubble(content: str) -> str:
+    return f"""
+<div style='background:#111925;border:1px solid #1e2d42;border-radius:14px;
+     padding:16px 18px;margin-bottom:10px;border-left:3px solid #00d4aa'>
+  <div style='font-size:11px;color:#00d4aa;font-family:DM Mono,monospace;margin-bottom:5px'>💰 FINMIND AI</div>
+  <div style='font-size:14px;line-height:1.7'>{content}</div>
+</div>"""
@@ -1,11 +1,26 @@
 """Dashboard Page — Financial Overview with Charts"""
 
 import streamlit as st
-from src.logic.budget import compute_budget, CATEGORY_COLORS
+from src.config import TREND_ROLLING_MONTHS, TREND_WINDOWS
+from src.logic.budget import cached_budget
+from src.logic.rollup import monthly_rollup, shift_month
+from src.ui.charts import (
+    budget_digest,
+    category_donut,
+    target_vs_actual,
+    fallback_category_bars,
+    fallback_5030_bars,
+    trend_digest,
+    spending_trend,
+    fallback_trend_bars,
+)
+from src.ui.widgets import render_month_select
 
 
 def render_dashboard_page():
-    st.markdown("""
+    col_title, col_month = st.columns([6, 2])
+    with col_title:
+        st.markdown("""
 <h2 style='font-family:Syne,sans-serif;font-size:22px;font-weight:800;margin-bottom:4px'>
 📊 Financial Dashboard
 </h2>
@@ -13,9 +28,10 @@ def render_dashboard_page():
 Live overview of your finances. Update expenses to see instant changes.
 </p>
 """, unsafe_allow_html=True)
+    with col_month:
+        month = render_month_select()
 
-    month_expenses = [e for e in st.session_state.expenses if e.get("month") == "2026-02"]
-    budget = compute_budget(month_expenses, st.session_state.income)
+    budget = cached_budget(st.session_state.expenses, st.session_state.income, month=month)
     income = st.session_state.income
 
     # ── KPI Row ────────────────────────────────────────────────────────────────
@@ -43,62 +59,28 @@ Live overview of your finances. Update expenses to see instant changes.
     # ── Charts row ────────────────────────────────────────────────────────────
     col_chart1, col_chart2 = st.columns(2)
 
+    digest = budget_digest(budget, income)
+
     with col_chart1:
         st.markdown("<div style='font-family:Syne,sans-serif;font-weight:700;font-size:14px;margin-bottom:12px'>Spending by Category</div>", unsafe_allow_html=True)
 
         try:
-            import plotly.graph_objects as go
             if budget["category_detail"]:
-                labels = [f"{item['icon']} {item['category']}" for item in budget["category_detail"]]
-                values = [item["amount"] for item in budget["category_detail"]]
-                colors = [item["color"] for item in budget["category_detail"]]
-
-                fig = go.Figure(go.Pie(
-                    labels=labels, values=values,
-                    hole=0.55, marker_colors=colors,
-                    textfont_size=12,
-                    hovertemplate="<b>%{label}</b><br>$%{value:,.0f}<br>%{percent}<extra></extra>"
-                ))
-                fig.update_layout(
-                    paper_bgcolor="#111925", plot_bgcolor="#111925",
-                    font_color="#e8f0fe", showlegend=True,
-                    legend=dict(bgcolor="#111925", font_color="#8899aa"),
-                    margin=dict(t=10, b=10, l=10, r=10),
-                    height=300,
-                    annotations=[dict(text=f"${budget['total_expenses']:,.0f}", x=0.5, y=0.5,
-                                      font_size=18, font_color="#e8f0fe", showarrow=False)]
-                )
-                st.plotly_chart(fig, use_container_width=True)
+                st.plotly_chart(category_donut(digest, budget), use_container_width=True)
         except ImportError:
-            _fallback_category_bars(budget)
+            st.markdown(fallback_category_bars(digest, budget), unsafe_allow_html=True)
 
     with col_chart2:
         st.markdown("<div style='font-family:Syne,sans-serif;font-weight:700;font-size:14px;margin-bottom:12px'>50/30/20 vs Actual</div>", unsafe_allow_html=True)
 
         try:
-            import plotly.graph_objects as go
-            categories_bar = ["Needs (50%)", "Wants (30%)", "Savings (20%)"]
-            targets   = [income * 0.50, income * 0.30, income * 0.20]
-            actuals   = [budget["needs"], budget["wants"], budget["saves"]]
-            bar_colors = ["#7c5cfc", "#0099ff", "#00d4aa"]
-
-            fig2 = go.Figure()
-            fig2.add_trace(go.Bar(name="Target", x=categories_bar, y=targets,
-                                   marker_color=["rgba(124,92,252,0.3)","rgba(0,153,255,0.3)","rgba(0,212,170,0.3)"],
-                                   marker_line_color=bar_colors, marker_line_width=1.5))
-            fig2.add_trace(go.Bar(name="Actual", x=categories_bar, y=actuals,
-                                   marker_color=bar_colors))
-            fig2.update_layout(
-                paper_bgcolor="#111925", plot_bgcolor="#111925",
-                font_color="#e8f0fe", barmode="group",
-                legend=dict(bgcolor="#111925", font_color="#8899aa"),
-                yaxis=dict(gridcolor="#1e2d42", tickformat="$,.0f"),
-                xaxis=dict(gridcolor="#1e2d42"),
-                margin=dict(t=10, b=10, l=10, r=10), height=300
-            )
-            st.plotly_chart(fig2, use_container_width=True)
+            st.plotly_chart(target_vs_actual(digest, budget, income), use_container_width=True)
         except ImportError:
-            _fallback_5030_bars(budget, income)
+            st.markdown(fallback_5030_bars(digest, budget, income), unsafe_allow_html=True)
+
+    # ── Spending trend ────────────────────────────────────────────────────────
+    st.markdown("<br>", unsafe_allow_html=True)
+    _render_trend(month)
 
     # ── Category detail table ─────────────────────────────────────────────────
     st.markdown("<br>", unsafe_allow_html=True)
@@ -153,35 +135,43 @@ Live overview of your finances. Update expenses to see instant changes.
 </div>""", unsafe_allow_html=True)
 
 
-def _fallback_category_bars(budget):
-    for item in budget["category_detail"][:6]:
-        pct = min(item["percent"] / 30 * 100, 100)
-        st.markdown(f"""
-<div style='margin-bottom:8px'>
-  <div style='display:flex;justify-content:space-between;font-size:12px;margin-bottom:3px'>
-    <span>{item["icon"]} {item["category"]}</span>
-    <span style='font-family:DM Mono,monospace;color:{item["color"]}'>${item["amount"]:,.0f}</span>
-  </div>
-  <div style='background:#1e2d42;border-radius:3px;height:6px'>
-    <div style='width:{pct:.0f}%;height:100%;background:{item["color"]};border-radius:3px'></div>
-  </div>
-</div>""", unsafe_allow_html=True)
-
-
-def _fallback_5030_bars(budget, income):
-    items = [
-        ("Needs (50%)", budget["needs"], budget["needs_pct"], income * 0.50, "#7c5cfc"),
-        ("Wants (30%)", budget["wants"], budget["wants_pct"], income * 0.30, "#0099ff"),
-        ("Savings(20%)",budget["saves"], budget["saves_pct"], income * 0.20, "#00d4aa"),
+def _render_trend(month: str):
+    """Monthly spend up to `month`, read from the ledger's prefix-sum rollup."""
+    rollup = monthly_rollup(st.session_state.expenses)
+
+    col_head, col_window = st.columns([5, 3])
+    with col_head:
+        st.markdown("<div style='font-family:Syne,sans-serif;font-weight:700;font-size:14px;margin-bottom:12px'>Spending Trend</div>", unsafe_allow_html=True)
+    with col_window:
+        label = st.radio("Window", list(TREND_WINDOWS), index=1, horizontal=True,
+                         key="trend_window", label_visibility="collapsed")
+    n = TREND_WINDOWS[label]
+    start = shift_month(month, 1 - n)
+
+    window_total = rollup.range_total(start, month)
+    previous = rollup.range_total(shift_month(start, -n), shift_month(month, -n))
+    yoy = rollup.yoy(month)
+    stats = [
+        (f"Last {n} months", f"${window_total:,.0f}", "total spend"),
+        ("Monthly average", f"${window_total / n:,.0f}", f"over {n} months"),
+        (f"vs previous {n}", f"{(window_total / previous - 1) * 100:+.0f}%" if previous else "—", "change in spend"),
+        ("Year over year", f"{yoy * 100:+.0f}%" if yoy is not None else "—", f"{month} vs {shift_month(month, -12)}"),
     ]
-    for label, amt, pct, target, color in items:
-        bar = min(amt / target * 100 if target else 0, 100)
-        st.markdown(f"""
-<div style='margin-bottom:12px'>
-  <div style='display:flex;justify-content:space-between;font-size:12px;margin-bottom:3px'>
-    <span>{label}</span><span style='font-family:DM Mono,monospace;color:{color}'>${amt:,.0f} / ${target:,.0f}</span>
-  </div>
-  <div style='background:#1e2d42;border-radius:4px;height:8px'>
-    <div style='width:{bar:.0f}%;height:100%;background:{color};border-radius:4px'></div>
-  </div>
+    for col, (title, value, sub) in zip(st.columns(4), stats):
+        with col:
+            st.markdown(f"""
+<div style='background:#111925;border:1px solid #1e2d42;border-radius:10px;padding:12px;text-align:center'>
+  <div style='font-size:10px;color:#4a6070;text-transform:uppercase;letter-spacing:1px;
+       font-family:DM Mono,monospace'>{title}</div>
+  <div style='font-family:Syne,sans-serif;font-size:20px;font-weight:800;margin:6px 0 2px'>{value}</div>
+  <div style='font-size:11px;color:#8899aa'>{sub}</div>
 </div>""", unsafe_allow_html=True)
+
+    months, values = rollup.window(start, month)
+    rolling = rollup.rolling_mean(TREND_ROLLING_MONTHS, start, month)
+    digest = trend_digest(months, rollup.categories, values, rolling)
+    try:
+        st.plotly_chart(spending_trend(digest, months, rollup.categories, values, rolling),
+                        use_container_width=True)
+    except ImportError:
+        st.markdown(fallback_trend_bars(digest, months, values), unsafe_allow_html=True)
@@ -3,10 +3,14 @@ Expenses & Budget Page
 Full CRUD: Add, Edit, Delete expenses → live budget recalculation
 """
 
+import pandas as pd
 import streamlit as st
-from src.config import EXPENSE_CATEGORIES, EXPENSE_TYPES, MONTHS
-from src.logic.budget import compute_budget, CATEGORY_COLORS, CATEGORY_ICONS
-from src.utils import hex_to_rgb
+from src.config import EXPENSE_CATEGORIES, EXPENSE_PAGE_SIZE, EXPENSE_TYPES
+from src.logic.budget import cached_budget
+from src.logic.importer import import_statement
+from src.logic.money import from_cents, to_cents
+from src.logic.store import StaleWriteError
+from src.ui.widgets import render_month_select
 
 
 def render_expenses_page():
@@ -30,16 +34,16 @@ Add, edit, and delete your expenses. Budget recalculates instantly.
         )
         if new_income != st.session_state.income:
             st.session_state.income = new_income
+            st.session_state.ledger.set_income(new_income)
             st.rerun()
 
     with col_month:
-        selected_month = st.selectbox("📅 Month", MONTHS, index=0)
+        selected_month = render_month_select()
 
     st.markdown("---")
 
     # ── Live budget summary bar ───────────────────────────────────────────────
-    month_expenses = [e for e in st.session_state.expenses if e.get("month") == selected_month]
-    budget = compute_budget(month_expenses, st.session_state.income)
+    budget = cached_budget(st.session_state.expenses, st.session_state.income, month=selected_month)
 
     c1, c2, c3, c4 = st.columns(4)
     _metric(c1, "Total Expenses",  f"${budget['total_expenses']:,.0f}", f"of ${st.session_state.income:,.0f} income", "#ff6b35" if budget['total_expenses'] > st.session_state.income else "#8899aa")
@@ -80,10 +84,10 @@ Add, edit, and delete your expenses. Budget recalculates instantly.
     st.markdown("<br>", unsafe_allow_html=True)
 
     # ── Tabs: List | Add | Edit | Category View ───────────────────────────────
-    tab1, tab2, tab3 = st.tabs(["📋  Expense List", "➕  Add Expense", "📊  By Category"])
+    tab1, tab2, tab3, tab4 = st.tabs(["📋  Expense List", "➕  Add Expense", "📊  By Category", "⬆️  Import"])
 
     with tab1:
-        _render_expense_list(month_expenses, selected_month)
+        _render_expense_list(st.session_state.expenses, selected_month)
 
     with tab2:
         _render_add_form(selected_month)
@@ -91,6 +95,9 @@ Add, edit, and delete your expenses. Budget recalculates instantly.
     with tab3:
         _render_category_view(budget)
 
+    with tab4:
+        _render_import_form()
+
 
 def _metric(col, label, value, sub, color):
     with col:
@@ -102,9 +109,16 @@ def _metric(col, label, value, sub, color):
 </div>""", unsafe_allow_html=True)
 
 
-def _render_expense_list(month_expenses, selected_month):
-    """Render editable list of expenses."""
-    if not month_expenses:
+def _render_expense_list(store, selected_month):
+    """Paginated, editable table of expenses; edits are saved as one batch."""
+    summary = st.session_state.pop("expense_edit_summary", None)
+    if summary:
+        st.success(summary)
+    error = st.session_state.pop("expense_edit_error", None)
+    if error:
+        st.error(error)
+
+    if not store.count(selected_month):
         st.info("No expenses for this month yet. Add one in the 'Add Expense' tab!")
         return
 
@@ -115,74 +129,108 @@ def _render_expense_list(month_expenses, selected_month):
     with col_f:
         filter_cat = st.selectbox("Category", ["All"] + EXPENSE_CATEGORIES, key="filter_cat")
 
-    filtered = month_expenses
-    if search:
-        filtered = [e for e in filtered if search.lower() in e["name"].lower() or search.lower() in e["category"].lower()]
-    if filter_cat != "All":
-        filtered = [e for e in filtered if e["category"] == filter_cat]
-
-    st.markdown(f"<div style='color:#8899aa;font-size:12px;margin-bottom:10px'>{len(filtered)} expense(s)</div>", unsafe_allow_html=True)
-
-    # Edit state
-    if "editing_id" not in st.session_state:
-        st.session_state.editing_id = None
-
-    for exp in filtered:
-        color = CATEGORY_COLORS.get(exp["category"], "#8899aa")
-        icon  = CATEGORY_ICONS.get(exp["category"], "📦")
-
-        if st.session_state.editing_id == exp["id"]:
-            # ── Inline edit form ──────────────────────────────────────────────
-            with st.container():
-                st.markdown(f"<div style='background:rgba(0,212,170,0.06);border:1px solid rgba(0,212,170,0.25);border-radius:10px;padding:14px;margin-bottom:8px'>", unsafe_allow_html=True)
-                ec1, ec2, ec3, ec4 = st.columns([3, 2, 2, 1])
-                with ec1:
-                    new_name = st.text_input("Name", value=exp["name"], key=f"ename_{exp['id']}")
-                with ec2:
-                    new_cat = st.selectbox("Category", EXPENSE_CATEGORIES,
-                                           index=EXPENSE_CATEGORIES.index(exp["category"]) if exp["category"] in EXPENSE_CATEGORIES else 0,
-                                           key=f"ecat_{exp['id']}")
-                with ec3:
-                    new_amt = st.number_input("Amount ($)", value=float(exp["amount"]),
-                                              min_value=0.0, step=10.0, key=f"eamt_{exp['id']}")
-                with ec4:
-                    new_type = st.selectbox("Type", EXPENSE_TYPES,
-                                            index=EXPENSE_TYPES.index(exp["type"]) if exp["type"] in EXPENSE_TYPES else 0,
-                                            key=f"etype_{exp['id']}")
-
-                bc1, bc2, _ = st.columns([1, 1, 4])
-                with bc1:
-                    if st.button("✅ Save", key=f"save_{exp['id']}"):
-                        for e in st.session_state.expenses:
-                            if e["id"] == exp["id"]:
-                                e["name"]     = new_name
-                                e["category"] = new_cat
-                                e["amount"]   = new_amt
-                                e["type"]     = new_type
-                        st.session_state.editing_id = None
-                        st.rerun()
-                with bc2:
-                    if st.button("✖ Cancel", key=f"cancel_{exp['id']}"):
-                        st.session_state.editing_id = None
-                        st.rerun()
-                st.markdown("</div>", unsafe_allow_html=True)
-        else:
-            # ── Read row ──────────────────────────────────────────────────────
-            rc1, rc2, rc3, rc4, rc5 = st.columns([3, 2, 2, 1, 1])
-            with rc1:
-                st.markdown(f"<div style='padding:10px 4px'>{icon} <b>{exp['name']}</b></div>", unsafe_allow_html=True)
-            with rc2:
-                st.markdown(f"<div style='padding:10px 4px'><span style='background:rgba({_hex_to_rgb(color)},0.15);color:{color};padding:3px 8px;border-radius:10px;font-size:11px;font-family:DM Mono,monospace'>{exp['category']}</span></div>", unsafe_allow_html=True)
-            with rc3:
-                st.markdown(f"<div style='padding:10px 4px;font-family:DM Mono,monospace;font-size:14px;font-weight:600;color:{color}'>${exp['amount']:,.2f}</div>", unsafe_allow_html=True)
-            with rc4:
-                if st.button("✏️", key=f"edit_{exp['id']}", help="Edit"):
-                    st.session_state.editing_id = exp["id"]
-                    st.rerun()
-            with rc5:
-                if st.button("🗑️", key=f"del_{exp['id']}", help="Delete"):
-                    st.session_state.expenses = [e for e in st.session_state.expenses if e["id"] != exp["id"]]
-                    st.rerun()
+    # Indexed lookup; only the visible page is turned into records below
+    filtered = store.search(search, month=selected_month,
+                            category=None if filter_cat == "All" else filter_cat)
+
+    # ── Visible window ────────────────────────────────────────────────────────
+    pages = max(1, -(-len(filtered) // EXPENSE_PAGE_SIZE))
+    view = (selected_month, search, filter_cat)
+    if st.session_state.get("expense_view") != view:
+        # A new filter starts again from the first page
+        st.session_state.expense_view = view
+        st.session_state.expense_page = 1
+    st.session_state.expense_page = min(st.session_state.get("expense_page", 1), pages)
+    page = st.session_state.expense_page
+    first = (page - 1) * EXPENSE_PAGE_SIZE
+    visible = [store.get(i) for i in filtered[first:first + EXPENSE_PAGE_SIZE]]
+
+    shown = f" · showing {first + 1}–{first + len(visible)}" if pages > 1 else ""
+    st.markdown(f"<div style='color:#8899aa;font-size:12px;margin-bottom:10px'>{len(filtered)} expense(s){shown}</div>", unsafe_allow_html=True)
+
+    # ── Editable table ────────────────────────────────────────────────────────
+    table = pd.DataFrame(
+        [{"delete": False, **{f: e[f] for f in _EDITABLE_FIELDS}} for e in visible],
+        index=pd.Index([e["id"] for e in visible], name="id"),
+        columns=["delete", *_EDITABLE_FIELDS],
+    )
+    with st.form(key="expense_table"):
+        # The key follows the store version so a saved batch never replays
+        edited = st.data_editor(
+            table,
+            key=f"expense_editor_{store.version}_{page}",
+            hide_index=True,
+            num_rows="fixed",
+            use_container_width=True,
+            column_config={
+                "delete": st.column_config.CheckboxColumn("🗑️", help="Tick to delete", width="small"),
+                "name": st.column_config.TextColumn("Name", required=True),
+                "category": st.column_config.SelectboxColumn("Category", options=EXPENSE_CATEGORIES, required=True),
+                "amount": st.column_config.NumberColumn("Amount ($)", min_value=0.0, step=0.01, format="$%.2f", required=True),
+                "type": st.column_config.SelectboxColumn("Type", options=EXPENSE_TYPES, required=True),
+                "note": st.column_config.TextColumn("Note"),
+            },
+        )
+        saved = st.form_submit_button("💾 Save changes", type="primary")
+
+    if saved:
+        updates, deletes = _collect_edits(visible, edited)
+        try:
+            if updates:
+                store.update_many(updates)
+            if deletes:
+                store.delete_many(deletes)
+        except StaleWriteError as exc:
+            # The store has reloaded the saved ledger; show it before any retry
+            st.session_state.expense_edit_error = (
+                f"Save stopped: {exc}. The list now shows the saved ledger — check it and redo any missing changes."
+            )
+            st.rerun()
+        if updates or deletes:
+            st.session_state.expense_edit_summary = f"✅ Saved {len(updates)} edit(s) and {len(deletes)} deletion(s)."
+            st.rerun()
+
+    if pages > 1:
+        col_prev, col_page, col_next, _ = st.columns([1, 2, 1, 4])
+        with col_prev:
+            st.button("◀ Prev", key="expense_prev", disabled=page <= 1, on_click=_turn_page, args=(-1,))
+        with col_page:
+            st.markdown(f"<div style='padding:8px 4px;color:#8899aa;font-size:12px;text-align:center'>Page {page} of {pages}</div>", unsafe_allow_html=True)
+        with col_next:
+            st.button("Next ▶", key="expense_next", disabled=page >= pages, on_click=_turn_page, args=(1,))
+
+
+_EDITABLE_FIELDS = ("name", "category", "amount", "type", "note")
+
+
+def _turn_page(step: int):
+    st.session_state.expense_page += step
+
+
+def _collect_edits(visible, edited):
+    """Diff the edited table against the rows it showed → ({id: fields}, [ids to delete])."""
+    updates, deletes = {}, []
+    for exp in visible:
+        row = edited.loc[exp["id"]]
+        if row["delete"]:
+            deletes.append(exp["id"])
+            continue
+        fields = {}
+        for field in _EDITABLE_FIELDS:
+            value = row[field]
+            if field == "note" and (value is None or pd.isna(value)):
+                value = ""  # a cleared note is an edit
+            elif value is None or pd.isna(value):
+                continue  # a cleared required cell keeps its old value
+            if field == "amount":
+                cents = to_cents(float(value))
+                if cents != to_cents(exp["amount"]):
+                    fields["amount"] = from_cents(cents)
+            elif str(value) != (exp.get(field) or ""):
+                fields[field] = str(value)
+        if fields:
+            updates[exp["id"]] = fields
+    return updates, deletes
 
 
 def _render_add_form(selected_month):
@@ -211,7 +259,6 @@ def _render_add_form(selected_month):
             st.error("Please enter an expense name.")
         else:
             new_exp = {
-                "id":       st.session_state.next_id,
                 "name":     name,
                 "category": category,
                 "amount":   amount,
@@ -219,10 +266,13 @@ def _render_add_form(selected_month):
                 "month":    selected_month,
                 "note":     note,
             }
-            st.session_state.expenses.append(new_exp)
-            st.session_state.next_id += 1
-            st.success(f"✅ '{name}' added — ${amount:,.2f}")
-            st.rerun()
+            try:
+                st.session_state.expenses.add(new_exp)
+            except KeyError:  # storage rejected it (a clash with another session)
+                st.error("Could not save this expense — the ledger changed in another session. Please try again.")
+            else:
+                st.success(f"✅ '{name}' added — ${amount:,.2f}")
+                st.rerun()
 
     st.markdown("</div>", unsafe_allow_html=True)
 
@@ -255,3 +305,37 @@ def _render_category_view(budget):
   <div style='font-size:11px;color:#4a6070;margin-top:4px'>{item["percent"]:.1f}% of income</div>
 </div>""", unsafe_allow_html=True)
 
+
+def _render_import_form():
+    """Bulk import from a bank statement export (CSV, OFX, QFX)."""
+    summary = st.session_state.pop("import_summary", None)
+    if summary:
+        st.success(summary)
+
+    uploaded = st.file_uploader("Bank statement", type=["csv", "ofx", "qfx"], key="import_file")
+    negative = st.checkbox("Expenses appear as negative amounts", value=True, key="import_negative",
+                           help="Untick for exports that list debits as positive numbers.")
+
+    if uploaded is not None and st.button("⬆️  Import statement", type="primary"):
+        bar = st.progress(0.0, text="Importing…")
+
+        def on_chunk(stats):
+            bar.progress(stats.fraction, text=f"Importing… {stats.rows_read:,} rows read, {stats.imported:,} added")
+
+        fmt = "csv" if uploaded.name.lower().endswith(".csv") else "ofx"
+        try:
+            stats = import_statement(uploaded, st.session_state.expenses, fmt=fmt,
+                                     expenses_negative=negative, progress=on_chunk)
+        except KeyError:
+            # Another session imported some of the same rows meanwhile; what was
+            # saved stays, and a re-import skips it as duplicates
+            st.error("This statement was being imported in another session. Import it again to add the rest.")
+            return
+        except ValueError as exc:  # nothing recognizable in the file
+            st.error(f"Could not import '{uploaded.name}': {exc}.")
+            return
+        st.session_state.import_summary = (
+            f"✅ Imported {stats.imported:,} expense(s) from '{uploaded.name}' — "
+            f"{stats.duplicates:,} duplicate(s) and {stats.skipped:,} credit/unreadable row(s) skipped."
+        )
+        st.rerun()
@@ -1,7 +1,8 @@
 """Sidebar navigation and financial snapshot"""
 
 import streamlit as st
-from src.logic.budget import compute_budget
+from src.logic.budget import cached_budget
+from src.ui.pages.chat import render_reply_status
 
 
 def render_sidebar():
@@ -39,12 +40,16 @@ def render_sidebar():
                 st.session_state.page = key
                 st.rerun()
 
+        if st.session_state.page != "chat":
+            render_reply_status()
+
         st.markdown("---")
 
         # ── Quick Financial Snapshot ───────────────────────────────────────────
-        budget = compute_budget(
+        budget = cached_budget(
             st.session_state.expenses,
-            st.session_state.income
+            st.session_state.income,
+            month=st.session_state.month,
         )
 
         st.markdown("<div style='font-size:10px;color:#4a6070;letter-spacing:1.5px;text-transform:uppercase;font-family:DM Mono,monospace;margin-bottom:10px'>Snapshot</div>", unsafe_allow_html=True)
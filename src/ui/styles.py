@@ -2,13 +2,18 @@
 CSS and styling utilities for FinMind UI
 """
 
+import functools
+import json
+import re
+
 import streamlit as st
+import streamlit.components.v1 as components
 
+STYLE_ELEMENT_ID = "finmind-css"
 
-def inject_css():
-    """Inject custom CSS for FinMind theme (dark mode, fonts, colors)."""
-    st.markdown("""
-    <style>
+CSS = """
+    /* Syne and DM Mono come from Google Fonts until the files are bundled
+       (static/fonts/README.md); @import has to stay the first rule. */
     @import url('https://fonts.googleapis.com/css2?family=Syne:wght@400;600;700;800&family=DM+Mono:ital,wght@0,400;0,500;1,400&display=swap');
 
     * {
@@ -139,5 +144,42 @@ def inject_css():
     ::-webkit-scrollbar-thumb:hover {
         background: #2a4070;
     }
-    </style>
-    """, unsafe_allow_html=True)
+"""
+
+
+@functools.lru_cache(maxsize=1)
+def minified_css() -> str:
+    """The stylesheet without comments and redundant whitespace (built once)."""
+    css = re.sub(r"/\*.*?\*/", "", CSS, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r"([{;]\s*[\w-]+):\s+", r"\1:", css)
+    return css.replace(";}", "}").strip()
+
+
+@functools.lru_cache(maxsize=1)
+def _injector_html() -> str:
+    # Runs in the component iframe and adds the stylesheet to the app's own
+    # <head>, where it outlives the iframe and every later rerun.
+    payload = json.dumps(minified_css()).replace("</", "<\\/")
+    return f"""<script>
+const doc = window.parent.document;
+if (!doc.getElementById("{STYLE_ELEMENT_ID}")) {{
+  const style = doc.createElement("style");
+  style.id = "{STYLE_ELEMENT_ID}";
+  style.textContent = {payload};
+  doc.head.appendChild(style);
+}}
+</script>"""
+
+
+def inject_css():
+    """Inject custom CSS for FinMind theme (dark mode, fonts, colors).
+
+    Sent once per session: later reruns render nothing, so the stylesheet
+    is not re-shipped over the websocket every time the script runs.
+    """
+    if st.session_state.get("_css_injected"):
+        return
+    st.session_state._css_injected = True
+    components.html(_injector_html(), height=0)
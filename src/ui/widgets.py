@@ -0,0 +1,20 @@
+"""Small widgets shared by several pages"""
+
+import streamlit as st
+from src.config import DEFAULT_MONTH
+from src.logic.rollup import current_month, month_options
+
+
+def render_month_select(label: str = "📅 Month") -> str:
+    """Month picker over the months the ledger actually holds; returns the choice.
+
+    The current calendar month and the session's month are always offered,
+    so a new month can be started before it has any expenses.
+    """
+    month = st.session_state.month
+    options = month_options(st.session_state.expenses.months(), month, DEFAULT_MONTH, current_month())
+    selected = st.selectbox(label, options, index=options.index(month) if month in options else 0)
+    if selected != st.session_state.month:
+        st.session_state.month = selected
+        st.rerun()
+    return selected
@@ -4,6 +4,8 @@ Utility functions for FinMind application.
 
 import re
 
+from src.logic.money import format_cents, to_cents
+
 
 def hex_to_rgb(hex_color: str) -> str:
     """
@@ -26,8 +28,8 @@ def hex_to_rgb(hex_color: str) -> str:
 
 
 def format_currency(amount: float) -> str:
-    """Format amount as currency with thousands separator."""
-    return f"${amount:,.2f}"
+    """Format amount as currency with thousands separator (rounded to the cent exactly)."""
+    return format_cents(to_cents(amount))
 
 
 def format_percentage(value: float, decimals: int = 1) -> str: